@@ -0,0 +1,150 @@
+/**
+ * 常驻签名进程
+ * 一次性加载 xhs_xs_xsc_56.js 与 xhs_xray.js，之后按行读取 JSON 请求并按行写回结果，
+ * 避免 execjs 每次调用都重新启动 node 并重新解析 4MB 的 xray 包。
+ *
+ * 请求: {"id": 1, "method": "sign", "params": [api, data, a1, method]}
+ * 响应: {"id": 1, "result": {...}} 或 {"id": 1, "error": "..."}
+ */
+
+var crypto = require("crypto");
+var fs = require("fs");
+var Module = require("module");
+var path = require("path");
+var readline = require("readline");
+var vm = require("vm");
+
+var JS_DIR = __dirname;
+globalThis.__XHS_SKILL_JS_DIR = JS_DIR;
+process.chdir(JS_DIR);
+
+// V8 编译缓存：大体积打包文件首次编译后把字节码缓存写到 static/v8-cache，
+// 以文件内容 + V8 版本的哈希命名，文件变更或 node 升级后自动失效。
+var CACHE_DIR = process.env.XHS_V8_CACHE_DIR || path.join(JS_DIR, "static", "v8-cache");
+var CACHE_ENABLED = process.env.XHS_V8_CACHE !== "0";
+var CACHED_FILES = {
+    "xhs_xray_pack1.js": true,
+    "xhs_xray_pack2.js": true,
+    "xhs_xray.js": true,
+    "xhs_xs_xsc_56.js": true
+};
+var cacheStats = { hits: 0, misses: 0, rejected: 0, written: 0 };
+
+function writeCacheAtomic(file, data) {
+    try {
+        fs.mkdirSync(CACHE_DIR, { recursive: true });
+        var tmp = file + "." + process.pid + ".tmp";
+        fs.writeFileSync(tmp, data);
+        fs.renameSync(tmp, file);
+        cacheStats.written++;
+    } catch (e) {
+        // 缓存写失败不影响签名
+    }
+}
+
+function dropStaleCaches(base, keep) {
+    try {
+        fs.readdirSync(CACHE_DIR).forEach(function(name) {
+            if (name.indexOf(base + ".") === 0 && name !== keep) {
+                fs.unlinkSync(path.join(CACHE_DIR, name));
+            }
+        });
+    } catch (e) {
+        // ignore
+    }
+}
+
+var defaultJsLoader = Module._extensions[".js"];
+Module._extensions[".js"] = function(module, filename) {
+    var base = path.basename(filename);
+    if (!CACHE_ENABLED || !CACHED_FILES[base]) {
+        return defaultJsLoader(module, filename);
+    }
+    var source = fs.readFileSync(filename, "utf8");
+    var hash = crypto.createHash("sha256").update(process.versions.v8).update("\0").update(source).digest("hex").slice(0, 16);
+    var cacheName = base + "." + hash + ".cache";
+    var cacheFile = path.join(CACHE_DIR, cacheName);
+    var cachedData;
+    try {
+        cachedData = fs.readFileSync(cacheFile);
+    } catch (e) {
+        cachedData = undefined;
+    }
+    var script = new vm.Script(Module.wrap(source), { filename: filename, cachedData: cachedData });
+    var rejected = !cachedData || script.cachedDataRejected;
+    if (!cachedData) {
+        cacheStats.misses++;
+    } else if (script.cachedDataRejected) {
+        cacheStats.rejected++;
+    } else {
+        cacheStats.hits++;
+    }
+    var fn = script.runInThisContext();
+    fn.call(module.exports, module.exports, Module.createRequire(filename), module, filename, path.dirname(filename));
+    if (rejected) {
+        // 执行后再生成缓存，可以带上已被惰性编译的函数
+        writeCacheAtomic(cacheFile, script.createCachedData());
+        dropStaleCaches(base, cacheName);
+    }
+};
+
+// stdout 专用于协议输出，屏蔽打包代码里的 console 输出
+var writeLine = process.stdout.write.bind(process.stdout);
+console.log = console.info = console.debug = console.warn = console.error = function() {};
+
+var xs = require(path.join(JS_DIR, "xhs_xs_xsc_56.js"));
+require(path.join(JS_DIR, "xhs_xray.js"));
+
+var handlers = {
+    ping: function() {
+        return "pong";
+    },
+    cache_stats: function() {
+        return cacheStats;
+    },
+    sign: function(api, data, a1, method, fixedXt) {
+        return xs.get_request_headers_params(api, data, a1, method, fixedXt);
+    },
+    sign_batch: function(requests) {
+        return xs.get_request_headers_params_batch(requests);
+    },
+    trace_id: function() {
+        return globalThis.traceId();
+    },
+    trace_ids: function(count) {
+        return globalThis.traceIds(count);
+    }
+};
+
+function reply(obj) {
+    writeLine(JSON.stringify(obj) + "\n");
+}
+
+var rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on("line", function(line) {
+    if (!line.trim()) {
+        return;
+    }
+    var req;
+    try {
+        req = JSON.parse(line);
+    } catch (e) {
+        reply({ id: null, error: "invalid request: " + e.message });
+        return;
+    }
+    var handler = handlers[req.method];
+    if (!handler) {
+        reply({ id: req.id, error: "unknown method: " + req.method });
+        return;
+    }
+    try {
+        reply({ id: req.id, result: handler.apply(null, req.params || []) });
+    } catch (e) {
+        reply({ id: req.id, error: String((e && e.stack) || e) });
+    }
+});
+rl.on("close", function() {
+    process.exit(0);
+});
+
+reply({ id: 0, result: "ready" });
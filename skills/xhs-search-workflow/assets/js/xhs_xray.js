@@ -454,3 +454,11 @@ traceId = function() {
     var t, e, r, s = arguments.length > 0 && void 0 !== arguments[0] ? arguments[0] : i();
     return o(t = "".concat(n(e = u.fromNumber(s, !0).shiftLeft(23).or(a.Int.seq()).toString(16)).call(e, 16, "0"))).call(t, n(r = new u(a.Int.random(32),a.Int.random(32),!0).toString(16)).call(r, 16, "0"))
 }
+
+traceIds = function(count) {
+    var ids = [];
+    for (var k = 0; k < count; k++) {
+        ids.push(traceId());
+    }
+    return ids;
+}
@@ -423,9 +423,10 @@ function XsCommon(a1, xs, xt) {
  * @param {string|object} data - 请求数据
  * @param {string} a1 - a1 cookie值
  * @param {string} method - 请求方法，默认POST
+ * @param {number} [fixedXt] - 固定时间戳（仅基准测试/一致性校验用），默认 Date.now()
  * @returns {object} 包含xs, xt, xs_common的对象
  */
-function get_request_headers_params(api, data, a1, method) {
+function get_request_headers_params(api, data, a1, method, fixedXt) {
     method = method || "POST";
     
     // 处理data参数
@@ -440,7 +441,7 @@ function get_request_headers_params(api, data, a1, method) {
     
     // 生成签名
     var xs = seccore_signv2(api, payload);
-    var xt = Date.now();
+    var xt = fixedXt || Date.now();
     var xs_common = XsCommon(a1, xs, xt);
     
     return {
@@ -450,6 +451,20 @@ function get_request_headers_params(api, data, a1, method) {
     };
 }
 
+/**
+ * 批量获取请求头参数，一次调用签多个请求
+ * @param {Array} requests - [[api, data, a1, method], ...]
+ * @returns {Array} 与 requests 一一对应的 {xs, xt, xs_common}
+ */
+function get_request_headers_params_batch(requests) {
+    var results = [];
+    for (var i = 0; i < requests.length; i++) {
+        var r = requests[i];
+        results.push(get_request_headers_params(r[0], r[1], r[2], r[3]));
+    }
+    return results;
+}
+
 // 测试函数
 function get_x_s() {
     var url_param = '/api/sns/web/v1/feed';
@@ -469,6 +484,7 @@ if (typeof module !== "undefined") {
     module.exports = {
         seccore_signv2: seccore_signv2,
         get_request_headers_params: get_request_headers_params,
+        get_request_headers_params_batch: get_request_headers_params_batch,
         XsCommon: XsCommon,
         get_x_s: get_x_s
     };
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bench_signing import latency_summary
+from mock_server import add_config_args, config_from_args, note_id_for, start_server, xsec_token_for
+
+# 端到端负载测试：在本进程内启动 mock_server，把 XHS_BASE_URL 指向它，再以子进程方式运行
+# search_notes.py / fetch_note_texts.py / export_notes.py，统计吞吐与尾延迟。
+#   server_latency  mock 收到请求到写完响应的耗时（含注入延迟）
+#   client_gap      上一个响应写完到下一个请求到达的间隔，即客户端自身开销（签名、解析、限速、退避）
+#                   只对串行脚本有意义
+# comments 场景额外检查：--fail-threads 让部分回复线程失败时，其余一级评论和回复仍然完整返回。
+SCRIPT_DIR = Path(__file__).resolve().parent
+MOCK_COOKIE = "a1=1908d1a0b6eb13b5egsm8ggm97q17yfuv92n4l0g850000266761; web_session=mock-session; webId=mock"
+SCENARIOS = ("search", "fetch", "export", "comments")
+
+
+def scenario_argv(name: str, args: argparse.Namespace, workdir: Path) -> List[str]:
+    common = ["--cookie", MOCK_COOKIE, "--no-env-proxy", "--rate-limit", str(args.rate_limit)]
+    if name == "search":
+        return ["search_notes.py", args.query, "--num", str(args.num), "--json", *common]
+    if name == "fetch":
+        url_file = workdir / "urls.txt"
+        lines = []
+        for i in range(args.num):
+            note_id = note_id_for("bench", i)
+            lines.append(f"https://www.xiaohongshu.com/explore/{note_id}?xsec_token={xsec_token_for(note_id)}&xsec_source=pc_search")
+        url_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return ["fetch_note_texts.py", "--url-file", str(url_file), "--min-interval", "0", "--max-interval", "0", *common]
+    if name == "export":
+        return ["export_notes.py", "--query", args.query, "--num", str(args.num), "--save", "excel", "--excel", str(workdir / "bench.xlsx"), *common]
+    if name == "comments":
+        note_id = note_id_for("bench", 0)
+        url = f"https://www.xiaohongshu.com/explore/{note_id}?xsec_token={xsec_token_for(note_id)}&xsec_source=pc_search"
+        return ["xhs_full_cli.py", *common, "--checkpoint", str(workdir / "comments.jsonl"), "--overwrite-checkpoint", "note-comments", "--url", url]
+    raise ValueError(name)
+
+
+def check_comments(stdout: str, args: argparse.Namespace) -> Dict[str, Any]:
+    # every top-level comment comes back; only the injected threads are marked as partial
+    try:
+        comments = json.loads(stdout).get("data") or []
+    except ValueError:
+        comments = []
+    threads = len([i for i in range(args.comments) if i % 3 == 0]) if args.sub_comments > 1 else 0
+    partial = [c for c in comments if c.get("_expand_error")]
+    complete = [c for c in comments if c.get("sub_comment_count") != "0" and not c.get("_expand_error")]
+    expected_partial = min(args.fail_threads, threads)
+    return {
+        "comments": len(comments),
+        "partial_threads": len(partial),
+        "ok": len(comments) == args.comments
+        and len(partial) == expected_partial
+        and all(len(c.get("sub_comments", [])) == args.sub_comments for c in complete),
+    }
+
+
+def analyse(events: List[Any], wall_s: float) -> Dict[str, Any]:
+    events = sorted(events)
+    latencies = [(finished - arrival) * 1000 for arrival, finished, _ in events]
+    gaps = [(events[i][0] - events[i - 1][1]) * 1000 for i in range(1, len(events)) if events[i][0] >= events[i - 1][1]]
+    result: Dict[str, Any] = {
+        "requests": len(events),
+        "wall_s": round(wall_s, 3),
+        "requests_per_sec": round(len(events) / wall_s, 2) if wall_s else 0.0,
+    }
+    if latencies:
+        result["server_latency"] = latency_summary(latencies)
+    if gaps:
+        result["client_gap"] = latency_summary(gaps)
+    if len(events) > 1:
+        span = events[-1][1] - events[0][0]
+        result["api_span_s"] = round(span, 3)
+    return result
+
+
+def run_scenario(name: str, args: argparse.Namespace, stats: Any, env: Dict[str, str]) -> Dict[str, Any]:
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="xhs-bench-") as tmp:
+        workdir = Path(tmp)
+        script, *rest = scenario_argv(name, args, workdir)
+        argv = [sys.executable, str(SCRIPT_DIR / script), *rest]
+        for _ in range(args.repeat):
+            stats.reset()
+            start = time.perf_counter()
+            stdout = subprocess.PIPE if name == "comments" else subprocess.DEVNULL
+            proc = subprocess.run(argv, cwd=str(workdir), env=env, stdout=stdout, stderr=subprocess.PIPE, text=True, check=False)
+            wall = time.perf_counter() - start
+            snap = stats.snapshot()
+            run = analyse(snap["events"], wall)
+            run.update({"exit_code": proc.returncode, "by_status": snap["by_status"], "injected": snap["injected"]})
+            if name == "comments":
+                run["check"] = check_comments(proc.stdout, args)
+            if proc.returncode != 0:
+                run["stderr_tail"] = proc.stderr.strip().splitlines()[-3:]
+            runs.append(run)
+    walls = [r["wall_s"] * 1000 for r in runs]
+    return {
+        "scenario": name,
+        "argv": [script, *rest],
+        "wall": latency_summary(walls),
+        "requests_per_sec": round(sum(r["requests"] for r in runs) / (sum(walls) / 1000), 2) if sum(walls) else 0.0,
+        "runs": runs,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end load harness: run the CLI scripts against the offline mock server")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenarios to run. Can repeat; default all")
+    parser.add_argument("--query", default="露营", help="Search keyword for search/export")
+    parser.add_argument("--num", type=int, default=60, help="Notes per scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("--rate-limit", type=float, default=0, help="--rate-limit passed to the scripts (0 disables client throttling)")
+    parser.add_argument("--out", default="bench_load.json", help="Write JSON results to file")
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    cfg = config_from_args(args)
+    server, stats = start_server(cfg)
+    host, port = server.server_address[:2]
+    env = dict(os.environ, XHS_BASE_URL=f"http://{host}:{port}", PYTHONPATH=str(SCRIPT_DIR))
+    # retries would otherwise sleep for seconds on injected failures
+    env.setdefault("XHS_RETRY_BASE_DELAY", "0.05")
+    env.setdefault("XHS_RETRY_THROTTLE_DELAY", "0.1")
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for name in args.scenario or SCENARIOS:
+            results.append(run_scenario(name, args, stats, env))
+    finally:
+        server.shutdown()
+
+    payload = {
+        "timestamp": int(time.time()),
+        "python": sys.version.split()[0],
+        "mock": {k: v for k, v in vars(cfg).items() if k not in ("rng", "lock")},
+        "num": args.num,
+        "repeat": args.repeat,
+        "scenarios": results,
+    }
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    # a scenario with a check passes on the check; --fail-threads makes note-comments exit 1 by design
+    return 0 if all(r["check"]["ok"] if "check" in r else r["exit_code"] == 0 for s in results for r in s["runs"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import hashlib
+import json
+import platform
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from xhs_signer import JS_DIR, NODE_BIN, ExecjsSigner, NodeSignWorker, SignerPool, TraceIdPool
+
+# Golden input, same as get_x_s() in xhs_xs_xsc_56.js.
+GOLDEN_API = "/api/sns/web/v1/feed"
+GOLDEN_DATA = {
+    "source_note_id": "68f88251000000000301d972",
+    "image_formats": ["jpg", "webp", "avif"],
+    "extra": {"need_body_topic": "1"},
+    "xsec_source": "pc_feed",
+    "xsec_token": "ABfuVL1abrca5AtSMfNR0pWGBkZh387i3pykPOCHh4QbA=",
+}
+GOLDEN_A1 = "1908d1a0b6eb13b5egsm8ggm97q17yfuv92n4l0g850000266761"
+GOLDEN_XT = 1760000000000
+
+# xs_common is base64 with the custom alphabet from xhs_xs_xsc_56.js.
+XS_B64_ALPHABET = "ZmserbBoHQtNP+wOcza/LpngG8yJq42KWYj0DSfdikx3VT16IlUAFM97hECvuRX5"
+STD_B64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+XS_B64_TABLE = str.maketrans(XS_B64_ALPHABET, STD_B64_ALPHABET)
+
+# xs_common fields that do not depend on the signature itself.
+XS_COMMON_STABLE_FIELDS = ("s0", "s1", "x0", "x1", "x2", "x3", "x4", "x5", "x6", "x8", "x10", "x11")
+
+JS_FILES = ("xhs_xs_xsc_56.js", "xhs_xray.js", "xhs_xray_pack1.js", "xhs_xray_pack2.js", "xhs_sign_worker.js")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+    }
+
+
+def time_calls(fn: Callable[[], Any], count: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def throughput(fn: Callable[[], Any], count: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        list(ex.map(lambda _: fn(), range(count)))
+    return round(count / (time.perf_counter() - start), 1)
+
+
+def rss_kb(pid: int) -> int:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def decode_xs_common(value: str) -> Dict[str, Any]:
+    return json.loads(base64.b64decode(value.translate(XS_B64_TABLE)).decode("utf-8"))
+
+
+def xs_common_shape(ret: Dict[str, Any]) -> Dict[str, Any]:
+    decoded = decode_xs_common(ret["xs_common"])
+    return {
+        "keys": sorted(decoded.keys()),
+        "stable": {k: decoded.get(k) for k in XS_COMMON_STABLE_FIELDS},
+        "xt": ret["xt"],
+        "xs_prefix": str(ret["xs"])[:4],
+    }
+
+
+def js_fingerprint() -> Dict[str, str]:
+    return {name: hashlib.sha256((JS_DIR / name).read_bytes()).hexdigest()[:16] for name in JS_FILES if (JS_DIR / name).exists()}
+
+
+def node_version() -> str:
+    try:
+        return subprocess.run([NODE_BIN, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def bench_backend(name: str, signer: Any, iterations: int, threads: int) -> Dict[str, Any]:
+    sign = lambda: signer.sign(GOLDEN_API, GOLDEN_DATA, GOLDEN_A1, "POST")
+    sign()  # warm-up
+    result: Dict[str, Any] = {"backend": name}
+    result["sign_latency"] = latency_summary(time_calls(sign, iterations))
+    result["signatures_per_sec"] = throughput(sign, iterations, 1)
+    if threads > 1:
+        result["signatures_per_sec_threads"] = {"threads": threads, "rate": throughput(sign, iterations, threads)}
+    start = time.perf_counter()
+    ids = signer.trace_ids(iterations)
+    result["trace_ids_per_sec"] = round(len(ids) / (time.perf_counter() - start), 1)
+    pids = signer.pids() if hasattr(signer, "pids") else ([signer.pid] if getattr(signer, "pid", 0) else [])
+    result["memory_kb_per_process"] = [rss_kb(pid) for pid in pids] or None
+    result["xs_common_shape"] = xs_common_shape(signer.sign(GOLDEN_API, GOLDEN_DATA, GOLDEN_A1, "POST", GOLDEN_XT))
+    return result
+
+
+def bench_generate_headers(iterations: int) -> Dict[str, Any]:
+    import xhs_client
+
+    call = lambda: xhs_client.generate_headers(GOLDEN_A1, GOLDEN_API, GOLDEN_DATA, "POST")
+    call()
+    result = {"backend": xhs_client.signer_stats().get("backend"), "latency": latency_summary(time_calls(call, iterations))}
+    pool = TraceIdPool(xhs_client.get_signer())
+    pool.pop()
+    time.sleep(0.5)  # let the first background refill land
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pool.pop()
+    result["trace_pool_pops_per_sec"] = round(iterations / (time.perf_counter() - start), 1)
+    result["trace_pool"] = pool.stats()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Signing micro-benchmarks with fixed golden inputs")
+    parser.add_argument("--iterations", type=int, default=200, help="Signatures per measurement")
+    parser.add_argument("--threads", type=int, default=4, help="Client threads for the pooled throughput run")
+    parser.add_argument("--pool-size", type=int, default=0, help="Workers in the pooled backend (default: CPU count)")
+    parser.add_argument("--backend", action="append", choices=["execjs", "worker", "pool"], help="Backends to run. Can repeat; default all")
+    parser.add_argument("--skip-headers", action="store_true", help="Skip the xhs_client.generate_headers run")
+    parser.add_argument("--out", default="bench_signing.json", help="Write JSON results to file")
+    args = parser.parse_args()
+
+    factories: Dict[str, Callable[[], Any]] = {
+        "execjs": ExecjsSigner,
+        "worker": NodeSignWorker,
+        "pool": (lambda: SignerPool(args.pool_size)) if args.pool_size else SignerPool,
+    }
+    results: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    for name in args.backend or list(factories):
+        signer = None
+        try:
+            signer = factories[name]()
+            # execjs spawns node per call, so keep its run short
+            iterations = max(args.iterations // 10, 5) if name == "execjs" else args.iterations
+            results.append(bench_backend(name, signer, iterations, args.threads if name == "pool" else 1))
+        except Exception as e:
+            errors[name] = str(e)
+        finally:
+            if signer is not None:
+                signer.close()
+
+    headers: Dict[str, Any] = {}
+    if not args.skip_headers:
+        try:
+            headers = bench_generate_headers(args.iterations)
+        except Exception as e:
+            errors["generate_headers"] = str(e)
+
+    shapes = {r["backend"]: r["xs_common_shape"] for r in results}
+    consistent = len({json.dumps(v, sort_keys=True) for v in shapes.values()}) <= 1
+
+    payload = {
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "node": node_version(),
+        "js_sha256": js_fingerprint(),
+        "golden": {"api": GOLDEN_API, "a1": GOLDEN_A1, "xt": GOLDEN_XT},
+        "backends": results,
+        "generate_headers": headers,
+        "xs_common_consistent": consistent,
+        "errors": errors,
+    }
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0 if consistent and results else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+ENTRY_POINTS = [
+    ("search_notes --help", ["search_notes.py", "--help"]),
+    ("fetch_note_texts --help", ["fetch_note_texts.py", "--help"]),
+    ("export_notes --help", ["export_notes.py", "--help"]),
+    ("xhs_full_cli --help", ["xhs_full_cli.py", "--help"]),
+    ("xhs_full_cli no-water-img", ["xhs_full_cli.py", "no-water-img", "--img-url", "https://sns-webpic-qc.xhscdn.com/x/spectrum/abc!nd_dft_wlteh_webp_3"]),
+]
+
+# The import-time work xhs_client did before the signer became lazy: asset check plus compiling
+# both JS bundles with execjs (which reads the sources but does not start node). The eager run
+# does exactly that, then runs the entry point in the same interpreter.
+EAGER_PREAMBLE = (
+    "import runpy, sys, xhs_client\n"
+    "from xhs_signer import _compile_with_cwd\n"
+    "xhs_client.ensure_js_assets()\n"
+    "_compile_with_cwd(xhs_client.JS_DIR / 'xhs_xs_xsc_56.js')\n"
+    "_compile_with_cwd(xhs_client.JS_DIR / 'xhs_xray.js')\n"
+)
+
+
+def eager_argv(argv: List[str]) -> List[str]:
+    script, *rest = argv
+    runner = EAGER_PREAMBLE + f"sys.argv = {[script, *rest]!r}\nrunpy.run_path({script!r}, run_name='__main__')\n"
+    return [sys.executable, "-c", runner]
+
+
+def time_command(argv: List[str], repeat: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=str(SCRIPT_DIR), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI startup time with lazy vs eager (import-time) signer initialisation")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point")
+    parser.add_argument("--out", default="", help="Write JSON results to file")
+    args = parser.parse_args()
+
+    # the eager preamble needs execjs; fail loudly instead of timing an import error
+    probe = subprocess.run([sys.executable, "-c", EAGER_PREAMBLE], cwd=str(SCRIPT_DIR), capture_output=True, text=True, check=False)
+    if probe.returncode != 0:
+        print(probe.stderr.strip(), file=sys.stderr)
+        return 1
+
+    rows: List[Dict[str, Any]] = []
+    for name, argv in ENTRY_POINTS:
+        lazy = summarize(time_command([sys.executable, *argv], args.repeat))
+        eager = summarize(time_command(eager_argv(argv), args.repeat))
+        rows.append({"entry": name, "lazy": lazy, "eager": eager, "saved_ms": round(eager["median_ms"] - lazy["median_ms"], 1)})
+
+    payload = {"repeat": args.repeat, "entry_points": rows}
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
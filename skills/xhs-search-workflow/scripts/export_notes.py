@@ -4,19 +4,26 @@ import json
 import os
 import re
 import time
+import urllib.parse
 from pathlib import Path
 from typing import Any, Dict, List
 
 import openpyxl
-import requests
 
 from xhs_client import (
+    cache_stats,
+    configure_cache,
+    configure_rate_limit,
+    get_http_session,
     get_note_info,
     get_note_no_water_img,
     get_note_no_water_video,
     load_cookies,
-    search_some_note,
+    prepare_note_info_requests,
+    presign_window,
+    search_many_notes,
 )
+from xhs_filter import build_filter
 
 
 def drop_proxy_env() -> None:
@@ -160,12 +167,12 @@ def save_to_xlsx(rows: List[Dict[str, Any]], file_path: Path) -> None:
 
 
 def download_binary(url: str, path: Path) -> None:
-    resp = requests.get(url, timeout=30, stream=True)
-    resp.raise_for_status()
-    with path.open("wb") as f:
-        for chunk in resp.iter_content(chunk_size=1024 * 512):
-            if chunk:
-                f.write(chunk)
+    with get_http_session().get(url, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        with path.open("wb") as f:
+            for chunk in resp.iter_content(chunk_size=1024 * 512):
+                if chunk:
+                    f.write(chunk)
 
 
 def download_note_media(note: Dict[str, Any], media_root: Path, mode: str) -> Path:
@@ -215,49 +222,107 @@ def load_urls(url: List[str], url_file: str) -> List[str]:
     return urls
 
 
+def load_queries(query: List[str], query_file: str) -> List[str]:
+    queries: List[str] = list(query or [])
+    if query_file:
+        with open(query_file, "r", encoding="utf-8") as f:
+            for line in f:
+                s = line.strip()
+                if s and not s.startswith("#"):
+                    queries.append(s)
+    return queries
+
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    # same note reached through different links/tokens is exported once; the first link wins
+    seen = set()
+    unique: List[str] = []
+    for url in urls:
+        up = urllib.parse.urlparse(url)
+        key = up.path.rstrip("/").split("/")[-1] if "/explore/" in up.path or "/discovery/item/" in up.path else url
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Export notes to Excel/media in standalone skill")
     parser.add_argument("--url", action="append", help="Note URL. Can repeat")
     parser.add_argument("--url-file", default="", help="Text file with note URLs")
-    parser.add_argument("--query", default="", help="Search query to discover note URLs before export")
-    parser.add_argument("--num", type=int, default=10, help="When using --query, number of notes")
+    parser.add_argument("--query", action="append", help="Search query to discover note URLs before export. Can repeat")
+    parser.add_argument("--query-file", default="", help="Text file with one search query per line")
+    parser.add_argument("--num", type=int, default=10, help="When using --query, number of notes per query")
+    parser.add_argument("--where", default="", help="Only export searched notes matching e.g. 'liked_count>=1000, type==video'")
+    parser.add_argument("--since", default="", help="Only export searched notes published since YYYY-MM-DD or 7d")
+    parser.add_argument("--batch-workers", type=int, default=None, help="Queries searched at the same time (default: XHS_SEARCH_BATCH_WORKERS or 4)")
+    parser.add_argument("--prefetch", type=int, default=None, help="Search pages fetched in parallel after page 1 (default: XHS_SEARCH_PREFETCH or 3; 1 = sequential)")
     parser.add_argument("--save", default="all", choices=["all", "media", "media-video", "media-image", "excel"], help="Export mode; media downloads use no-watermark URLs when available")
     parser.add_argument("--excel", default="xhs_notes.xlsx", help="Excel output path")
     parser.add_argument("--media-dir", default="xhs_media", help="Media output root")
     parser.add_argument("--cookie", default="", help="Cookie string")
     parser.add_argument("--env-file", default="", help="Path to .env containing COOKIES")
+    parser.add_argument("--accounts", default="", help="Rotate saved accounts per request: 'all' or comma-separated names")
     parser.add_argument("--no-env-proxy", action="store_true", help="Disable proxy env vars for this run")
     parser.add_argument("--out", default="", help="Write normalized note JSON to file")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Max requests per second per account (default: XHS_RATE_LIMIT or 2; 0 disables)")
+    parser.add_argument("--rate-burst", type=float, default=None, help="Token bucket burst size per account (default: XHS_RATE_BURST or 5)")
+    parser.add_argument("--rate-jitter", type=float, default=None, help="Max random extra seconds added when throttled (default: XHS_RATE_JITTER or 0.2)")
+    parser.add_argument("--cache", action="store_true", help="Reuse cached responses for note detail/user info/etc. (default: XHS_CACHE; see XHS_CACHE_TTLS)")
+    parser.add_argument("--sign-window", type=int, default=20, help="Number of note requests signed together in one JS call (capped to what the rate limit sends within XHS_SIGN_MAX_AGE seconds)")
     args = parser.parse_args()
+    try:
+        item_filter = build_filter(args.where, args.since)
+    except ValueError as e:
+        parser.error(str(e))
 
     if args.no_env_proxy:
         drop_proxy_env()
+    configure_rate_limit(args.rate_limit, args.rate_burst, args.rate_jitter)
+    if args.cache:
+        configure_cache(enabled=True)
 
-    cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file)
+    cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file, accounts=args.accounts)
 
     urls = load_urls(args.url or [], args.url_file)
-    if args.query:
-        success, msg, items = search_some_note(args.query, args.num, cookies)
-        if not success:
+    queries = load_queries(args.query, args.query_file)
+    matched: Dict[str, List[str]] = {}
+    query_stats: Dict[str, Any] = {}
+    if queries:
+        success, msg, found = search_many_notes(queries, args.num, cookies, workers=args.batch_workers, prefetch=args.prefetch, item_filter=item_filter)
+        query_stats = found["queries"]
+        if not found["notes"] and not success:
             raise SystemExit(msg)
-        for item in items:
+        for item in found["notes"]:
             note_id = item.get("id", "")
             xsec_token = item.get("xsec_token", "")
             if note_id and xsec_token:
                 urls.append(f"https://www.xiaohongshu.com/explore/{note_id}?xsec_token={xsec_token}")
+                matched[note_id] = item["matched_queries"]
 
+    urls = dedupe_urls(urls)
     if not urls:
-        raise SystemExit("Provide --query or --url/--url-file")
+        raise SystemExit("Provide --query/--query-file or --url/--url-file")
 
     normalized_rows: List[Dict[str, Any]] = []
-    for note_url in urls:
-        success, msg, res = get_note_info(note_url, cookies)
-        if not success:
-            continue
-        items = (res or {}).get("data", {}).get("items", [])
-        if not items:
-            continue
-        normalized_rows.append(normalize_note_item(items[0], note_url))
+    window = presign_window(args.sign_window)
+    for start in range(0, len(urls), window):
+        window_urls = urls[start:start + window]
+        try:
+            presigned = prepare_note_info_requests(window_urls, cookies)
+        except Exception:
+            presigned = [None] * len(window_urls)
+        for note_url, signed in zip(window_urls, presigned):
+            success, msg, res = get_note_info(note_url, cookies, signed=signed)
+            if not success:
+                continue
+            items = (res or {}).get("data", {}).get("items", [])
+            if not items:
+                continue
+            row = normalize_note_item(items[0], note_url)
+            if row["note_id"] in matched:
+                row["matched_queries"] = matched[row["note_id"]]
+            normalized_rows.append(row)
 
     if args.save in ("all", "excel"):
         save_to_xlsx(normalized_rows, Path(args.excel))
@@ -269,7 +334,11 @@ def main() -> int:
             path = download_note_media(row, media_root, args.save)
             saved_dirs.append(str(path))
 
-    payload = {"count": len(normalized_rows), "notes": normalized_rows, "saved_dirs": saved_dirs}
+    payload: Dict[str, Any] = {"count": len(normalized_rows), "notes": normalized_rows, "saved_dirs": saved_dirs}
+    if query_stats:
+        payload["queries"] = query_stats
+    if args.cache:
+        payload["cache"] = cache_stats()
     print(json.dumps(payload, ensure_ascii=False, indent=2))
 
     if args.out:
@@ -2,14 +2,25 @@
 import argparse
 import json
 import os
+import queue
 import random
+import threading
 import time
 from pathlib import Path
 from urllib.parse import urlparse
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
-from xhs_client import get_note_info, get_note_no_water_img, load_cookies
-import requests
+from xhs_client import (
+    configure_cache,
+    configure_rate_limit,
+    configure_retry,
+    get_http_session,
+    get_note_info,
+    get_note_no_water_img,
+    load_cookies,
+    prepare_note_info_requests,
+    presign_window,
+)
 
 
 def drop_proxy_env() -> None:
@@ -36,8 +47,7 @@ def resolve_share_url(url: str, timeout: int = 15) -> str:
         host = (urlparse(url).netloc or "").lower()
         if "xhslink.com" not in host:
             return url
-        session = requests.Session()
-        resp = session.get(
+        resp = get_http_session().get(
             url,
             timeout=timeout,
             allow_redirects=True,
@@ -92,27 +102,193 @@ def download_images(image_urls: List[str], image_dir: Path, note_id: str, timeou
     for idx, url in enumerate(image_urls, 1):
         ext = image_ext_from_url(url)
         file_path = image_dir / f"{note_id}_image_{idx}{ext}"
-        resp = requests.get(url, timeout=timeout)
+        resp = get_http_session().get(url, timeout=timeout)
         resp.raise_for_status()
         file_path.write_bytes(resp.content)
         saved.append(str(file_path))
     return saved
 
 
+def note_row(url: str, resolved_url: str, success: bool, msg: str, res: Dict[str, Any]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"url": url, "resolved_url": resolved_url, "success": success, "msg": msg}
+    row.update((res or {}).get("_request", {}))
+    if success:
+        items = (res or {}).get("data", {}).get("items", [])
+        if items:
+            note = items[0]
+            card = note.get("note_card", {})
+            row.update(
+                {
+                    "note_id": note.get("id") or card.get("note_id"),
+                    "title": card.get("title") or card.get("display_title") or "",
+                    "desc": card.get("desc") or "",
+                    "nickname": (card.get("user") or {}).get("nickname") or "",
+                    "image_urls": collect_image_urls(card),
+                }
+            )
+    return row
+
+
+def add_downloaded_images(row: Dict[str, Any], image_dir: Path, timeout: int) -> Dict[str, Any]:
+    if row.get("image_urls"):
+        try:
+            row["downloaded_images"] = download_images(row["image_urls"], image_dir, str(row["note_id"]), timeout=timeout)
+        except Exception as e:
+            row["download_error"] = str(e)
+    return row
+
+
+# end-of-input marker passed down the pipeline queues
+_END = object()
+
+
+class _Failed:
+    # a stage raised for this input; later stages pass it through untouched
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+
+def run_stage(fn: Callable[[Any], Any], inbox: "queue.Queue[Any]", outbox: "queue.Queue[Any]", workers: int) -> None:
+    # `workers` threads move (index, value) items from inbox to outbox through fn;
+    # the last worker to exit passes the end marker on, even if a worker died
+    remaining = [workers]
+    lock = threading.Lock()
+
+    def work() -> None:
+        try:
+            while True:
+                task = inbox.get()
+                if task is _END:
+                    inbox.put(_END)
+                    return
+                index, value = task
+                if not isinstance(value, _Failed):
+                    try:
+                        value = fn(value)
+                    except Exception as e:
+                        value = _Failed(str(e) or type(e).__name__)
+                outbox.put((index, value))
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                outbox.put(_END)
+
+    for _ in range(workers):
+        threading.Thread(target=work, daemon=True).start()
+
+
+def pipeline_rows(urls: List[str], cookies: str, args: argparse.Namespace) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    # resolve short link -> note detail -> image download, each stage with its own workers and a bounded
+    # queue in front of it; the per-account rate limiter in xhs_client paces the note requests.
+    # Yields (input index, row) in completion order.
+    n = max(args.concurrency, 1)
+    feed: "queue.Queue[Any]" = queue.Queue(maxsize=2 * n)
+    resolved: "queue.Queue[Any]" = queue.Queue(maxsize=2 * n)
+    fetched: "queue.Queue[Any]" = queue.Queue(maxsize=2 * n)
+
+    def resolve(url: str) -> Tuple[str, str]:
+        return url, resolve_share_url(url, timeout=min(args.timeout, 15))
+
+    def fetch(pair: Tuple[str, str]) -> Dict[str, Any]:
+        url, resolved_url = pair
+        try:
+            success, msg, res = get_note_info(resolved_url, cookies, timeout=args.timeout)
+            return note_row(url, resolved_url, success, msg, res)
+        except Exception as e:
+            return note_row(url, resolved_url, False, str(e), {})
+
+    run_stage(resolve, feed, resolved, n)
+    run_stage(fetch, resolved, fetched, n)
+    done = fetched
+    if args.download_images:
+        done = queue.Queue(maxsize=2 * n)
+        run_stage(lambda row: add_downloaded_images(row, Path(args.image_dir), args.timeout), fetched, done, n)
+
+    def produce() -> None:
+        for index, url in enumerate(urls):
+            feed.put((index, url))
+        feed.put(_END)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        task = done.get()
+        if task is _END:
+            return
+        index, row = task
+        if isinstance(row, _Failed):
+            row = {"url": urls[index], "success": False, "msg": row.msg}
+        yield index, row
+
+
+def in_input_order(rows: Iterator[Tuple[int, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    # holds back finished rows until every earlier input has finished
+    pending: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+    for index, row in rows:
+        pending[index] = row
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+    # only left over if an input was lost on the way; don't hold back what did finish
+    for index in sorted(pending):
+        yield pending[index]
+
+
+def fetch_serial(urls: List[str], cookies: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    # notes are only signed ahead when they are sent back to back; across the
+    # --min/--max-interval sleep a presigned x-t would be stale by the time it is sent
+    presign = args.max_interval <= 0
+    window = presign_window(args.sign_window) if presign else 1
+    resolved_urls: List[str] = []
+    presigned: List[Any] = []
+
+    for idx, url in enumerate(urls):
+        if idx % window == 0:
+            resolved_urls = [resolve_share_url(u, timeout=min(args.timeout, 15)) for u in urls[idx:idx + window]]
+            presigned = [None] * len(resolved_urls)
+            if presign:
+                try:
+                    presigned = prepare_note_info_requests(resolved_urls, cookies)
+                except Exception:
+                    pass
+        resolved_url = resolved_urls[idx % window]
+        signed = presigned[idx % window]
+        success, msg, res = get_note_info(resolved_url, cookies, timeout=args.timeout, signed=signed)
+
+        row = note_row(url, resolved_url, success, msg, res)
+        if args.download_images:
+            add_downloaded_images(row, Path(args.image_dir), args.timeout)
+        rows.append(row)
+        if idx < len(urls) - 1:
+            time.sleep(random.uniform(args.min_interval, args.max_interval))
+    return rows
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Fetch note title/desc text for one or more Xiaohongshu note URLs")
     parser.add_argument("--url", action="append", help="Note URL. Can be repeated")
     parser.add_argument("--url-file", help="Text file with one URL per line")
     parser.add_argument("--cookie", default="", help="Cookie string")
     parser.add_argument("--env-file", default="", help="Path to .env containing COOKIES")
+    parser.add_argument("--accounts", default="", help="Rotate saved accounts per request: 'all' or comma-separated names")
     parser.add_argument("--no-env-proxy", action="store_true", help="Disable proxy env vars for this run")
     parser.add_argument("--download-images", action="store_true", help="Download no-watermark image files for each note")
     parser.add_argument("--image-dir", default="xhs_images", help="Directory to save downloaded images")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout seconds per note/image request")
-    parser.add_argument("--retries", type=int, default=2, help="Retry times per note on failure")
+    parser.add_argument("--retries", type=int, default=2, help="Retry times per note on retryable failures (network, 5xx, throttling)")
     parser.add_argument("--min-interval", type=float, default=4.0, help="Minimum sleep seconds between notes")
     parser.add_argument("--max-interval", type=float, default=7.0, help="Maximum sleep seconds between notes")
+    parser.add_argument("--concurrency", type=int, default=1, help="Pipeline workers per stage (resolve/fetch/download); above 1 the rate limit paces requests instead of --min/--max-interval")
+    parser.add_argument("--unordered", action="store_true", help="With --concurrency, print each note as a JSON line as soon as it finishes instead of a JSON array in input order")
+    parser.add_argument("--sign-window", type=int, default=5, help="Number of note requests signed together in one JS call when --max-interval is 0 (capped to what the rate limit sends within XHS_SIGN_MAX_AGE seconds); retries are always re-signed")
     parser.add_argument("--out", help="Write JSON output to a file")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Max requests per second per account (default: XHS_RATE_LIMIT or 2; 0 disables)")
+    parser.add_argument("--rate-burst", type=float, default=None, help="Token bucket burst size per account (default: XHS_RATE_BURST or 5)")
+    parser.add_argument("--rate-jitter", type=float, default=None, help="Max random extra seconds added when throttled (default: XHS_RATE_JITTER or 0.2)")
+    parser.add_argument("--cache", action="store_true", help="Reuse cached responses for note detail/user info/etc. (default: XHS_CACHE; see XHS_CACHE_TTLS)")
     args = parser.parse_args()
 
     urls = parse_urls(args)
@@ -121,54 +297,38 @@ def main() -> int:
 
     if args.no_env_proxy:
         drop_proxy_env()
+    configure_rate_limit(args.rate_limit, args.rate_burst, args.rate_jitter)
+    if args.cache:
+        configure_cache(enabled=True)
+    configure_retry(max_attempts=max(args.retries, 0) + 1)
 
-    cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file)
+    cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file, accounts=args.accounts)
 
     if args.min_interval < 0 or args.max_interval < 0:
         raise SystemExit("--min-interval/--max-interval must be >= 0")
     if args.max_interval < args.min_interval:
         raise SystemExit("--max-interval must be >= --min-interval")
 
-    rows: List[Dict[str, Any]] = []
-
-    for idx, url in enumerate(urls):
-        resolved_url = resolve_share_url(url, timeout=min(args.timeout, 15))
-        success = False
-        msg = ""
-        res: Dict[str, Any] = {}
-        attempts = max(args.retries, 0) + 1
-        for attempt in range(1, attempts + 1):
-            success, msg, res = get_note_info(resolved_url, cookies, timeout=args.timeout)
-            if success:
-                break
-            if attempt < attempts:
-                time.sleep(random.uniform(1.0, 2.5))
-
-        row: Dict[str, Any] = {"url": url, "resolved_url": resolved_url, "success": success, "msg": msg}
-        if success:
-            items = (res or {}).get("data", {}).get("items", [])
-            if items:
-                note = items[0]
-                card = note.get("note_card", {})
-                image_urls = collect_image_urls(card)
-                row.update(
-                    {
-                        "note_id": note.get("id") or card.get("note_id"),
-                        "title": card.get("title") or card.get("display_title") or "",
-                        "desc": card.get("desc") or "",
-                        "nickname": card.get("user", {}).get("nickname") or "",
-                        "image_urls": image_urls,
-                    }
-                )
-                if args.download_images and image_urls:
-                    try:
-                        saved_files = download_images(image_urls, Path(args.image_dir), str(row["note_id"]), timeout=args.timeout)
-                        row["downloaded_images"] = saved_files
-                    except Exception as e:
-                        row["download_error"] = str(e)
-        rows.append(row)
-        if idx < len(urls) - 1:
-            time.sleep(random.uniform(args.min_interval, args.max_interval))
+    if args.concurrency > 1:
+        if args.unordered:
+            # rows go straight to stdout and the --out JSONL file; nothing is kept, so memory stays flat
+            any_failed = False
+            out = open(args.out, "w", encoding="utf-8") if args.out else None
+            try:
+                for index, row in pipeline_rows(urls, cookies, args):
+                    line = json.dumps(dict(row, index=index), ensure_ascii=False)
+                    print(line, flush=True)
+                    if out is not None:
+                        out.write(line + "\n")
+                        out.flush()
+                    any_failed = any_failed or not row.get("success")
+            finally:
+                if out is not None:
+                    out.close()
+            return 1 if any_failed else 0
+        rows = list(in_input_order(pipeline_rows(urls, cookies, args)))
+    else:
+        rows = fetch_serial(urls, cookies, args)
 
     print(json.dumps(rows, ensure_ascii=False, indent=2))
     if args.out:
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+import argparse
+import functools
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+# 离线替身：实现 xhs_client 用到的 edith.xiaohongshu.com 接口，返回确定性的分页假数据，
+# 可注入延迟、5xx、频控 code 与风控状态码。用法：
+#   python mock_server.py --port 8765 --latency-ms 40
+#   XHS_BASE_URL=http://127.0.0.1:8765 python search_notes.py 露营 --num 50 --cookie "a1=x; web_session=y"
+# GET /__stats 返回请求统计，POST /__reset 清空统计。
+
+SEARCH_PAGE_SIZE = 20
+USER_POSTED_PAGE_SIZE = 30
+COMMENT_PAGE_SIZE = 10
+HOMEFEED_PAGE_SIZE = 30
+# fixed "now" for note timestamps, so fixtures do not change from day to day
+MOCK_NOW = 1780000000
+CHANNELS = ["homefeed_recommend", "homefeed.fashion_v3", "homefeed.food_v3", "homefeed.cosmetics_v3", "homefeed.movie_and_tv_v3"]
+
+
+def _seed(*parts: Any) -> int:
+    return int(hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:12], 16)
+
+
+@functools.lru_cache(maxsize=256)
+def search_ranking(keyword: str, filters: str, total: int, corpus: int) -> List[int]:
+    # every keyword draws from one shared corpus, so different keywords overlap; each filter
+    # combination ranks its own subset of the keyword's pool, so filter shards overlap only partly
+    pool = random.Random(_seed("search", keyword)).sample(range(corpus), min(corpus, total * 3))
+    return random.Random(_seed("search", keyword, filters)).sample(pool, min(len(pool), total))
+
+
+def object_id(seconds: int, *parts: Any) -> str:
+    # real note ids are ObjectId-like: 8 hex digits of creation time, then 16 more
+    return "%08x%016x" % (seconds, _seed(*parts))
+
+
+def note_id_for(*parts: Any) -> str:
+    # created some time in the year before MOCK_NOW
+    return object_id(MOCK_NOW - _seed("note", *parts) % (365 * 86400), "note", *parts)
+
+
+def xsec_token_for(note_id: str) -> str:
+    return "AB" + hashlib.sha1(note_id.encode("utf-8")).hexdigest()[:40] + "="
+
+
+def _user(seed: int) -> Dict[str, Any]:
+    user_id = "%024x" % _seed("user", seed % 500)
+    return {"user_id": user_id, "nickname": f"mock_user_{seed % 500}", "avatar": f"https://sns-avatar-qc.xhscdn.com/avatar/{user_id}.jpg"}
+
+
+def _interact(rng: random.Random) -> Dict[str, str]:
+    return {
+        "liked_count": str(rng.randint(0, 50000)),
+        "collected_count": str(rng.randint(0, 20000)),
+        "comment_count": str(rng.randint(0, 3000)),
+        "share_count": str(rng.randint(0, 1000)),
+    }
+
+
+def note_card(note_id: str) -> Dict[str, Any]:
+    rng = random.Random(_seed("card", note_id))
+    images = [
+        {
+            "width": 1080,
+            "height": 1440,
+            "info_list": [
+                {"image_scene": "WB_PRV", "url": f"https://sns-webpic-qc.xhscdn.com/mock/spectrum/{note_id}_{i}!nd_prv_wlteh_webp_3"},
+                {"image_scene": "WB_DFT", "url": f"https://sns-webpic-qc.xhscdn.com/mock/spectrum/{note_id}_{i}!nd_dft_wlteh_webp_3"},
+            ],
+        }
+        for i in range(rng.randint(1, 6))
+    ]
+    return {
+        "note_id": note_id,
+        "type": "normal",
+        "title": f"mock note {note_id[-6:]}",
+        "desc": f"mock description for {note_id} " + "#露营[话题]# " * rng.randint(0, 3),
+        "user": _user(_seed(note_id)),
+        "image_list": images,
+        "tag_list": [{"id": str(i), "name": f"tag{i}", "type": "topic"} for i in range(rng.randint(0, 4))],
+        "interact_info": _interact(rng),
+        "time": int(note_id[:8], 16) * 1000,
+        "last_update_time": int(note_id[:8], 16) * 1000 + rng.randint(0, 86400) * 1000,
+        "ip_location": rng.choice(["上海", "北京", "广东", "浙江", "四川"]),
+    }
+
+
+def search_item(note_id: str) -> Dict[str, Any]:
+    card = note_card(note_id)
+    return {
+        "id": note_id,
+        "model_type": "note",
+        "xsec_token": xsec_token_for(note_id),
+        "note_card": {
+            "type": card["type"],
+            "display_title": card["title"],
+            "user": card["user"],
+            "interact_info": card["interact_info"],
+            "cover": card["image_list"][0],
+        },
+    }
+
+
+def comment(note_id: str, comment_id: str, sub_total: int, index: int = 0, pinned: bool = False) -> Dict[str, Any]:
+    rng = random.Random(_seed("comment", comment_id))
+    inline = [sub_comment(note_id, comment_id, i) for i in range(min(sub_total, 1))]
+    return {
+        "id": comment_id,
+        "note_id": note_id,
+        "content": f"mock comment {comment_id[-6:]}",
+        # later comments are newer, one minute apart
+        "create_time": 1700000000000 + index * 60000,
+        "like_count": str(rng.randint(0, 500)),
+        "user_info": _user(_seed(comment_id)),
+        "sub_comment_count": str(sub_total),
+        "sub_comments": inline,
+        "sub_comment_cursor": inline[-1]["id"] if inline else "",
+        "sub_comment_has_more": sub_total > len(inline),
+        "show_tags": ["top"] if pinned else [],
+    }
+
+
+def sub_comment(note_id: str, root_id: str, index: int) -> Dict[str, Any]:
+    sub_id = "%024x" % _seed("sub", root_id, index)
+    return {
+        "id": sub_id,
+        "note_id": note_id,
+        "content": f"mock reply {index} to {root_id[-6:]}",
+        "user_info": _user(_seed(sub_id)),
+        "target_comment": {"id": root_id},
+    }
+
+
+class MockConfig:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        risk_rate: float = 0.0,
+        search_total: int = 200,
+        search_corpus: int = 1000,
+        user_notes: int = 90,
+        comments_per_note: int = 25,
+        sub_comments: int = 12,
+        fail_threads: int = 0,
+        pinned_comments: int = 0,
+        require_signature: bool = True,
+        seed: int = 0,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.tail_rate = tail_rate
+        self.tail_ms = tail_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.risk_rate = risk_rate
+        self.search_total = search_total
+        self.search_corpus = search_corpus
+        self.user_notes = user_notes
+        self.comments_per_note = comments_per_note
+        self.sub_comments = sub_comments
+        self.fail_threads = fail_threads
+        self.pinned_comments = pinned_comments
+        self.require_signature = require_signature
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+
+class MockStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.by_path: Dict[str, int] = {}
+            self.by_status: Dict[str, int] = {}
+            self.injected: Dict[str, int] = {}
+            # (arrival, finished, path) per API request, for latency/gap analysis
+            self.events: List[Tuple[float, float, str]] = []
+
+    def record(self, path: str, status: int, injected: str, arrival: float, finished: float) -> None:
+        with self._lock:
+            self.by_path[path] = self.by_path.get(path, 0) + 1
+            self.by_status[str(status)] = self.by_status.get(str(status), 0) + 1
+            if injected:
+                self.injected[injected] = self.injected.get(injected, 0) + 1
+            self.events.append((arrival, finished, path))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": len(self.events),
+                "by_path": dict(self.by_path),
+                "by_status": dict(self.by_status),
+                "injected": dict(self.injected),
+                "events": list(self.events),
+            }
+
+
+def _ok(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"code": 0, "success": True, "msg": "成功", "data": data}
+
+
+def handle_api(cfg: MockConfig, method: str, path: str, query: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+    if path == "/api/sns/web/v1/search/notes":
+        keyword = body.get("keyword", "")
+        page = int(body.get("page", 1) or 1)
+        page_size = int(body.get("page_size", SEARCH_PAGE_SIZE) or SEARCH_PAGE_SIZE)
+        filters = json.dumps(body.get("filters", []), sort_keys=True, ensure_ascii=False)
+        ranking = search_ranking(keyword, filters, cfg.search_total, cfg.search_corpus)
+        start = (page - 1) * page_size
+        end = min(start + page_size, len(ranking))
+        if "time_descending" in filters:
+            ranking = sorted(ranking, key=lambda i: note_id_for("search", i), reverse=True)
+        items = [search_item(note_id_for("search", i)) for i in ranking[start:end]]
+        return _ok({"items": items, "has_more": end < len(ranking)})
+
+    if path == "/api/sns/web/v1/feed":
+        note_id = body.get("source_note_id", "")
+        if not note_id:
+            return {"code": -1, "success": False, "msg": "参数错误", "data": {}}
+        return _ok({"items": [{"id": note_id, "model_type": "note", "note_card": note_card(note_id)}], "current_time": int(time.time() * 1000)})
+
+    if path in ("/api/sns/web/v1/user_posted", "/api/sns/web/v1/note/like/page", "/api/sns/web/v2/note/collect/page"):
+        user_id = query.get("user_id", "")
+        offset = int(query.get("cursor") or 0)
+        end = min(offset + USER_POSTED_PAGE_SIZE, cfg.user_notes)
+        notes = []
+        for i in range(offset, end):
+            # newest first, one note every two days
+            item = search_item(object_id(MOCK_NOW - i * 2 * 86400, path, user_id, i))
+            notes.append({"note_id": item["id"], "xsec_token": item["xsec_token"], "display_title": item["note_card"]["display_title"], "type": "normal", "cursor": str(i + 1)})
+        return _ok({"notes": notes, "cursor": str(end), "has_more": end < cfg.user_notes})
+
+    if path == "/api/sns/web/v2/comment/page":
+        note_id = query.get("note_id", "")
+        offset = int(query.get("cursor") or 0)
+        end = min(offset + COMMENT_PAGE_SIZE, cfg.comments_per_note)
+        comments = []
+        # newest first, like the web client; raising --comments between runs adds comments on top.
+        # --pinned-comments puts the oldest N comments on top of the first page, out of time order
+        pinned = min(cfg.pinned_comments, cfg.comments_per_note)
+        order = list(range(pinned)) + list(range(cfg.comments_per_note - 1, pinned - 1, -1))
+        for i in order[offset:end]:
+            comment_id = "%024x" % _seed("comment", note_id, i)
+            comments.append(comment(note_id, comment_id, cfg.sub_comments if i % 3 == 0 else 0, i, i < pinned))
+        return _ok({"comments": comments, "cursor": str(end), "has_more": end < cfg.comments_per_note})
+
+    if path == "/api/sns/web/v2/comment/sub/page":
+        note_id = query.get("note_id", "")
+        root_id = query.get("root_comment_id", "")
+        cursor = query.get("cursor", "")
+        offset = 1
+        for i in range(cfg.sub_comments):
+            if sub_comment(note_id, root_id, i)["id"] == cursor:
+                offset = i + 1
+                break
+        num = int(query.get("num") or COMMENT_PAGE_SIZE)
+        # the newest --fail-threads reply threads break after their first page (not retried by the client)
+        threaded = [i for i in range(cfg.comments_per_note - 1, -1, -1) if i % 3 == 0][: cfg.fail_threads]
+        if offset > 1 and root_id in {"%024x" % _seed("comment", note_id, i) for i in threaded}:
+            return {"code": -1, "success": False, "msg": "mock: reply thread unavailable", "data": {}}
+        end = min(offset + num, cfg.sub_comments)
+        subs = [sub_comment(note_id, root_id, i) for i in range(offset, end)]
+        return _ok({"comments": subs, "cursor": subs[-1]["id"] if subs else cursor, "has_more": end < cfg.sub_comments})
+
+    if path == "/api/sns/web/v1/homefeed/category":
+        return _ok({"categories": [{"id": c, "name": c.split(".")[-1]} for c in CHANNELS]})
+
+    if path == "/api/sns/web/v1/homefeed":
+        category = body.get("category", "")
+        note_index = int(body.get("note_index", 0) or 0)
+        # drawn from the shared search corpus, so channels (and later pages) repeat some notes
+        picks = [_seed("homefeed", category, note_index + i) % cfg.search_corpus for i in range(HOMEFEED_PAGE_SIZE)]
+        items = [search_item(note_id_for("search", i)) for i in picks]
+        return _ok({"items": items, "cursor_score": f"1.{note_index + HOMEFEED_PAGE_SIZE}"})
+
+    if path in ("/api/sns/web/v2/user/me", "/api/sns/web/v1/user/selfinfo"):
+        return _ok({"user_id": "%024x" % _seed("self"), "nickname": "mock_self", "guest": False})
+
+    if path == "/api/sns/web/v1/user/otherinfo":
+        return _ok({"basic_info": _user(_seed(query.get("target_user_id", "")))})
+
+    if path == "/api/sns/web/v1/search/recommend":
+        word = query.get("keyword", "")
+        return _ok({"sug_items": [{"text": f"{word}{i}", "search_type": "notes"} for i in range(8)]})
+
+    return {"code": 404, "success": False, "msg": f"mock: unknown api {path}", "data": {}}
+
+
+def make_handler(cfg: MockConfig, stats: MockStats) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("content-type", "application/json; charset=utf-8")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, method: str) -> None:
+            arrival = time.perf_counter()
+            parsed = urllib.parse.urlsplit(self.path)
+            path = parsed.path
+            query = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+            length = int(self.headers.get("content-length") or 0)
+            raw = self.rfile.read(length) if length else b""
+
+            if path == "/__stats":
+                return self._reply(200, stats.snapshot())
+            if path == "/__reset":
+                stats.reset()
+                return self._reply(200, {"success": True})
+
+            try:
+                body = json.loads(raw.decode("utf-8")) if raw else {}
+            except ValueError:
+                body = {}
+
+            with cfg.lock:
+                roll = cfg.rng.random()
+                tail = cfg.rng.random() < cfg.tail_rate
+                jitter = cfg.rng.uniform(-cfg.latency_jitter_ms, cfg.latency_jitter_ms)
+            delay = max(cfg.latency_ms + jitter, 0) + (cfg.tail_ms if tail else 0)
+            if delay:
+                time.sleep(delay / 1000)
+
+            injected = ""
+            if cfg.require_signature and not (self.headers.get("x-s") and self.headers.get("x-t")):
+                status, payload = 406, {"code": -1, "success": False, "msg": "mock: missing x-s/x-t signature"}
+            elif roll < cfg.risk_rate:
+                injected = "risk"
+                status, payload = 461, {"code": 300011, "success": False, "msg": "当前账号存在异常"}
+            elif roll < cfg.risk_rate + cfg.throttle_rate:
+                injected = "throttle"
+                status, payload = 200, {"code": 300013, "success": False, "msg": "访问频次异常，请勿频繁操作"}
+            elif roll < cfg.risk_rate + cfg.throttle_rate + cfg.error_rate:
+                injected = "error"
+                status, payload = 500, {"code": -1, "success": False, "msg": "mock: injected server error"}
+            else:
+                payload = handle_api(cfg, method, path, query, body)
+                status = 404 if payload.get("code") == 404 else 200
+            self._reply(status, payload)
+            stats.record(path, status, injected, arrival, time.perf_counter())
+
+        def do_GET(self) -> None:
+            self._handle("GET")
+
+        def do_POST(self) -> None:
+            self._handle("POST")
+
+    return Handler
+
+
+def start_server(cfg: MockConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, MockStats]:
+    """Start the mock in a daemon thread; returns (server, stats). server.server_address has the bound port."""
+    stats = MockStats()
+    server = ThreadingHTTPServer((host, port), make_handler(cfg, stats))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="xhs-mock", daemon=True).start()
+    return server, stats
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency added to every API response")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around --latency-ms")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of requests that get the extra --tail-ms delay")
+    parser.add_argument("--tail-ms", type=float, default=0.0, help="Extra delay for tail requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with code 300013 (频控)")
+    parser.add_argument("--risk-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 461 (风控)")
+    parser.add_argument("--search-total", type=int, default=200, help="Notes available per search keyword/filter")
+    parser.add_argument("--search-corpus", type=int, default=1000, help="Distinct notes that all keywords/filters draw their results from")
+    parser.add_argument("--user-notes", type=int, default=90, help="Notes per user for user_posted/likes/collects")
+    parser.add_argument("--comments", type=int, default=25, help="Top-level comments per note")
+    parser.add_argument("--sub-comments", type=int, default=12, help="Replies under every third comment")
+    parser.add_argument("--fail-threads", type=int, default=0, help="Newest reply threads whose second sub-comment page fails")
+    parser.add_argument("--pinned-comments", type=int, default=0, help="Oldest comments shown pinned on top of the first comment page")
+    parser.add_argument("--no-signature-check", action="store_true", help="Accept requests without x-s/x-t headers")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency/error injection")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        tail_rate=args.tail_rate,
+        tail_ms=args.tail_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        risk_rate=args.risk_rate,
+        search_total=args.search_total,
+        search_corpus=args.search_corpus,
+        user_notes=args.user_notes,
+        comments_per_note=args.comments,
+        sub_comments=args.sub_comments,
+        fail_threads=args.fail_threads,
+        pinned_comments=args.pinned_comments,
+        require_signature=not args.no_signature_check,
+        seed=args.seed,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline stand-in for edith.xiaohongshu.com with latency/error injection")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Bind port")
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    server, _ = start_server(config_from_args(args), args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"mock edith listening on http://{host}:{port}  (export XHS_BASE_URL=http://{host}:{port})", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
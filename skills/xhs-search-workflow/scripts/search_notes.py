@@ -2,9 +2,19 @@
 import argparse
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from xhs_client import load_cookies, search_some_note
+from xhs_client import (
+    SEARCH_SWEEP_DIMENSIONS,
+    configure_rate_limit,
+    load_cookies,
+    parse_sweep_dims,
+    search_many_notes,
+    search_some_note,
+    sweep_search_notes,
+    sweep_shards,
+)
+from xhs_filter import build_filter
 
 
 def drop_proxy_env() -> None:
@@ -12,24 +22,93 @@ def drop_proxy_env() -> None:
         os.environ.pop(k, None)
 
 
+def print_batch(success: bool, msg: str, data: Dict[str, Any], as_json: bool = False) -> int:
+    notes = data.get("notes", [])
+    if as_json:
+        payload: Dict[str, Any] = {"success": success, "msg": msg, "count": len(notes), "queries": data.get("queries", {}), "notes": notes}
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0 if success else 1
+
+    print(f"success={success}")
+    print(f"msg={msg}")
+    print(f"count={len(notes)}")
+    for query, info in data.get("queries", {}).items():
+        print(f"[{query}] count={info['count']} new={info['new']}" + ("" if info["success"] else f" error={info['msg']}"))
+    for i, n in enumerate(notes, 1):
+        card = n.get("note_card", {})
+        title = card.get("display_title") or card.get("title") or ""
+        print(f"{i}. {title}  ({', '.join(n.get('matched_queries', []))})")
+        if n.get("id") and n.get("xsec_token"):
+            print(f"   https://www.xiaohongshu.com/explore/{n['id']}?xsec_token={n['xsec_token']}")
+    return 0 if success else 1
+
+
+def print_sweep(success: bool, msg: str, data: Dict[str, Any], as_json: bool = False) -> int:
+    notes = data.get("notes", [])
+    if as_json:
+        payload: Dict[str, Any] = {"success": success, "msg": msg, "count": len(notes), "requests": data.get("requests", 0), "shards": data.get("shards", []), "notes": notes}
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0 if success else 1
+
+    print(f"success={success}")
+    print(f"msg={msg}")
+    print(f"count={len(notes)} requests={data.get('requests', 0)}")
+    for shard in data.get("shards", []):
+        filters = " ".join(f"{k}={v}" for k, v in shard["filters"].items())
+        print(f"[{filters}] pages={shard['pages']} new={shard['new']}/{shard['fetched']} yield={shard['yield']} stopped={shard['stopped']}")
+    for i, n in enumerate(notes, 1):
+        card = n.get("note_card", {})
+        title = card.get("display_title") or card.get("title") or ""
+        print(f"{i}. {title}")
+        if n.get("id") and n.get("xsec_token"):
+            print(f"   https://www.xiaohongshu.com/explore/{n['id']}?xsec_token={n['xsec_token']}")
+    return 0 if success else 1
+
+
+def load_queries(query: str, query_file: str) -> List[str]:
+    queries: List[str] = [query] if query else []
+    if query_file:
+        with open(query_file, "r", encoding="utf-8") as f:
+            for line in f:
+                s = line.strip()
+                if s and not s.startswith("#"):
+                    queries.append(s)
+    return queries
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Search Xiaohongshu notes (self-contained skill)")
-    parser.add_argument("query", help="Search keyword")
-    parser.add_argument("--num", type=int, default=10, help="Number of notes to return")
-    parser.add_argument("--sort", type=int, default=0, choices=[0, 1, 2, 3, 4], help="0综合 1最新 2最多点赞 3最多评论 4最多收藏")
-    parser.add_argument("--note-type", type=int, default=0, choices=[0, 1, 2], help="0不限 1视频笔记 2普通笔记")
-    parser.add_argument("--note-time", type=int, default=0, choices=[0, 1, 2, 3], help="0不限 1一天内 2一周内 3半年内")
-    parser.add_argument("--note-range", type=int, default=0, choices=[0, 1, 2, 3], help="0不限 1已看过 2未看过 3已关注")
-    parser.add_argument("--pos-distance", type=int, default=0, choices=[0, 1, 2], help="0不限 1同城 2附近")
+    parser.add_argument("query", nargs="?", default="", help="Search keyword")
+    parser.add_argument("--query-file", default="", help="Text file with one keyword per line; searched concurrently and de-duplicated by note id")
+    parser.add_argument("--batch-workers", type=int, default=None, help="Keywords searched at the same time with --query-file (default: XHS_SEARCH_BATCH_WORKERS or 4)")
+    parser.add_argument("--num", type=int, default=10, help="Number of notes to return (per keyword with --query-file; unused with --sweep)")
+    parser.add_argument("--sweep", action="store_true", help="Page the query under every filter combination and merge the notes, to get past the per-query result cap")
+    parser.add_argument("--sweep-dims", default="", help='Filter values to combine with --sweep, e.g. \'{"sort_type_choice":[0,1,2],"note_time":[1,2,3]}\' (default: all sorts x note types x note times; --sort/--note-type/--note-time/--note-range/--pos-distance fix that filter to one value)')
+    parser.add_argument("--min-yield", type=float, default=None, help="With --sweep, stop a shard when a page adds fewer than this fraction of new notes (default: XHS_SEARCH_SWEEP_MIN_YIELD or 0.2)")
+    parser.add_argument("--max-pages", type=int, default=0, help="With --sweep, max pages per shard (0 = until exhausted or low yield)")
+    parser.add_argument("--prefetch", type=int, default=None, help="Search pages fetched in parallel after page 1 (default: XHS_SEARCH_PREFETCH or 3; 1 = sequential)")
+    # default None so --sweep can tell an explicit filter from the default
+    parser.add_argument("--sort", type=int, default=None, choices=[0, 1, 2, 3, 4], help="0综合 1最新 2最多点赞 3最多评论 4最多收藏")
+    parser.add_argument("--note-type", type=int, default=None, choices=[0, 1, 2], help="0不限 1视频笔记 2普通笔记")
+    parser.add_argument("--note-time", type=int, default=None, choices=[0, 1, 2, 3], help="0不限 1一天内 2一周内 3半年内")
+    parser.add_argument("--note-range", type=int, default=None, choices=[0, 1, 2, 3], help="0不限 1已看过 2未看过 3已关注")
+    parser.add_argument("--pos-distance", type=int, default=None, choices=[0, 1, 2], help="0不限 1同城 2附近")
+    parser.add_argument("--where", default="", help="Keep notes matching e.g. 'liked_count>=1000, type==video'; checked per page and non-matching notes do not count toward --num")
+    parser.add_argument("--since", default="", help="Keep notes published since YYYY-MM-DD or 7d; with --sort 1 paging stops at the first older note")
     parser.add_argument("--geo", default="", help="Geo JSON, e.g. '{\"latitude\":39.9,\"longitude\":116.4}'")
     parser.add_argument("--cookie", default="", help="Cookie string")
     parser.add_argument("--env-file", default="", help="Path to .env containing COOKIES")
+    parser.add_argument("--accounts", default="", help="Rotate saved accounts per request: 'all' or comma-separated names")
     parser.add_argument("--no-env-proxy", action="store_true", help="Disable proxy env vars for this run")
     parser.add_argument("--json", action="store_true", help="Print raw JSON output")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Max requests per second per account (default: XHS_RATE_LIMIT or 2; 0 disables)")
+    parser.add_argument("--rate-burst", type=float, default=None, help="Token bucket burst size per account (default: XHS_RATE_BURST or 5)")
+    parser.add_argument("--rate-jitter", type=float, default=None, help="Max random extra seconds added when throttled (default: XHS_RATE_JITTER or 0.2)")
     args = parser.parse_args()
 
     if args.no_env_proxy:
         drop_proxy_env()
+    configure_rate_limit(args.rate_limit, args.rate_burst, args.rate_jitter)
 
     geo_payload: Any = ""
     if args.geo:
@@ -38,18 +117,50 @@ def main() -> int:
         except Exception:
             geo_payload = args.geo
 
-    cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file)
-    success, msg, notes = search_some_note(
-        args.query,
-        args.num,
-        cookies,
-        sort_type_choice=args.sort,
-        note_type=args.note_type,
-        note_time=args.note_time,
-        note_range=args.note_range,
-        pos_distance=args.pos_distance,
-        geo=geo_payload,
-    )
+    queries = load_queries(args.query, args.query_file)
+    if not queries:
+        parser.error("provide a query or --query-file")
+    try:
+        item_filter = build_filter(args.where, args.since)
+    except ValueError as e:
+        parser.error(str(e))
+    if item_filter is not None and args.sweep:
+        parser.error("--where/--since cannot be combined with --sweep")
+    fixed = {
+        "sort_type_choice": ("--sort", args.sort),
+        "note_type": ("--note-type", args.note_type),
+        "note_time": ("--note-time", args.note_time),
+        "note_range": ("--note-range", args.note_range),
+        "pos_distance": ("--pos-distance", args.pos_distance),
+    }
+    filters: Dict[str, Any] = {
+        **{name: value or 0 for name, (_, value) in fixed.items()},
+        "geo": geo_payload,
+        "prefetch": args.prefetch,
+        "item_filter": item_filter,
+    }
+
+    cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file, accounts=args.accounts)
+    if args.sweep:
+        if len(queries) != 1:
+            parser.error("--sweep takes exactly one query")
+        try:
+            dimensions = parse_sweep_dims(args.sweep_dims) if args.sweep_dims else dict(SEARCH_SWEEP_DIMENSIONS)
+        except ValueError as e:
+            parser.error(str(e))
+        # explicit filter flags become single-value dimensions instead of being ignored
+        for name, (flag, value) in fixed.items():
+            if value is None:
+                continue
+            if args.sweep_dims and name in dimensions:
+                parser.error(f"{flag} conflicts with {name} in --sweep-dims")
+            dimensions[name] = [value]
+        shards = sweep_shards(dimensions)
+        result = sweep_search_notes(queries[0], cookies, shards=shards, workers=args.batch_workers, min_yield=args.min_yield, max_pages=args.max_pages, geo=geo_payload)
+        return print_sweep(*result, as_json=args.json)
+    if args.query_file:
+        return print_batch(*search_many_notes(queries, args.num, cookies, workers=args.batch_workers, **filters), as_json=args.json)
+    success, msg, notes = search_some_note(args.query, args.num, cookies, **filters)
 
     if args.json:
         payload: Dict[str, Any] = {
@@ -58,6 +169,8 @@ def main() -> int:
             "count": len(notes) if notes else 0,
             "notes": notes or [],
         }
+        if item_filter is not None:
+            payload["filter"] = item_filter.stats()
         print(json.dumps(payload, ensure_ascii=False, indent=2))
         return 0 if success else 1
 
@@ -13,7 +13,7 @@ echo "[1/3] create skill venv"
 uv venv .venv
 
 echo "[2/3] install python deps"
-uv pip install --python .venv/bin/python requests pyexecjs python-dotenv openpyxl qrcode pillow
+uv pip install --python .venv/bin/python requests httpx pyexecjs python-dotenv openpyxl qrcode pillow
 
 echo "[3/3] verify bundled crypto-js"
 if [[ -f "$VENDOR_CRYPTO" ]]; then
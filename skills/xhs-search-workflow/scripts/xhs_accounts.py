@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from xhs_auth import CONFIG_DIR, cookie_str_to_dict, get_saved_cookie_string, list_accounts
+from xhs_retry import AUTH, OK, RISK, THROTTLED
+
+logger = logging.getLogger(__name__)
+
+# 多账号 cookie 池：把下面的占位串当作 cookies_str 传给 xhs_client，
+# 每次请求（包括重试）都会从池中挑一个可用账号：
+#   "xhs-cookie-pool"            所有已保存账号
+#   "xhs-cookie-pool:alice,bob"  只用指定账号
+# auth 失败 -> 隔离；risk -> 长冷却，连续 3 次隔离；throttled -> 指数冷却。
+# 状态写入 accounts_state.json，重新登录（会话指纹变化）即解除隔离。
+POOL_TOKEN = "xhs-cookie-pool"
+STATE_FILE = CONFIG_DIR / "accounts_state.json"
+
+THROTTLE_COOLDOWN = 60.0
+RISK_COOLDOWN = 30 * 60.0
+MAX_COOLDOWN = 6 * 3600.0
+
+
+class NoAccountAvailable(RuntimeError):
+    pass
+
+
+def is_pool_cookie(cookies_str: str) -> bool:
+    return bool(cookies_str) and (cookies_str == POOL_TOKEN or cookies_str.startswith(POOL_TOKEN + ":"))
+
+
+def pool_cookie(accounts: str = "all") -> str:
+    if not accounts or accounts == "all":
+        return POOL_TOKEN
+    return f"{POOL_TOKEN}:{accounts}"
+
+
+def _session_fingerprint(cookie_str: str) -> str:
+    cookies = cookie_str_to_dict(cookie_str)
+    raw = f"{cookies.get('a1', '')}|{cookies.get('web_session', '')}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class Account:
+    def __init__(self, name: str, cookie_str: str) -> None:
+        self.name = name
+        self.cookie_str = cookie_str
+        self.fingerprint = _session_fingerprint(cookie_str)
+        self.quarantined = ""
+        self.cooldown_until = 0.0
+        self.strikes = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_used = 0.0
+
+    def available(self, now: float) -> bool:
+        return not self.quarantined and self.cooldown_until <= now
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": not self.quarantined,
+            "quarantined": self.quarantined,
+            "cooldown_remaining": max(round(self.cooldown_until - time.time(), 1), 0),
+            "strikes": self.strikes,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class CookiePool:
+    """Saved sessions with health/cool-down state, handed out least-recently-used first."""
+
+    def __init__(self, names: List[str] | None = None) -> None:
+        self.accounts: Dict[str, Account] = {}
+        for name in names or list_accounts():
+            cookie_str = get_saved_cookie_string(name)
+            if cookie_str:
+                self.accounts[name] = Account(name, cookie_str)
+        if not self.accounts:
+            raise NoAccountAvailable("no saved accounts; run `xhs_full_cli.py login --account NAME` first")
+        self._lock = threading.Lock()
+        self._load_state()
+
+    def _load_state(self) -> None:
+        try:
+            state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for name, entry in state.items():
+            account = self.accounts.get(name)
+            # a new login (different session) clears the old quarantine
+            if account is None or entry.get("fingerprint") != account.fingerprint:
+                continue
+            account.quarantined = entry.get("quarantined", "")
+            account.cooldown_until = float(entry.get("cooldown_until", 0))
+            account.strikes = int(entry.get("strikes", 0))
+
+    def _save_state(self) -> None:
+        try:
+            state = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+        for account in self.accounts.values():
+            state[account.name] = {
+                "fingerprint": account.fingerprint,
+                "quarantined": account.quarantined,
+                "cooldown_until": account.cooldown_until,
+                "strikes": account.strikes,
+            }
+        try:
+            STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            STATE_FILE.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError as exc:
+            logger.warning("failed to save account state: %s", exc)
+
+    def try_acquire(self) -> Tuple[Account | None, float]:
+        """Return (account, 0) or (None, seconds until one leaves cool-down)."""
+        now = time.time()
+        with self._lock:
+            ready = [a for a in self.accounts.values() if a.available(now)]
+            if ready:
+                account = min(ready, key=lambda a: a.last_used)
+                account.last_used = now
+                account.requests += 1
+                return account, 0.0
+            cooling = [a.cooldown_until for a in self.accounts.values() if not a.quarantined]
+        if not cooling:
+            raise NoAccountAvailable("all accounts are quarantined: " + ", ".join(f"{a.name}={a.quarantined}" for a in self.accounts.values()))
+        return None, max(min(cooling) - now, 0.01)
+
+    def acquire(self) -> Account:
+        while True:
+            account, wait = self.try_acquire()
+            if account is not None:
+                return account
+            time.sleep(wait)
+
+    def report(self, account: Account, error_class: str) -> None:
+        with self._lock:
+            if error_class == OK:
+                account.strikes = 0
+                return
+            account.failures += 1
+            if error_class == AUTH:
+                account.quarantined = "auth"
+            elif error_class == RISK:
+                account.strikes += 1
+                account.cooldown_until = time.time() + min(RISK_COOLDOWN * account.strikes, MAX_COOLDOWN)
+                if account.strikes >= 3:
+                    account.quarantined = "risk"
+            elif error_class == THROTTLED:
+                account.strikes += 1
+                account.cooldown_until = time.time() + min(THROTTLE_COOLDOWN * 2 ** (account.strikes - 1), MAX_COOLDOWN)
+            else:
+                return
+            logger.warning("account %s marked %s (strikes=%d)", account.name, account.quarantined or "cooling down", account.strikes)
+            self._save_state()
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            account = self.accounts[name]
+            account.quarantined, account.cooldown_until, account.strikes = "", 0.0, 0
+            self._save_state()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [a.to_dict() for a in self.accounts.values()]
+
+
+_POOLS: Dict[str, CookiePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_cookie_pool(cookies_str: str = POOL_TOKEN) -> CookiePool:
+    with _POOLS_LOCK:
+        pool = _POOLS.get(cookies_str)
+        if pool is None:
+            spec = cookies_str[len(POOL_TOKEN) + 1:] if ":" in cookies_str else ""
+            names = [n.strip() for n in spec.split(",") if n.strip()] or None
+            pool = _POOLS[cookies_str] = CookiePool(names)
+        return pool
@@ -5,7 +5,7 @@ import os
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import qrcode
 import requests
@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path(os.environ.get("XHS_SEARCH_WORKFLOW_HOME", Path.home() / ".xhs-search-workflow"))
 COOKIE_FILE = CONFIG_DIR / "cookies.json"
+ACCOUNTS_DIR = CONFIG_DIR / "accounts"
+DEFAULT_ACCOUNT = "default"
 QR_CODE_FILE = CONFIG_DIR / "login-qrcode.png"
 REQUIRED_COOKIES = {"a1", "web_session"}
 
@@ -41,11 +43,28 @@ def has_required_cookies(cookies: Dict[str, str]) -> bool:
     return REQUIRED_COOKIES.issubset(cookies.keys())
 
 
-def get_saved_cookie_string() -> str | None:
-    if not COOKIE_FILE.exists():
+def cookie_file_for(account: str = "") -> Path:
+    # The unnamed/default session keeps living in cookies.json; named ones go to accounts/<name>.json.
+    if not account or account == DEFAULT_ACCOUNT:
+        return COOKIE_FILE
+    if not account.replace("-", "").replace("_", "").isalnum():
+        raise ValueError("account name may only contain letters, digits, '-' and '_'")
+    return ACCOUNTS_DIR / f"{account}.json"
+
+
+def list_accounts() -> List[str]:
+    names = [DEFAULT_ACCOUNT] if COOKIE_FILE.exists() else []
+    if ACCOUNTS_DIR.exists():
+        names.extend(sorted(p.stem for p in ACCOUNTS_DIR.glob("*.json")))
+    return names
+
+
+def get_saved_cookie_string(account: str = "") -> str | None:
+    cookie_file = cookie_file_for(account)
+    if not cookie_file.exists():
         return None
     try:
-        data = json.loads(COOKIE_FILE.read_text(encoding="utf-8"))
+        data = json.loads(cookie_file.read_text(encoding="utf-8"))
         cookies = data.get("cookies", {})
         if isinstance(cookies, dict) and has_required_cookies(cookies):
             return dict_to_cookie_str(cookies)
@@ -54,25 +73,27 @@ def get_saved_cookie_string() -> str | None:
     return None
 
 
-def save_cookies(cookie_str: str) -> None:
+def save_cookies(cookie_str: str, account: str = "") -> None:
     cookies = cookie_str_to_dict(cookie_str)
     if not has_required_cookies(cookies):
         raise ValueError("cookie must contain 'a1' and 'web_session'")
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    COOKIE_FILE.write_text(
+    cookie_file = cookie_file_for(account)
+    cookie_file.parent.mkdir(parents=True, exist_ok=True)
+    cookie_file.write_text(
         json.dumps({"cookies": cookies}, ensure_ascii=False, indent=2),
         encoding="utf-8",
     )
     try:
-        COOKIE_FILE.chmod(0o600)
+        cookie_file.chmod(0o600)
     except OSError:
-        logger.debug("failed to chmod cookie file: %s", COOKIE_FILE)
+        logger.debug("failed to chmod cookie file: %s", cookie_file)
 
 
-def clear_cookies() -> bool:
-    if not COOKIE_FILE.exists():
+def clear_cookies(account: str = "") -> bool:
+    cookie_file = cookie_file_for(account)
+    if not cookie_file.exists():
         return False
-    COOKIE_FILE.unlink()
+    cookie_file.unlink()
     return True
 
 
@@ -204,7 +225,7 @@ def _resolve_login_info(session: requests.Session, qr_id: str, code: str) -> Dic
     )
 
 
-def qrcode_login(timeout_seconds: int = 240, cookie_arg: str = "", env_file: str = "") -> str:
+def qrcode_login(timeout_seconds: int = 240, cookie_arg: str = "", env_file: str = "", account: str = "") -> str:
     from xhs_client import bootstrap_anon_cookie_string
 
     source_cookie = _load_login_source_cookie(cookie_arg=cookie_arg, env_file=env_file)
@@ -258,7 +279,7 @@ def qrcode_login(timeout_seconds: int = 240, cookie_arg: str = "", env_file: str
             if secure_session:
                 session.cookies.set("secure_session", secure_session, domain=".xiaohongshu.com")
             cookie_str = _cookiejar_to_cookie_str(session)
-            save_cookies(cookie_str)
+            save_cookies(cookie_str, account)
             print("Login successful.")
             return cookie_str
         if code_status in (3, -1):
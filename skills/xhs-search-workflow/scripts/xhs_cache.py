@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict
+
+from xhs_auth import CONFIG_DIR
+
+# 幂等接口的磁盘响应缓存（默认关闭，XHS_CACHE=1 或 --cache 开启）。
+# 键 = method + API 路径 + 规范化后的参数/请求体（去掉 search_id、xsec_token 等每次都会变的字段）；
+# 值 = zlib 压缩的 JSON，存在一个 sqlite 文件里；只缓存成功响应，按接口设置 TTL，
+# 超过容量时按最近访问时间淘汰（LRU）。
+CACHE_DIR = Path(os.environ.get("XHS_CACHE_DIR", CONFIG_DIR / "cache"))
+CACHE_MAX_MB = float(os.environ.get("XHS_CACHE_MAX_MB", "200"))
+CACHE_MAX_ENTRIES = int(os.environ.get("XHS_CACHE_MAX_ENTRIES", "50000"))
+
+# seconds; endpoints not listed here are never cached
+DEFAULT_TTLS: Dict[str, float] = {
+    "/api/sns/web/v1/feed": 6 * 3600,
+    "/api/sns/web/v1/user/otherinfo": 6 * 3600,
+    "/api/sns/web/v1/search/recommend": 3600,
+    "/api/sns/web/v1/homefeed/category": 24 * 3600,
+    "web:/explore/og:video": 7 * 24 * 3600,
+}
+# e.g. XHS_CACHE_TTLS='{"/api/sns/web/v1/feed": 600}'; 0 disables one endpoint
+DEFAULT_TTL_OVERRIDES = os.environ.get("XHS_CACHE_TTLS", "")
+
+VOLATILE_FIELDS = {"search_id", "request_id", "xsec_token", "xsec_source"}
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in sorted(value.items()) if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(method: str, api: str, params: Dict[str, Any] = None, data: Any = "") -> str:
+    body = data
+    if isinstance(data, str) and data:
+        try:
+            body = json.loads(data)
+        except ValueError:
+            body = data
+    raw = json.dumps([method.upper(), api, _canonical(params or {}), _canonical(body)], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_ttls(text: str) -> Dict[str, float]:
+    ttls = dict(DEFAULT_TTLS)
+    if text:
+        ttls.update({k: float(v) for k, v in json.loads(text).items()})
+    return ttls
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: Path = CACHE_DIR / "responses.sqlite",
+        ttls: Dict[str, float] | None = None,
+        max_mb: float = CACHE_MAX_MB,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path)
+        self.ttls = parse_ttls(DEFAULT_TTL_OVERRIDES) if ttls is None else dict(ttls)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_entries = max(max_entries, 1)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self.by_api: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, api TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL, value BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._count, self._bytes = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def cacheable(self, api: str) -> bool:
+        return self.ttls.get(api, 0) > 0
+
+    def _bump(self, api: str, field: str) -> None:
+        counters = self.by_api.setdefault(api, {"hits": 0, "misses": 0})
+        counters[field] += 1
+
+    def contains(self, key: str) -> bool:
+        # no stats side effects; used to skip pre-signing requests that will be served from cache
+        with self._lock:
+            row = self._db.execute("SELECT expires FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] >= time.time()
+
+    def get(self, api: str, key: str) -> Dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT expires, size, value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] < now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count -= 1
+                self._bytes -= row[1]
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                self._bump(api, "misses")
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            self._bump(api, "hits")
+        return json.loads(zlib.decompress(row[2]).decode("utf-8"))
+
+    def put(self, api: str, key: str, value: Dict[str, Any]) -> None:
+        ttl = self.ttls.get(api, 0)
+        if ttl <= 0:
+            return
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, api, expires, accessed, size, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, api, now + ttl, now, len(blob), blob),
+            )
+            if old is None:
+                self._count += 1
+            else:
+                self._bytes -= old[0]
+            self._bytes += len(blob)
+            self.stores += 1
+            if self._count > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # drop least recently used rows until 90% of both limits
+        target_count = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._count <= target_count and self._bytes <= target_bytes:
+                break
+            doomed.append((key,))
+            self._count -= 1
+            self._bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._count, self._bytes = 0, 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": self._count,
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "by_api": {k: dict(v) for k, v in self.by_api.items()},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
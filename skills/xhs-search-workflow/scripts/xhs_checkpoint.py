@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from xhs_auth import CONFIG_DIR
+
+# 分页断点文件（JSON Lines）：每抓完一页追加一行
+#   {"cursor": <下一页游标>, "has_more": true/false, "items": [...]}
+# 全部完成后追加 {"done": true}。续跑时先按原顺序重放已保存的条目，再从最后一个游标继续，
+# 因此失败只损失当前这一页。崩溃时写了一半的最后一行会被忽略。
+CHECKPOINT_DIR = Path(os.environ.get("XHS_CHECKPOINT_DIR", CONFIG_DIR / "checkpoints"))
+
+
+def _read_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if isinstance(record, dict):
+                yield record
+
+
+def is_unfinished(path: Path) -> bool:
+    # successful runs delete their checkpoint, so saved pages mean a run that failed or was
+    # interrupted (possibly after its last page, e.g. with partial comment threads)
+    path = Path(path)
+    if not path.exists():
+        return False
+    return any(not record.get("done") for record in _read_records(path))
+
+
+def checkpoint_path(*parts: Any) -> Path:
+    digest = hashlib.sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    name = str(parts[0]) if parts else "crawl"
+    return CHECKPOINT_DIR / f"{name}-{digest}.jsonl"
+
+
+class PageCheckpoint:
+    def __init__(self, path: Path, resume: bool = True) -> None:
+        self.path = Path(path)
+        self.cursor = ""
+        self.done = False
+        self.pages = 0
+        self.items = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._scan()
+        else:
+            self.path.write_text("", encoding="utf-8")
+        self.resumed_pages = self.pages
+
+    def _scan(self) -> None:
+        # keep only the resume state in memory; items are re-read by replay()
+        valid_bytes = 0
+        with self.path.open("rb") as f:
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                valid_bytes += len(raw)
+                if record.get("done"):
+                    self.done = True
+                    continue
+                self.pages += 1
+                self.items += len(record.get("items", []))
+                self.cursor = str(record.get("cursor", ""))
+                # the last page was saved but the run died before finish()
+                self.done = not record.get("has_more", True)
+        with self.path.open("r+b") as f:
+            f.truncate(valid_bytes)
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        for record in _read_records(self.path):
+            yield from record.get("items", [])
+
+    def append(self, cursor: Any, items: List[Dict[str, Any]], has_more: bool) -> None:
+        line = json.dumps({"cursor": cursor, "has_more": has_more, "items": items}, ensure_ascii=False)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.cursor = str(cursor)
+        self.pages += 1
+        self.items += len(items)
+
+    def finish(self) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"done": True}) + "\n")
+        self.done = True
+
+    def remove(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": str(self.path), "pages": self.pages, "items": self.items, "resumed_pages": self.resumed_pages, "done": self.done}
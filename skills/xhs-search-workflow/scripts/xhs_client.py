@@ -3,24 +3,39 @@ import hashlib
 import json
 import math
 import os
+import queue
 import random
 import re
 import shutil
 import sys
+import threading
 import time
 import urllib.parse
 import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
-import execjs
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from xhs_accounts import get_cookie_pool, is_pool_cookie, pool_cookie
 from xhs_auth import cookie_str_to_dict, get_saved_cookie_string, has_required_cookies
-
-BASE_URL = "https://edith.xiaohongshu.com"
+from xhs_cache import ResponseCache, cache_key
+from xhs_checkpoint import PageCheckpoint
+from xhs_filter import ItemFilter
+from xhs_ratelimit import DEFAULT_ENDPOINT_RATES, RateLimiter, parse_endpoint_rates
+from xhs_retry import AUTH, INTERNAL, OK, RISK, TRANSPORT, RetryPolicy, classify_response
+from xhs_signer import TraceIdPool, create_signer
+from xhs_singleflight import SingleFlight
+
+# XHS_BASE_URL points the client at another host, e.g. the offline mock_server.py
+BASE_URL = os.environ.get("XHS_BASE_URL", "https://edith.xiaohongshu.com").rstrip("/")
 SKILL_DIR = Path(__file__).resolve().parents[1]
 JS_DIR = SKILL_DIR / "assets" / "js"
+# keep-alive connections kept per host (edith API and each CDN host get their own pool)
+HTTP_POOL_SIZE = int(os.environ.get("XHS_HTTP_POOL_SIZE", "16"))
 
 
 def configure_utf8_stdio() -> None:
@@ -57,19 +72,202 @@ def ensure_js_assets() -> None:
             shutil.copy2(src, dst)
 
 
-def _compile_with_cwd(js_file: Path) -> execjs.ExternalRuntime.Context:
-    bootstrap = (
-        f"process.chdir({json.dumps(str(JS_DIR))});\n"
-        f"globalThis.__XHS_SKILL_JS_DIR={json.dumps(str(JS_DIR))};\n"
+configure_utf8_stdio()
+
+# Signer, trace id pool and JS asset check are created on first use, so commands
+# that never sign a request (--help, logout, no-water-img, ...) start instantly.
+_SIGNER: Any = None
+_TRACE_POOL: Any = None
+_SIGNER_LOCK = threading.Lock()
+
+
+def get_signer() -> Any:
+    global _SIGNER, _TRACE_POOL
+    if _SIGNER is None:
+        with _SIGNER_LOCK:
+            if _SIGNER is None:
+                ensure_js_assets()
+                signer = create_signer()
+                _TRACE_POOL = TraceIdPool(signer)
+                _SIGNER = signer
+    return _SIGNER
+
+
+def get_trace_pool() -> Any:
+    get_signer()
+    return _TRACE_POOL
+
+
+class _NoCookieStorePolicy(DefaultCookiePolicy):
+    # The shared session serves many accounts; cookies are always passed per request.
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+
+_HTTP_SESSION: Any = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _build_http_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    session.cookies.set_policy(_NoCookieStorePolicy())
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(pool_size, 1), pool_block=False)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        with _HTTP_LOCK:
+            if _HTTP_SESSION is None:
+                _HTTP_SESSION = _build_http_session(HTTP_POOL_SIZE)
+    return _HTTP_SESSION
+
+
+def configure_http_pool(pool_size: int) -> None:
+    global _HTTP_SESSION, HTTP_POOL_SIZE
+    with _HTTP_LOCK:
+        HTTP_POOL_SIZE = pool_size
+        old, _HTTP_SESSION = _HTTP_SESSION, _build_http_session(pool_size)
+    if old is not None:
+        old.close()
+
+
+_RATE_LIMITER = RateLimiter(endpoint_rates=parse_endpoint_rates(DEFAULT_ENDPOINT_RATES))
+
+
+def configure_rate_limit(
+    rate: float = None,
+    burst: float = None,
+    jitter: float = None,
+    endpoint_rates: Dict[str, Tuple[float, float]] = None,
+) -> None:
+    # None keeps the current value (env defaults until configured).
+    global _RATE_LIMITER
+    current = _RATE_LIMITER
+    if rate is None and burst is None and jitter is None and endpoint_rates is None:
+        return
+    _RATE_LIMITER = RateLimiter(
+        current.rate if rate is None else rate,
+        current.burst if burst is None else burst,
+        current.jitter if jitter is None else jitter,
+        current.endpoint_rates if endpoint_rates is None else endpoint_rates,
     )
-    source = js_file.read_text(encoding="utf-8")
-    return execjs.compile(bootstrap + source)
 
 
-configure_utf8_stdio()
-ensure_js_assets()
-_JS_XS = _compile_with_cwd(JS_DIR / "xhs_xs_xsc_56.js")
-_JS_XRAY = _compile_with_cwd(JS_DIR / "xhs_xray.js")
+def get_rate_limiter() -> RateLimiter:
+    return _RATE_LIMITER
+
+
+# presigned x-s/x-t are only good for a few seconds; windows are sized so they are sent within this age
+SIGN_MAX_AGE = float(os.environ.get("XHS_SIGN_MAX_AGE", "5"))
+
+
+_PRESIGN_STATS: Dict[str, int] = {"resigned": 0}
+
+
+def signature_age(headers: Dict[str, str]) -> float:
+    # seconds since the x-t timestamp (milliseconds) in signed headers
+    try:
+        xt = float(headers.get("x-t") or 0)
+    except ValueError:
+        return math.inf
+    return time.time() - xt / 1000 if xt else math.inf
+
+
+def presign_window(requested: int, api: str = "/api/sns/web/v1/feed") -> int:
+    # at most what the rate limiter lets out for `api` within SIGN_MAX_AGE
+    rates = [rate for rate in (_RATE_LIMITER.rate, _RATE_LIMITER.endpoint_rates.get(api, (0, 0))[0]) if rate > 0]
+    if not rates:
+        return max(requested, 1)
+    return max(1, min(requested, int(min(rates) * SIGN_MAX_AGE)))
+
+
+_RETRY_POLICY = RetryPolicy()
+
+
+def configure_retry(max_attempts: int = None, base_delay: float = None, throttle_delay: float = None, max_delay: float = None) -> None:
+    global _RETRY_POLICY
+    current = _RETRY_POLICY
+    _RETRY_POLICY = RetryPolicy(
+        current.max_attempts if max_attempts is None else max_attempts,
+        current.base_delay if base_delay is None else base_delay,
+        current.throttle_delay if throttle_delay is None else throttle_delay,
+        current.max_delay if max_delay is None else max_delay,
+    )
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _RETRY_POLICY
+
+
+_RESPONSE_CACHE: Any = None
+_CACHE_LOCK = threading.Lock()
+_CACHE_ENABLED = os.environ.get("XHS_CACHE", "0") not in ("", "0", "false")
+
+
+def configure_cache(enabled: bool = None, path: str = None, ttls: Dict[str, float] = None, max_mb: float = None) -> None:
+    # None keeps the current value; the cache file is opened on first use.
+    global _CACHE_ENABLED, _RESPONSE_CACHE
+    with _CACHE_LOCK:
+        if enabled is not None:
+            _CACHE_ENABLED = enabled
+        if path is None and ttls is None and max_mb is None:
+            return
+        old, _RESPONSE_CACHE = _RESPONSE_CACHE, None
+        kwargs: Dict[str, Any] = {}
+        if path is not None:
+            kwargs["path"] = Path(path)
+        if ttls is not None:
+            kwargs["ttls"] = ttls
+        if max_mb is not None:
+            kwargs["max_mb"] = max_mb
+        _RESPONSE_CACHE = ResponseCache(**kwargs)
+    if old is not None:
+        old.close()
+
+
+def get_response_cache() -> Any:
+    global _RESPONSE_CACHE
+    if not _CACHE_ENABLED:
+        return None
+    if _RESPONSE_CACHE is None:
+        with _CACHE_LOCK:
+            if _RESPONSE_CACHE is None:
+                _RESPONSE_CACHE = ResponseCache()
+    return _RESPONSE_CACHE
+
+
+_SINGLE_FLIGHT = SingleFlight()
+_SINGLE_FLIGHT_ENABLED = os.environ.get("XHS_SINGLE_FLIGHT", "1") not in ("", "0", "false")
+
+
+def configure_single_flight(enabled: bool = None) -> None:
+    global _SINGLE_FLIGHT_ENABLED
+    if enabled is not None:
+        _SINGLE_FLIGHT_ENABLED = enabled
+
+
+def single_flight_enabled() -> bool:
+    return _SINGLE_FLIGHT_ENABLED
+
+
+def single_flight_stats() -> Dict[str, int]:
+    return {"enabled": _SINGLE_FLIGHT_ENABLED, **_SINGLE_FLIGHT.stats()}
+
+
+def single_flight_key(method: str, api: str, cookies_str: str, data: Any = "", params: Dict[str, Any] = None) -> str:
+    # requests from different accounts are never merged
+    account = cookies_str if is_pool_cookie(cookies_str) else trans_cookies(cookies_str or "").get("a1", "")
+    return f"{account}|{cache_key(method, api, params, data)}"
+
+
+def cache_stats() -> Dict[str, Any]:
+    if _RESPONSE_CACHE is None:
+        return {"enabled": _CACHE_ENABLED}
+    return {"enabled": _CACHE_ENABLED, **_RESPONSE_CACHE.stats()}
 
 
 def trans_cookies(cookies_str: str) -> Dict[str, str]:
@@ -115,7 +313,11 @@ def bootstrap_anon_cookie_string(existing_cookie_str: str = "", platform: str =
     return "; ".join(f"{k}={v}" for k, v in cookies.items())
 
 
-def load_cookies(cookie_arg: str = "", env_file: str = "") -> str:
+def load_cookies(cookie_arg: str = "", env_file: str = "", accounts: str = "") -> str:
+    if accounts:
+        # "all" or "alice,bob": rotate saved accounts per request (see xhs_accounts)
+        get_cookie_pool(pool_cookie(accounts))
+        return pool_cookie(accounts)
     if cookie_arg:
         parsed = cookie_str_to_dict(cookie_arg)
         if not has_required_cookies(parsed):
@@ -144,37 +346,54 @@ def generate_x_b3_traceid(length: int = 16) -> str:
 
 
 def generate_xray_traceid() -> str:
-    return _JS_XRAY.call("traceId")
+    return get_trace_pool().pop()
+
+
+def trace_pool_stats() -> Dict[str, int]:
+    if _TRACE_POOL is None:
+        return {}
+    return _TRACE_POOL.stats()
+
+
+def signer_stats() -> Dict[str, Any]:
+    if _SIGNER is None:
+        return {"backend": None}
+    stats = getattr(_SIGNER, "stats", None)
+    return {"backend": _SIGNER.name, "presigned_resigned": _PRESIGN_STATS["resigned"], **(stats() if stats else {})}
+
+
+_REQUEST_HEADERS_TEMPLATE: Dict[str, str] = {
+    "authority": "edith.xiaohongshu.com",
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "zh-CN,zh;q=0.9",
+    "cache-control": "no-cache",
+    "content-type": "application/json;charset=UTF-8",
+    "origin": "https://www.xiaohongshu.com",
+    "pragma": "no-cache",
+    "priority": "u=1, i",
+    "referer": "https://www.xiaohongshu.com/",
+    "sec-ch-ua": '"Chromium";v="146", "Not-A.Brand";v="24", "Google Chrome";v="146"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/146.0.0.0 Safari/537.36",
+    "x-b3-traceid": "",
+    "x-s": "",
+    "x-s-common": "",
+    "x-t": "",
+    "x-xray-traceid": "",
+}
 
 
 def get_request_headers_template() -> Dict[str, str]:
-    return {
-        "authority": "edith.xiaohongshu.com",
-        "accept": "application/json, text/plain, */*",
-        "accept-language": "zh-CN,zh;q=0.9",
-        "cache-control": "no-cache",
-        "content-type": "application/json;charset=UTF-8",
-        "origin": "https://www.xiaohongshu.com",
-        "pragma": "no-cache",
-        "priority": "u=1, i",
-        "referer": "https://www.xiaohongshu.com/",
-        "sec-ch-ua": '"Chromium";v="146", "Not-A.Brand";v="24", "Google Chrome";v="146"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Windows"',
-        "sec-fetch-dest": "empty",
-        "sec-fetch-mode": "cors",
-        "sec-fetch-site": "same-site",
-        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/146.0.0.0 Safari/537.36",
-        "x-b3-traceid": "",
-        "x-s": "",
-        "x-s-common": "",
-        "x-t": "",
-        "x-xray-traceid": generate_xray_traceid(),
-    }
+    headers = dict(_REQUEST_HEADERS_TEMPLATE)
+    headers["x-xray-traceid"] = generate_xray_traceid()
+    return headers
 
 
-def generate_headers(a1: str, api: str, data: Any = "", method: str = "POST") -> Tuple[Dict[str, str], str]:
-    ret = _JS_XS.call("get_request_headers_params", api, data, a1, method)
+def _build_headers(ret: Dict[str, Any], data: Any) -> Tuple[Dict[str, str], str]:
     headers = get_request_headers_template()
     headers["x-s"] = ret["xs"]
     headers["x-t"] = str(ret["xt"])
@@ -186,16 +405,44 @@ def generate_headers(a1: str, api: str, data: Any = "", method: str = "POST") ->
     return headers, payload
 
 
-def generate_request_params(cookies_str: str, api: str, data: Any = "", method: str = "POST") -> Tuple[Dict[str, str], Dict[str, str], str]:
+def generate_headers(a1: str, api: str, data: Any = "", method: str = "POST") -> Tuple[Dict[str, str], str]:
+    ret = get_signer().sign(api, data, a1, method)
+    return _build_headers(ret, data)
+
+
+def generate_headers_batch(batch: List[Tuple[str, str, Any, str]]) -> List[Tuple[Dict[str, str], str]]:
+    # batch items are (a1, api, data, method); all of them are signed in one JS round-trip.
+    if not batch:
+        return []
+    rets = get_signer().sign_batch([(api, data, a1, method) for a1, api, data, method in batch])
+    return [_build_headers(ret, item[2]) for ret, item in zip(rets, batch)]
+
+
+def _cookies_with_a1(cookies_str: str) -> Tuple[Dict[str, str], str]:
     cookie_str = bootstrap_anon_cookie_string(cookies_str) if (not cookies_str or "a1=" not in cookies_str) else cookies_str
     cookies = trans_cookies(cookie_str)
     a1 = cookies.get("a1", "")
     if not a1:
         raise ValueError("cookie missing 'a1'")
+    return cookies, a1
+
+
+def generate_request_params(cookies_str: str, api: str, data: Any = "", method: str = "POST") -> Tuple[Dict[str, str], Dict[str, str], str]:
+    cookies, a1 = _cookies_with_a1(cookies_str)
     headers, payload = generate_headers(a1, api, data, method)
     return headers, cookies, payload
 
 
+def generate_request_params_batch(cookies_str: str, batch: List[Tuple[str, Any, str]]) -> List[Tuple[Dict[str, str], Dict[str, str], str]]:
+    # batch items are (api, data, method) signed for the same cookie.
+    if is_pool_cookie(cookies_str):
+        # the account is only picked at send time, so nothing can be signed ahead
+        return [None] * len(batch)
+    cookies, a1 = _cookies_with_a1(cookies_str)
+    signed = generate_headers_batch([(a1, api, data, method.upper()) for api, data, method in batch])
+    return [(headers, dict(cookies), payload) for headers, payload in signed]
+
+
 def _splice(api: str, params: Dict[str, Any]) -> str:
     query_parts: List[str] = []
     for key, value in params.items():
@@ -205,20 +452,237 @@ def _splice(api: str, params: Dict[str, Any]) -> str:
     return f"{api}?{'&'.join(query_parts)}" if query_parts else api
 
 
-def _request_json(method: str, api: str, cookies_str: str, data: Any = "", params: Dict[str, Any] = None, timeout: int = 30) -> Tuple[bool, str, Dict[str, Any]]:
+def _send_once(
+    method: str,
+    request_api: str,
+    api: str,
+    cookies_str: str,
+    data: Any,
+    timeout: int,
+    signed: Tuple[Dict[str, str], Dict[str, str], str],
+) -> Tuple[str, str, Dict[str, Any]]:
+    try:
+        _RATE_LIMITER.acquire(trans_cookies(cookies_str).get("a1", ""), api)
+        # the limiter wait comes first, so x-t is fresh when sent: presigned headers
+        # that aged past SIGN_MAX_AGE while queued or waiting are signed again
+        if signed is not None and signature_age(signed[0]) > SIGN_MAX_AGE:
+            signed = None
+            _PRESIGN_STATS["resigned"] += 1
+        if signed is None:
+            signed = generate_request_params(cookies_str, request_api, data, method)
+        headers, cookies, payload = signed
+    except Exception as e:
+        return INTERNAL, str(e), {}
     try:
-        request_api = _splice(api, params or {}) if method.upper() == "GET" else api
-        headers, cookies, payload = generate_request_params(cookies_str, request_api, data, method.upper())
         url = BASE_URL + request_api
-        if method.upper() == "GET":
-            response = requests.get(url, headers=headers, cookies=cookies, timeout=timeout)
+        session = get_http_session()
+        if method == "GET":
+            response = session.get(url, headers=headers, cookies=cookies, timeout=timeout)
         else:
             body = payload.encode("utf-8") if payload else b""
-            response = requests.post(url, headers=headers, data=body, cookies=cookies, timeout=timeout)
+            response = session.post(url, headers=headers, data=body, cookies=cookies, timeout=timeout)
+    except Exception as e:
+        return TRANSPORT, str(e), {}
+    return _read_response(response)
+
+
+def _read_response(response: Any) -> Tuple[str, str, Dict[str, Any]]:
+    # (error class, msg, json) for a requests or httpx response; shared with xhs_client_async
+    try:
         res_json = response.json()
-        return bool(res_json.get("success", False)), res_json.get("msg", ""), res_json
+    except ValueError:
+        res_json = {}
+    if not isinstance(res_json, dict):
+        res_json = {}
+    error_class = classify_response(response.status_code, res_json)
+    if not res_json and error_class == OK:
+        return TRANSPORT, f"non-JSON response (HTTP {response.status_code})", {}
+    if not res_json:
+        return error_class, f"HTTP {response.status_code}", {}
+    return error_class, res_json.get("msg", ""), res_json
+
+
+def _cached_response(method: str, api: str, params: Dict[str, Any] | None, data: Any) -> Tuple[str, Dict[str, Any] | None]:
+    # (cache key or "", cached response or None); hits are marked in res["_request"]
+    cache = get_response_cache()
+    if cache is None or not cache.cacheable(api):
+        return "", None
+    key = cache_key(method, api, params, data)
+    cached = cache.get(api, key)
+    if cached is not None:
+        cached["_request"] = {"attempts": 0, "error_class": OK, "cache": "hit"}
+    return key, cached
+
+
+def _finish_response(api: str, key: str, error_class: str, res_json: Dict[str, Any], attempt: int, account: Any) -> bool:
+    # stores successful responses in the cache and records how the request went in res["_request"]
+    success = error_class == OK and bool(res_json.get("success", False))
+    if success and key:
+        get_response_cache().put(api, key, res_json)
+    res_json["_request"] = {"attempts": attempt, "error_class": error_class}
+    if account is not None:
+        res_json["_request"]["account"] = account.name
+    return success
+
+
+def _request_json(
+    method: str,
+    api: str,
+    cookies_str: str,
+    data: Any = "",
+    params: Dict[str, Any] = None,
+    timeout: int = 30,
+    signed: Tuple[Dict[str, str], Dict[str, str], str] = None,
+) -> Tuple[bool, str, Dict[str, Any]]:
+    # Identical requests already in flight in this process share one signature and one
+    # network call; followers get a copy with res["_request"]["shared"] = True.
+    fetch = lambda: _fetch_json(method, api, cookies_str, data, params, timeout, signed)
+    if not _SINGLE_FLIGHT_ENABLED:
+        return fetch()
+    return _SINGLE_FLIGHT.do(single_flight_key(method.upper(), api, cookies_str, data, params), fetch)
+
+
+def _request_line(method: str, api: str, params: Dict[str, Any] | None) -> Tuple[str, str]:
+    # (METHOD, path actually requested); GET params go in the query string
+    method = method.upper()
+    return method, _splice(api, params or {}) if method == "GET" else api
+
+
+class _Attempts:
+    # The retry/failover state machine behind _fetch_json, shared with xhs_client_async:
+    # the caller only waits, sends and sleeps, this decides which cookie to send with and what comes next.
+    def __init__(self, cookies_str: str, policy: RetryPolicy) -> None:
+        self.cookies_str = cookies_str
+        self.policy = policy
+        self.pool = get_cookie_pool(cookies_str) if is_pool_cookie(cookies_str) else None
+        self.account: Any = None
+        self.attempt = 0
+        self.error_class, self.msg, self.res_json = INTERNAL, "", {}
+
+    def next_cookie(self) -> Tuple[str | None, float]:
+        # (cookie string for the next attempt, 0), or (None, seconds until a pool account is free)
+        if self.pool is None:
+            return self.cookies_str, 0.0
+        account, wait = self.pool.try_acquire()
+        if account is None:
+            return None, wait
+        self.account = account
+        return account.cookie_str, 0.0
+
+    def record(self, error_class: str, msg: str, res_json: Dict[str, Any]) -> float | None:
+        # None: stop with this result; otherwise seconds to sleep before the next attempt (0 on failover)
+        self.attempt += 1
+        self.error_class, self.msg, self.res_json = error_class, msg, res_json
+        if self.pool is not None:
+            self.pool.report(self.account, error_class)
+            if error_class in (AUTH, RISK) and self.attempt < self.policy.max_attempts:
+                return 0.0
+        if error_class == OK or not self.policy.should_retry(error_class, self.attempt):
+            return None
+        return self.policy.backoff(error_class, self.attempt)
+
+    def fail(self, e: Exception) -> None:
+        self.attempt += 1
+        self.error_class, self.msg, self.res_json = INTERNAL, str(e), {}
+
+    def result(self, api: str, key: str) -> Tuple[bool, str, Dict[str, Any]]:
+        return _finish_response(api, key, self.error_class, self.res_json, self.attempt, self.account), self.msg, self.res_json
+
+
+def _fetch_json(
+    method: str,
+    api: str,
+    cookies_str: str,
+    data: Any = "",
+    params: Dict[str, Any] = None,
+    timeout: int = 30,
+    signed: Tuple[Dict[str, str], Dict[str, str], str] = None,
+) -> Tuple[bool, str, Dict[str, Any]]:
+    # Failures are classified (see xhs_retry); transport errors, 5xx and throttling are
+    # retried with backoff, everything else fails fast. res["_request"] records attempts.
+    # With a cookie-pool token each attempt takes an account from the pool and auth/risk
+    # failures fail over to the next account instead of failing fast.
+    method, request_api = _request_line(method, api, params)
+    key, cached = _cached_response(method, api, params, data)
+    if cached is not None:
+        return True, cached.get("msg", "成功"), cached
+    attempts = _Attempts(cookies_str, _RETRY_POLICY)
+    while True:
+        try:
+            cookie, wait = attempts.next_cookie()
+            while cookie is None:
+                time.sleep(wait)
+                cookie, wait = attempts.next_cookie()
+        except Exception as e:
+            attempts.fail(e)
+            break
+        delay = attempts.record(*_send_once(method, request_api, api, cookie, data, timeout, signed if attempts.pool is None else None))
+        signed = None  # retries are always re-signed
+        if delay is None:
+            break
+        if delay:
+            time.sleep(delay)
+    return attempts.result(api, key)
+
+
+def _iter_cursor_pages(
+    fetch: Callable[[str], Tuple[bool, str, Dict[str, Any]]],
+    list_key: str,
+    stop_on_empty: bool = True,
+    checkpoint: PageCheckpoint | None = None,
+    expand: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]] | None = None,
+    item_filter: ItemFilter | None = None,
+    time_sorted: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    # Yields items page by page; a failed page raises RuntimeError after the earlier items were yielded.
+    # With a checkpoint, saved pages are replayed first and fetching resumes from the last saved cursor.
+    # item_filter drops items per page; on newest-first (time_sorted) sources it also ends paging at --since.
+    cursor = ""
+    if checkpoint is not None:
+        yield from checkpoint.replay()
+        if checkpoint.done:
+            return
+        cursor = checkpoint.cursor
+    while True:
+        success, msg, res_json = fetch(cursor)
+        if not success:
+            raise RuntimeError(msg)
+        batch, cursor, has_more = _read_page(res_json, list_key, stop_on_empty, item_filter, time_sorted)
+        if expand is not None:
+            batch = expand(batch)
+        if checkpoint is not None:
+            checkpoint.append(cursor, batch, has_more)
+        yield from batch
+        if not has_more:
+            break
+    if checkpoint is not None:
+        checkpoint.finish()
+
+
+def _read_page(
+    res_json: Dict[str, Any], list_key: str, stop_on_empty: bool, item_filter: ItemFilter | None, time_sorted: bool
+) -> Tuple[List[Dict[str, Any]], str, bool]:
+    # (kept items, next cursor, has_more) for one cursor page; shared with xhs_client_async
+    data = res_json.get("data", {})
+    batch = data.get(list_key, [])
+    cursor = str(data.get("cursor", ""))
+    has_more = bool(batch or not stop_on_empty) and bool(data.get("has_more", False))
+    if item_filter is not None:
+        batch, past_window = item_filter.apply(batch, time_sorted)
+        has_more = has_more and not past_window
+    return batch, cursor, has_more
+
+
+def _collect(items: Iterator[Dict[str, Any]]) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    # list-returning wrapper over an iter_* generator; keeps what was fetched before a failure
+    rows: List[Dict[str, Any]] = []
+    success, msg = True, "成功"
+    try:
+        for item in items:
+            rows.append(item)
     except Exception as e:
-        return False, str(e), {}
+        success, msg = False, str(e)
+    return success, msg, rows
 
 
 def _parse_user_url(user_url: str) -> Tuple[str, str, str]:
@@ -244,8 +708,8 @@ def get_homefeed_all_channel(cookies_str: str) -> Tuple[bool, str, Dict[str, Any
     return _request_json("GET", "/api/sns/web/v1/homefeed/category", cookies_str)
 
 
-def get_homefeed_recommend(category: str, cursor_score: str, refresh_type: int, note_index: int, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
-    data = {
+def _homefeed_payload(category: str, cursor_score: str, refresh_type: int, note_index: int) -> Dict[str, Any]:
+    return {
         "cursor_score": cursor_score,
         "num": 20,
         "refresh_type": refresh_type,
@@ -259,6 +723,10 @@ def get_homefeed_recommend(category: str, cursor_score: str, refresh_type: int,
         "image_formats": ["jpg", "webp", "avif"],
         "need_filter_image": False,
     }
+
+
+def get_homefeed_recommend(category: str, cursor_score: str, refresh_type: int, note_index: int, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    data = _homefeed_payload(category, cursor_score, refresh_type, note_index)
     return _request_json("POST", "/api/sns/web/v1/homefeed", cookies_str, data=data)
 
 
@@ -286,6 +754,120 @@ def get_homefeed_recommend_by_num(category: str, require_num: int, cookies_str:
     return success, msg, note_list[:require_num]
 
 
+HOMEFEED_STALE_PAGES = 3
+
+
+def harvest_channels(cookies_str: str) -> List[str]:
+    success, msg, res_json = get_homefeed_all_channel(cookies_str)
+    if not success:
+        raise RuntimeError(msg)
+    return [c.get("id", "") for c in res_json.get("data", {}).get("categories", []) if c.get("id")]
+
+
+def iter_homefeed_harvest(
+    cookies_str: str,
+    channels: List[str] = None,
+    per_channel: int = 100,
+    deadline: float = 60.0,
+    workers: int = None,
+    stats: Dict[str, Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    # One cursor chain per channel on its own thread; items are yielded as pages arrive, de-duplicated
+    # by id across channels and tagged with the channel that returned them first. A channel stops at
+    # `per_channel` new items, on an empty page, after HOMEFEED_STALE_PAGES pages without anything new,
+    # or on an error; everything stops at `deadline` seconds. Per-channel counters go into `stats`.
+    channels = harvest_channels(cookies_str) if channels is None else channels
+    stats = {} if stats is None else stats
+    stop = {channel: threading.Event() for channel in channels}
+    pages: "queue.Queue[Tuple[str, str, Any]]" = queue.Queue()
+    for channel in channels:
+        stats[channel] = {"pages": 0, "fetched": 0, "new": 0, "stopped": "running"}
+
+    def chain(channel: str) -> None:
+        cursor_score, refresh_type, note_index = "", 1, 0
+        try:
+            while not stop[channel].is_set():
+                success, msg, res_json = get_homefeed_recommend(channel, cursor_score, refresh_type, note_index, cookies_str)
+                if not success:
+                    raise RuntimeError(msg)
+                data = res_json.get("data", {})
+                items = data.get("items", [])
+                pages.put((channel, "page", items))
+                if not items:
+                    break
+                cursor_score, refresh_type = data.get("cursor_score", ""), 3
+                note_index += 20
+        except Exception as e:
+            pages.put((channel, "error", str(e)))
+        pages.put((channel, "done", None))
+
+    seen: set = set()
+    running = len(channels)
+    end = time.monotonic() + deadline
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers or len(channels), len(channels) or 1)), thread_name_prefix="xhs-homefeed")
+    try:
+        for channel in channels:
+            executor.submit(chain, channel)
+        while running:
+            try:
+                channel, kind, payload = pages.get(timeout=max(end - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            report = stats[channel]
+            if kind == "done":
+                running -= 1
+                if report["stopped"] == "running":
+                    report["stopped"] = "exhausted"
+                continue
+            if kind == "error":
+                report["stopped"], report["msg"] = "error", payload
+                continue
+            if stop[channel].is_set():
+                continue
+            report["pages"] += 1
+            report["fetched"] += len(payload)
+            new = 0
+            for item in payload:
+                item_id = item.get("id", "")
+                if not item_id or item_id in seen or report["new"] >= per_channel:
+                    continue
+                seen.add(item_id)
+                report["new"] += 1
+                new += 1
+                yield dict(item, channel=channel)
+            report["stale"] = 0 if new else report.get("stale", 0) + 1
+            if report["new"] >= per_channel:
+                report["stopped"] = "quota"
+            elif report["stale"] >= HOMEFEED_STALE_PAGES:
+                report["stopped"] = "stale"
+            if report["stopped"] != "running":
+                stop[channel].set()
+    finally:
+        for channel in channels:
+            stop[channel].set()
+            if stats[channel]["stopped"] == "running":
+                stats[channel]["stopped"] = "deadline"
+            stats[channel].pop("stale", None)
+        # in-flight requests finish in the background and are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def harvest_homefeed(
+    cookies_str: str,
+    channels: List[str] = None,
+    per_channel: int = 100,
+    deadline: float = 60.0,
+    workers: int = None,
+) -> Tuple[bool, str, Dict[str, Any]]:
+    stats: Dict[str, Dict[str, Any]] = {}
+    start = time.monotonic()
+    success, msg, notes = _collect(iter_homefeed_harvest(cookies_str, channels, per_channel, deadline, workers, stats))
+    failed = [f"{channel}: {report['msg']}" for channel, report in stats.items() if report["stopped"] == "error"]
+    if success and failed:
+        success, msg = False, f"{len(failed)}/{len(stats)} 个频道失败: {failed[0]}"
+    return success, msg, {"notes": notes, "channels": stats, "elapsed_s": round(time.monotonic() - start, 3)}
+
+
 # ---------- User ----------
 def get_user_info(user_id: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
     return _request_json("GET", "/api/sns/web/v1/user/otherinfo", cookies_str, params={"target_user_id": user_id})
@@ -299,8 +881,9 @@ def get_user_self_info2(cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
     return _request_json("GET", "/api/sns/web/v2/user/me", cookies_str)
 
 
-def get_user_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_search") -> Tuple[bool, str, Dict[str, Any]]:
-    params = {
+def _user_page_params(user_id: str, cursor: str, xsec_token: str, xsec_source: str) -> Dict[str, Any]:
+    # posted / liked / collected pages take the same query
+    return {
         "num": "30",
         "cursor": cursor,
         "user_id": user_id,
@@ -308,115 +891,108 @@ def get_user_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token:
         "xsec_token": xsec_token,
         "xsec_source": xsec_source,
     }
+
+
+def get_user_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_search") -> Tuple[bool, str, Dict[str, Any]]:
+    params = _user_page_params(user_id, cursor, xsec_token, xsec_source)
     return _request_json("GET", "/api/sns/web/v1/user_posted", cookies_str, params=params)
 
 
-def get_user_all_notes(user_url: str, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    notes: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        user_id, xsec_token, xsec_source = _parse_user_url(user_url)
-        while True:
-            success, msg, res_json = get_user_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            page_notes = data.get("notes", [])
-            notes.extend(page_notes)
-            cursor = str(data.get("cursor", ""))
-            if not page_notes or not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, notes
+def iter_user_all_notes(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Iterator[Dict[str, Any]]:
+    user_id, xsec_token, xsec_source = _parse_user_url(user_url)
+    yield from _iter_cursor_pages(lambda cursor: get_user_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source), "notes", checkpoint=checkpoint, item_filter=item_filter, time_sorted=True)
+
+
+def get_user_all_notes(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_user_all_notes(user_url, cookies_str, checkpoint, item_filter))
 
 
 def get_user_like_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_user") -> Tuple[bool, str, Dict[str, Any]]:
-    params = {
-        "num": "30",
-        "cursor": cursor,
-        "user_id": user_id,
-        "image_formats": "jpg,webp,avif",
-        "xsec_token": xsec_token,
-        "xsec_source": xsec_source,
-    }
+    params = _user_page_params(user_id, cursor, xsec_token, xsec_source)
     return _request_json("GET", "/api/sns/web/v1/note/like/page", cookies_str, params=params)
 
 
-def get_user_all_like_note_info(user_url: str, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    notes: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        user_id, xsec_token, xsec_source = _parse_user_url(user_url)
-        if not xsec_source:
-            xsec_source = "pc_user"
-        while True:
-            success, msg, res_json = get_user_like_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            page_notes = data.get("notes", [])
-            notes.extend(page_notes)
-            cursor = str(data.get("cursor", ""))
-            if not page_notes or not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, notes
+def iter_user_all_like_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Iterator[Dict[str, Any]]:
+    user_id, xsec_token, xsec_source = _parse_user_url(user_url)
+    xsec_source = xsec_source or "pc_user"
+    yield from _iter_cursor_pages(lambda cursor: get_user_like_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source), "notes", checkpoint=checkpoint, item_filter=item_filter)
+
+
+def get_user_all_like_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_user_all_like_note_info(user_url, cookies_str, checkpoint, item_filter))
 
 
 def get_user_collect_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_search") -> Tuple[bool, str, Dict[str, Any]]:
-    params = {
-        "num": "30",
-        "cursor": cursor,
-        "user_id": user_id,
-        "image_formats": "jpg,webp,avif",
-        "xsec_token": xsec_token,
-        "xsec_source": xsec_source,
-    }
+    params = _user_page_params(user_id, cursor, xsec_token, xsec_source)
     return _request_json("GET", "/api/sns/web/v2/note/collect/page", cookies_str, params=params)
 
 
-def get_user_all_collect_note_info(user_url: str, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    notes: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        user_id, xsec_token, xsec_source = _parse_user_url(user_url)
-        while True:
-            success, msg, res_json = get_user_collect_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            page_notes = data.get("notes", [])
-            notes.extend(page_notes)
-            cursor = str(data.get("cursor", ""))
-            if not page_notes or not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, notes
+def iter_user_all_collect_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Iterator[Dict[str, Any]]:
+    user_id, xsec_token, xsec_source = _parse_user_url(user_url)
+    yield from _iter_cursor_pages(lambda cursor: get_user_collect_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source), "notes", checkpoint=checkpoint, item_filter=item_filter)
+
+
+def get_user_all_collect_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_user_all_collect_note_info(user_url, cookies_str, checkpoint, item_filter))
 
 
 # ---------- Note/Search ----------
-def get_note_info(url: str, cookies_str: str, timeout: int = 30) -> Tuple[bool, str, Dict[str, Any]]:
+def _note_info_payload(url: str) -> Dict[str, Any]:
     note_id, xsec_token, xsec_source = _parse_note_url(url)
-    data = {
+    return {
         "source_note_id": note_id,
         "image_formats": ["jpg", "webp", "avif"],
         "extra": {"need_body_topic": "1"},
         "xsec_source": xsec_source,
         "xsec_token": xsec_token,
     }
-    return _request_json("POST", "/api/sns/web/v1/feed", cookies_str, data=data, timeout=timeout)
+
+
+def prepare_note_info_requests(urls: List[str], cookies_str: str) -> List[Tuple[Dict[str, str], Dict[str, str], str]]:
+    batch = [("/api/sns/web/v1/feed", _note_info_payload(url), "POST") for url in urls]
+    cache = get_response_cache()
+    if cache is None or not cache.cacheable("/api/sns/web/v1/feed"):
+        return generate_request_params_batch(cookies_str, batch)
+    # cached notes are answered without a request, so only sign the rest
+    todo = [i for i, (api, data, method) in enumerate(batch) if not cache.contains(cache_key(method, api, None, data))]
+    signed: List[Any] = [None] * len(batch)
+    for i, params in zip(todo, generate_request_params_batch(cookies_str, [batch[i] for i in todo]) if todo else []):
+        signed[i] = params
+    return signed
+
+
+def get_note_info(url: str, cookies_str: str, timeout: int = 30, signed: Tuple[Dict[str, str], Dict[str, str], str] = None) -> Tuple[bool, str, Dict[str, Any]]:
+    data = _note_info_payload(url)
+    return _request_json("POST", "/api/sns/web/v1/feed", cookies_str, data=data, timeout=timeout, signed=signed)
 
 
 def get_search_keyword(word: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
     return _request_json("GET", "/api/sns/web/v1/search/recommend", cookies_str, params={"keyword": word})
 
 
+SEARCH_PAGE_SIZE = 20
+# pages fetched in parallel by search_some_note once page 1 reports has_more (<= 1: sequential)
+SEARCH_PREFETCH = int(os.environ.get("XHS_SEARCH_PREFETCH", "3"))
+# keywords searched at the same time by search_many_notes
+SEARCH_BATCH_WORKERS = int(os.environ.get("XHS_SEARCH_BATCH_WORKERS", "4"))
+# filter shards paged by sweep_search_notes (note_range/pos_distance need a login state/geo, so left out)
+SEARCH_SWEEP_DIMENSIONS: Dict[str, List[int]] = {"sort_type_choice": [0, 1, 2, 3, 4], "note_type": [1, 2], "note_time": [0, 1, 2, 3]}
+# a sweep shard stops once a page adds fewer new notes than this fraction of the page
+SEARCH_SWEEP_MIN_YIELD = float(os.environ.get("XHS_SEARCH_SWEEP_MIN_YIELD", "0.2"))
+
+
 def _search_note_payload(
     query: str,
     page: int,
@@ -448,7 +1024,7 @@ def _search_note_payload(
     return {
         "keyword": query,
         "page": page,
-        "page_size": 20,
+        "page_size": SEARCH_PAGE_SIZE,
         "search_id": generate_x_b3_traceid(21),
         "sort": "general",
         "note_type": 0,
@@ -490,38 +1066,206 @@ def search_some_note(
     note_range: int = 0,
     pos_distance: int = 0,
     geo: Any = "",
+    prefetch: int = None,
+    item_filter: ItemFilter | None = None,
 ) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    # Page 1 is fetched alone; if it reports has_more, up to `prefetch` further pages are kept
+    # in flight (never more than the pages still needed for require_num). Pages are consumed
+    # strictly in order, and outstanding ones are cancelled once enough notes are collected or
+    # a page comes back empty, so the result matches the sequential walk.
+    # With item_filter only matching notes count toward require_num; sorted by time (sort_type_choice=1)
+    # the walk also ends at the first note older than the filter's --since.
+    prefetch = SEARCH_PREFETCH if prefetch is None else prefetch
+    fetch = lambda page: search_note(
+        query,
+        cookies_str,
+        page=page,
+        sort_type_choice=sort_type_choice,
+        note_type=note_type,
+        note_time=note_time,
+        note_range=note_range,
+        pos_distance=pos_distance,
+        geo=geo,
+    )
     page = 1
     notes: List[Dict[str, Any]] = []
     success, msg = True, "成功"
+    executor = None
+    pending: Dict[int, Any] = {}
     try:
         while True:
-            success, msg, res_json = search_note(
-                query,
-                cookies_str,
-                page=page,
-                sort_type_choice=sort_type_choice,
-                note_type=note_type,
-                note_time=note_time,
-                note_range=note_range,
-                pos_distance=pos_distance,
-                geo=geo,
-            )
+            future = pending.pop(page, None)
+            success, msg, res_json = future.result() if future is not None else fetch(page)
             if not success:
                 raise RuntimeError(msg)
             data = res_json.get("data", {})
             items = data.get("items", [])
-            notes.extend(items)
-            page += 1
-            if len(notes) >= require_num or not data.get("has_more", False):
+            kept, past_window = (items, False) if item_filter is None else item_filter.apply(items, sort_type_choice == 1)
+            notes.extend(kept)
+            if len(notes) >= require_num or not data.get("has_more", False) or not items or past_window:
                 break
+            page += 1
+            if prefetch > 1:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="xhs-search")
+                last_needed = page - 1 + math.ceil((require_num - len(notes)) / SEARCH_PAGE_SIZE)
+                for ahead in range(page, min(page + prefetch, last_needed + 1)):
+                    if ahead not in pending:
+                        pending[ahead] = executor.submit(fetch, ahead)
     except Exception as e:
         success, msg = False, str(e)
+    finally:
+        for future in pending.values():
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
     return success, msg, notes[:require_num]
 
 
-def search_user(query: str, cookies_str: str, page: int = 1) -> Tuple[bool, str, Dict[str, Any]]:
-    data = {
+def _normalize_queries(queries: List[str]) -> List[str]:
+    return list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+
+
+def _merge_search_results(queries: List[str], results: List[Tuple[bool, str, List[Dict[str, Any]]]]) -> Tuple[bool, str, Dict[str, Any]]:
+    # first occurrence wins, in query order then rank, so the merge does not depend on completion order
+    merged: Dict[str, Dict[str, Any]] = {}
+    summary: Dict[str, Dict[str, Any]] = {}
+    failed: List[str] = []
+    for query, (ok, msg, notes) in zip(queries, results):
+        new = 0
+        for note in notes:
+            note_id = note.get("id", "")
+            if not note_id:
+                continue
+            if note_id not in merged:
+                merged[note_id] = dict(note, matched_queries=[])
+                new += 1
+            if query not in merged[note_id]["matched_queries"]:
+                merged[note_id]["matched_queries"].append(query)
+        summary[query] = {"success": ok, "msg": msg, "count": len(notes), "new": new}
+        if not ok:
+            failed.append(f"{query}: {msg}")
+    success, msg = True, "成功"
+    if failed:
+        success, msg = False, f"{len(failed)}/{len(queries)} 个关键词搜索失败: {failed[0]}"
+    return success, msg, {"notes": list(merged.values()), "queries": summary}
+
+
+def search_many_notes(
+    queries: List[str],
+    require_num: int,
+    cookies_str: str,
+    workers: int = None,
+    **filters: Any,
+) -> Tuple[bool, str, Dict[str, Any]]:
+    # search_some_note for every query (filters are forwarded) on a bounded pool; all requests still
+    # share the per-account rate limiter. Notes are de-duplicated by id and list the queries that
+    # returned them in "matched_queries"; "queries" reports count/new/failure per query.
+    queries = _normalize_queries(queries)
+    if not queries:
+        return False, "没有关键词", {"notes": [], "queries": {}}
+    workers = max(1, min(SEARCH_BATCH_WORKERS if workers is None else workers, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="xhs-batch") as pool:
+        results = list(pool.map(lambda q: search_some_note(q, require_num, cookies_str, **filters), queries))
+    return _merge_search_results(queries, results)
+
+
+SWEEP_FILTER_NAMES = ("sort_type_choice", "note_type", "note_time", "note_range", "pos_distance")
+
+
+def parse_sweep_dims(text: str) -> Dict[str, List[int]]:
+    # --sweep-dims JSON, e.g. '{"sort_type_choice": [0, 1], "note_time": [1, 2]}'; raises ValueError
+    try:
+        raw = json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"bad --sweep-dims JSON: {e}") from None
+    if not isinstance(raw, dict) or not raw:
+        raise ValueError("--sweep-dims must be a JSON object of filter name -> list of values")
+    dimensions: Dict[str, List[int]] = {}
+    for name, values in raw.items():
+        if name not in SWEEP_FILTER_NAMES:
+            raise ValueError(f"unknown --sweep-dims filter {name!r} (one of {', '.join(SWEEP_FILTER_NAMES)})")
+        if not isinstance(values, list) or not values or not all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            raise ValueError(f"--sweep-dims {name} must be a non-empty list of integers")
+        dimensions[name] = values
+    return dimensions
+
+
+def sweep_shards(dimensions: Dict[str, List[int]] = None) -> List[Dict[str, int]]:
+    # cross product of search filter values, e.g. {"sort_type_choice": [0, 1], "note_type": [1, 2]} -> 4 shards
+    dimensions = SEARCH_SWEEP_DIMENSIONS if dimensions is None else dimensions
+    shards: List[Dict[str, int]] = [{}]
+    for name, values in dimensions.items():
+        shards = [dict(shard, **{name: value}) for shard in shards for value in values]
+    return shards
+
+
+def sweep_search_notes(
+    query: str,
+    cookies_str: str,
+    shards: List[Dict[str, int]] = None,
+    workers: int = None,
+    min_yield: float = None,
+    max_pages: int = 0,
+    geo: Any = "",
+) -> Tuple[bool, str, Dict[str, Any]]:
+    # Pages one query under many filter combinations (shards) on a bounded pool and merges the
+    # notes by id. A shard stops paging once a page adds fewer than `min_yield` (fraction of the
+    # page) notes that no other shard has returned yet, or after `max_pages` pages (0: no cap).
+    # Which shard gets credit for a shared note depends on timing, so per-shard numbers vary a
+    # little between runs; the merged set does not depend on it when every shard runs to the end.
+    shards = sweep_shards() if shards is None else shards
+    min_yield = SEARCH_SWEEP_MIN_YIELD if min_yield is None else min_yield
+    workers = max(1, min(SEARCH_BATCH_WORKERS if workers is None else workers, len(shards) or 1))
+    merged: Dict[str, Dict[str, Any]] = {}
+    lock = threading.Lock()
+
+    def run(shard: Dict[str, int]) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"filters": shard, "pages": 0, "fetched": 0, "new": 0, "stopped": "exhausted"}
+        page = 1
+        while True:
+            success, msg, res_json = search_note(query, cookies_str, page=page, geo=geo, **shard)
+            if not success:
+                report["stopped"], report["msg"] = "error", msg
+                break
+            data = res_json.get("data", {})
+            items = [item for item in data.get("items", []) if item.get("id")]
+            new = 0
+            with lock:
+                for item in items:
+                    if item["id"] not in merged:
+                        merged[item["id"]] = item
+                        new += 1
+            report["pages"] += 1
+            report["fetched"] += len(items)
+            report["new"] += new
+            if not items or not data.get("has_more", False):
+                break
+            if new < min_yield * len(items):
+                report["stopped"] = "low_yield"
+                break
+            if max_pages and page >= max_pages:
+                report["stopped"] = "max_pages"
+                break
+            page += 1
+        report["yield"] = round(report["new"] / report["fetched"], 3) if report["fetched"] else 0.0
+        return report
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="xhs-sweep") as pool:
+        reports = list(pool.map(run, shards))
+    failed = [r for r in reports if r["stopped"] == "error"]
+    success, msg = True, "成功"
+    if failed:
+        success, msg = False, f"{len(failed)}/{len(shards)} 个筛选分片失败: {failed[0]['msg']}"
+    return success, msg, {
+        "notes": list(merged.values()),
+        "requests": sum(r["pages"] + (r["stopped"] == "error") for r in reports),
+        "shards": reports,
+    }
+
+
+def _search_user_payload(query: str, page: int) -> Dict[str, Any]:
+    return {
         "search_user_request": {
             "keyword": query,
             "search_id": generate_x_b3_traceid(21),
@@ -531,7 +1275,10 @@ def search_user(query: str, cookies_str: str, page: int = 1) -> Tuple[bool, str,
             "request_id": f"{generate_x_b3_traceid(8)}-{generate_x_b3_traceid(12)}",
         }
     }
-    return _request_json("POST", "/api/sns/web/v1/search/usersearch", cookies_str, data=data)
+
+
+def search_user(query: str, cookies_str: str, page: int = 1) -> Tuple[bool, str, Dict[str, Any]]:
+    return _request_json("POST", "/api/sns/web/v1/search/usersearch", cookies_str, data=_search_user_payload(query, page))
 
 
 def search_some_user(query: str, require_num: int, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
@@ -555,39 +1302,34 @@ def search_some_user(query: str, require_num: int, cookies_str: str) -> Tuple[bo
 
 
 # ---------- Comment ----------
-def get_note_out_comment(note_id: str, cursor: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
-    params = {
+# sub-comment threads expanded in parallel by get_note_all_comment (1: sequential)
+COMMENT_WORKERS = int(os.environ.get("XHS_COMMENT_WORKERS", "4"))
+
+
+def _out_comment_params(note_id: str, cursor: str, xsec_token: str) -> Dict[str, Any]:
+    return {
         "note_id": note_id,
         "cursor": cursor,
         "top_comment_id": "",
         "image_formats": "jpg,webp,avif",
         "xsec_token": xsec_token,
     }
-    return _request_json("GET", "/api/sns/web/v2/comment/page", cookies_str, params=params)
 
 
-def get_note_all_out_comment(note_id: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    out_comments: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        while True:
-            success, msg, res_json = get_note_out_comment(note_id, cursor, xsec_token, cookies_str)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            comments = data.get("comments", [])
-            out_comments.extend(comments)
-            cursor = str(data.get("cursor", ""))
-            if not comments or not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, out_comments
+def get_note_out_comment(note_id: str, cursor: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return _request_json("GET", "/api/sns/web/v2/comment/page", cookies_str, params=_out_comment_params(note_id, cursor, xsec_token))
 
 
-def get_note_inner_comment(comment: Dict[str, Any], cursor: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
-    params = {
+def iter_note_all_out_comment(note_id: str, xsec_token: str, cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Iterator[Dict[str, Any]]:
+    yield from _iter_cursor_pages(lambda cursor: get_note_out_comment(note_id, cursor, xsec_token, cookies_str), "comments", checkpoint=checkpoint)
+
+
+def get_note_all_out_comment(note_id: str, xsec_token: str, cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_note_all_out_comment(note_id, xsec_token, cookies_str, checkpoint))
+
+
+def _inner_comment_params(comment: Dict[str, Any], cursor: str, xsec_token: str) -> Dict[str, Any]:
+    return {
         "note_id": comment.get("note_id", ""),
         "root_comment_id": comment.get("id", ""),
         "num": "10",
@@ -596,47 +1338,108 @@ def get_note_inner_comment(comment: Dict[str, Any], cursor: str, xsec_token: str
         "top_comment_id": "",
         "xsec_token": xsec_token,
     }
-    return _request_json("GET", "/api/sns/web/v2/comment/sub/page", cookies_str, params=params)
+
+
+def get_note_inner_comment(comment: Dict[str, Any], cursor: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return _request_json("GET", "/api/sns/web/v2/comment/sub/page", cookies_str, params=_inner_comment_params(comment, cursor, xsec_token))
 
 
 def get_note_all_inner_comment(comment: Dict[str, Any], xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    if not comment.get("sub_comment_has_more"):
+        return True, "成功", comment
     success, msg = True, "成功"
+    cursor = str(comment.get("sub_comment_cursor", ""))
+    sub_comments = comment["sub_comments"] = comment.get("sub_comments", []) or []
     try:
-        if not comment.get("sub_comment_has_more"):
-            return True, "成功", comment
-        cursor = str(comment.get("sub_comment_cursor", ""))
-        sub_comments = comment.get("sub_comments", []) or []
         while True:
             success, msg, res_json = get_note_inner_comment(comment, cursor, xsec_token, cookies_str)
             if not success:
                 raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            comments = data.get("comments", [])
+            comments, cursor, has_more = _read_page(res_json, "comments", False, None, False)
             sub_comments.extend(comments)
-            cursor = str(data.get("cursor", ""))
-            if not data.get("has_more", False):
+            if not has_more:
                 break
-        comment["sub_comments"] = sub_comments
     except Exception as e:
         success, msg = False, str(e)
+        # keep the replies fetched so far; calling again continues from this cursor
+        comment["sub_comment_cursor"] = cursor
     return success, msg, comment
 
 
-def get_note_all_comment(url: str, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
+def expand_inner_comments(
+    comments: List[Dict[str, Any]], xsec_token: str, cookies_str: str, workers: int | None = None
+) -> List[Tuple[bool, str, Dict[str, Any]]]:
+    # get_note_all_inner_comment for each comment on a bounded pool; results keep the input order
+    workers = COMMENT_WORKERS if workers is None else workers
+    workers = max(1, min(workers, sum(1 for c in comments if c.get("sub_comment_has_more"))))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda c: get_note_all_inner_comment(c, xsec_token, cookies_str), comments))
+
+
+def _expand_comments(comments: List[Dict[str, Any]], xsec_token: str, cookies_str: str) -> List[Dict[str, Any]]:
+    # a failed thread keeps the replies fetched so far and carries the error in "_expand_error"
+    expanded: List[Dict[str, Any]] = []
+    for success, msg, comment in expand_inner_comments(comments, xsec_token, cookies_str):
+        comment.pop("_expand_error", None)
+        if not success:
+            comment["_expand_error"] = msg
+        expanded.append(comment)
+    return expanded
+
+
+def _expand_failure(comments: List[Dict[str, Any]]) -> str:
+    failed = [c["_expand_error"] for c in comments if c.get("_expand_error")]
+    return f"{len(failed)} 条评论的回复未完整展开: {failed[0]}" if failed else ""
+
+
+def iter_note_all_comment(url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Iterator[Dict[str, Any]]:
+    # top-level comments one by one, each with its sub comments already expanded;
+    # threads that failed in an earlier run are retried from their saved cursor when replayed
+    note_id, xsec_token, _ = _parse_note_url(url)
+    replayed = checkpoint.items if checkpoint is not None else 0
+    pages = _iter_cursor_pages(
+        lambda cursor: get_note_out_comment(note_id, cursor, xsec_token, cookies_str),
+        "comments",
+        checkpoint=checkpoint,
+        expand=lambda comments: _expand_comments(comments, xsec_token, cookies_str),
+    )
+    for idx, comment in enumerate(pages):
+        if idx < replayed and comment.get("_expand_error"):
+            comment = _expand_comments([comment], xsec_token, cookies_str)[0]
+        yield comment
+
+
+def get_note_all_comment(
+    url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, workers: int | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    # Sub-comment threads are expanded on a bounded pool while later top-level pages are still being fetched.
+    # A failed thread keeps the replies fetched so far; the other threads and the comment order are unaffected.
+    if checkpoint is not None:
+        success, msg, out_comments = _collect(iter_note_all_comment(url, cookies_str, checkpoint))
+        failure = _expand_failure(out_comments)
+        if failure and success:
+            success, msg = False, failure
+        return success, msg, out_comments
     success, msg = True, "成功"
     out_comments: List[Dict[str, Any]] = []
-    try:
-        note_id, xsec_token, _ = _parse_note_url(url)
-        success, msg, out_comments = get_note_all_out_comment(note_id, xsec_token, cookies_str)
-        if not success:
-            raise RuntimeError(msg)
-        for idx, comment in enumerate(out_comments):
-            success, msg, new_comment = get_note_all_inner_comment(comment, xsec_token, cookies_str)
-            if not success:
-                raise RuntimeError(msg)
-            out_comments[idx] = new_comment
-    except Exception as e:
-        success, msg = False, str(e)
+    workers = max(1, COMMENT_WORKERS if workers is None else workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        try:
+            note_id, xsec_token, _ = _parse_note_url(url)
+            for comment in iter_note_all_out_comment(note_id, xsec_token, cookies_str):
+                if comment.get("sub_comment_has_more"):
+                    futures[len(out_comments)] = pool.submit(get_note_all_inner_comment, comment, xsec_token, cookies_str)
+                out_comments.append(comment)
+        except Exception as e:
+            success, msg = False, str(e)
+        for idx, future in futures.items():
+            ok, inner_msg, out_comments[idx] = future.result()
+            if not ok:
+                out_comments[idx]["_expand_error"] = inner_msg
+    failure = _expand_failure(out_comments)
+    if failure and success:
+        success, msg = False, failure
     return success, msg, out_comments
 
 
@@ -645,118 +1448,125 @@ def get_unread_message(cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
     return _request_json("GET", "/api/sns/web/unread_count", cookies_str)
 
 
+def _message_page_params(cursor: str) -> Dict[str, Any]:
+    return {"num": "20", "cursor": cursor}
+
+
 def get_metions(cursor: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
-    return _request_json("GET", "/api/sns/web/v1/you/mentions", cookies_str, params={"num": "20", "cursor": cursor})
+    return _request_json("GET", "/api/sns/web/v1/you/mentions", cookies_str, params=_message_page_params(cursor))
 
 
-def get_all_metions(cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    rows: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        while True:
-            success, msg, res_json = get_metions(cursor, cookies_str)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            batch = data.get("message_list", [])
-            rows.extend(batch)
-            cursor = str(data.get("cursor", ""))
-            if not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, rows
+def iter_all_metions(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Iterator[Dict[str, Any]]:
+    yield from _iter_cursor_pages(lambda cursor: get_metions(cursor, cookies_str), "message_list", stop_on_empty=False, checkpoint=checkpoint)
+
+
+def get_all_metions(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_all_metions(cookies_str, checkpoint))
 
 
 def get_likesAndcollects(cursor: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
-    return _request_json("GET", "/api/sns/web/v1/you/likes", cookies_str, params={"num": "20", "cursor": cursor})
+    return _request_json("GET", "/api/sns/web/v1/you/likes", cookies_str, params=_message_page_params(cursor))
 
 
-def get_all_likesAndcollects(cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    rows: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        while True:
-            success, msg, res_json = get_likesAndcollects(cursor, cookies_str)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            batch = data.get("message_list", [])
-            rows.extend(batch)
-            cursor = str(data.get("cursor", ""))
-            if not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, rows
+def iter_all_likesAndcollects(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Iterator[Dict[str, Any]]:
+    yield from _iter_cursor_pages(lambda cursor: get_likesAndcollects(cursor, cookies_str), "message_list", stop_on_empty=False, checkpoint=checkpoint)
+
+
+def get_all_likesAndcollects(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_all_likesAndcollects(cookies_str, checkpoint))
 
 
 def get_new_connections(cursor: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
-    return _request_json("GET", "/api/sns/web/v1/you/connections", cookies_str, params={"num": "20", "cursor": cursor})
+    return _request_json("GET", "/api/sns/web/v1/you/connections", cookies_str, params=_message_page_params(cursor))
 
 
-def get_all_new_connections(cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    cursor = ""
-    rows: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        while True:
-            success, msg, res_json = get_new_connections(cursor, cookies_str)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            batch = data.get("message_list", [])
-            rows.extend(batch)
-            cursor = str(data.get("cursor", ""))
-            if not data.get("has_more", False):
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, rows
+def iter_all_new_connections(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Iterator[Dict[str, Any]]:
+    yield from _iter_cursor_pages(lambda cursor: get_new_connections(cursor, cookies_str), "message_list", stop_on_empty=False, checkpoint=checkpoint)
+
+
+def get_all_new_connections(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(iter_all_new_connections(cookies_str, checkpoint))
 
 
 # ---------- Creator ----------
-def creator_get_publish_note_info(page: int, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+def _creator_posted_params(page: int) -> Dict[str, Any]:
+    # page -1 asks for the first page; the response's "page" is the next one, -1 at the end
     params: Dict[str, Any] = {"tab": "0"}
     if page >= 0:
         params["page"] = str(page)
-    return _request_json("GET", "/web_api/sns/v5/creator/note/user/posted", cookies_str, params=params)
+    return params
 
 
-def creator_get_all_publish_note_info(cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
-    page = -1
-    notes: List[Dict[str, Any]] = []
-    success, msg = True, "成功"
-    try:
-        while True:
-            success, msg, res_json = creator_get_publish_note_info(page, cookies_str)
-            if not success:
-                raise RuntimeError(msg)
-            data = res_json.get("data", {})
-            notes.extend(data.get("notes", []))
-            page = int(data.get("page", -1))
-            if page == -1:
-                break
-    except Exception as e:
-        success, msg = False, str(e)
-    return success, msg, notes
+def _creator_start_page(checkpoint: PageCheckpoint | None) -> int:
+    return int(checkpoint.cursor) if checkpoint is not None and checkpoint.pages else -1
+
+
+def _read_creator_page(res_json: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+    data = res_json.get("data", {})
+    return data.get("notes", []), int(data.get("page", -1))
+
+
+def creator_get_publish_note_info(page: int, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return _request_json("GET", "/web_api/sns/v5/creator/note/user/posted", cookies_str, params=_creator_posted_params(page))
+
+
+def creator_iter_all_publish_note_info(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Iterator[Dict[str, Any]]:
+    if checkpoint is not None:
+        yield from checkpoint.replay()
+        if checkpoint.done:
+            return
+    page = _creator_start_page(checkpoint)
+    while True:
+        success, msg, res_json = creator_get_publish_note_info(page, cookies_str)
+        if not success:
+            raise RuntimeError(msg)
+        notes, page = _read_creator_page(res_json)
+        if checkpoint is not None:
+            checkpoint.append(page, notes, page != -1)
+        yield from notes
+        if page == -1:
+            break
+    if checkpoint is not None:
+        checkpoint.finish()
+
+
+def creator_get_all_publish_note_info(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return _collect(creator_iter_all_publish_note_info(cookies_str, checkpoint))
 
 
 # ---------- No-watermark helpers ----------
+OG_VIDEO_HEADERS = {
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+}
+
+
+def _og_video_cached(note_id: str) -> Tuple[str, str | None]:
+    # (cache key or "", cached video url or None)
+    cache = get_response_cache()
+    key = cache_key("GET", "web:/explore/og:video", {"note_id": note_id}) if cache is not None else ""
+    if key:
+        cached = cache.get("web:/explore/og:video", key)
+        if cached is not None:
+            return key, cached["url"]
+    return key, None
+
+
+def _read_og_video(html: str, key: str) -> Tuple[bool, str, str]:
+    matches = re.findall(r'<meta name="og:video" content="(.*?)">', html)
+    if not matches:
+        return False, "og:video not found", ""
+    if key:
+        get_response_cache().put("web:/explore/og:video", key, {"url": matches[0]})
+    return True, "成功", matches[0]
+
+
 def get_note_no_water_video(note_id: str) -> Tuple[bool, str, str]:
+    key, cached = _og_video_cached(note_id)
+    if cached is not None:
+        return True, "成功", cached
     try:
-        headers = {
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-        }
-        url = f"https://www.xiaohongshu.com/explore/{note_id}"
-        response = requests.get(url, headers=headers, timeout=30)
-        html = response.text
-        matches = re.findall(r'<meta name="og:video" content="(.*?)">', html)
-        if not matches:
-            return False, "og:video not found", ""
-        return True, "成功", matches[0]
+        response = get_http_session().get(f"https://www.xiaohongshu.com/explore/{note_id}", headers=OG_VIDEO_HEADERS, timeout=30)
+        return _read_og_video(response.text, key)
     except Exception as e:
         return False, str(e), ""
 
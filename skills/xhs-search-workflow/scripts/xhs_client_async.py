@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from xhs_client import (
+    BASE_URL,
+    COMMENT_WORKERS,
+    HTTP_POOL_SIZE,
+    OG_VIDEO_HEADERS,
+    SEARCH_BATCH_WORKERS,
+    SEARCH_PAGE_SIZE,
+    SEARCH_PREFETCH,
+    _Attempts,
+    _cached_response,
+    _creator_posted_params,
+    _creator_start_page,
+    _expand_failure,
+    _homefeed_payload,
+    _inner_comment_params,
+    _merge_search_results,
+    _message_page_params,
+    _normalize_queries,
+    _note_info_payload,
+    _og_video_cached,
+    _out_comment_params,
+    _parse_note_url,
+    _parse_user_url,
+    _read_creator_page,
+    _read_og_video,
+    _read_page,
+    _read_response,
+    _request_line,
+    _search_note_payload,
+    _search_user_payload,
+    _user_page_params,
+    generate_request_params,
+    get_note_no_water_img,
+    get_rate_limiter,
+    get_retry_policy,
+    single_flight_enabled,
+    single_flight_key,
+    trans_cookies,
+)
+from xhs_checkpoint import PageCheckpoint
+from xhs_filter import ItemFilter
+from xhs_retry import INTERNAL, TRANSPORT
+from xhs_signer import SIGNER_WORKERS
+from xhs_singleflight import AsyncSingleFlight
+
+# Same function names and (success, msg, data) results as xhs_client, awaitable.
+# Signing runs on a thread pool in front of the node sign workers; HTTP goes through
+# one shared httpx.AsyncClient and at most `concurrency` requests are in flight.
+DEFAULT_CONCURRENCY = 64
+
+_state: Dict[str, Any] = {"client": None, "loop": None, "guard": None, "semaphore": None, "semaphore_loop": None, "concurrency": DEFAULT_CONCURRENCY}
+_SIGN_EXECUTOR = ThreadPoolExecutor(max_workers=max(SIGNER_WORKERS, 1), thread_name_prefix="xhs-sign")
+_SINGLE_FLIGHT = AsyncSingleFlight()
+
+
+def configure(concurrency: int = DEFAULT_CONCURRENCY) -> None:
+    _state["concurrency"] = max(concurrency, 1)
+    _state["semaphore"] = None
+
+
+async def _close_with_loop(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    # parked for the lifetime of the client: asyncio.run() finalizes live async generators
+    # before it closes the loop, so the client is closed while its connections still can be
+    try:
+        yield
+    finally:
+        if _state["client"] is client:
+            _state["client"] = _state["guard"] = None
+        await client.aclose()
+
+
+async def _client() -> httpx.AsyncClient:
+    # one client per event loop; a client left over from an earlier loop was closed with it
+    loop = asyncio.get_running_loop()
+    if _state["client"] is None or _state["loop"] is not loop:
+        if _state["guard"] is not None:
+            # its loop ended without finalizing async generators (not asyncio.run())
+            try:
+                await _state["guard"].aclose()
+            except RuntimeError:
+                pass
+        limits = httpx.Limits(max_connections=max(_state["concurrency"], HTTP_POOL_SIZE), max_keepalive_connections=HTTP_POOL_SIZE)
+        client = httpx.AsyncClient(limits=limits, timeout=30)
+        guard = _close_with_loop(client)
+        await guard.__anext__()
+        _state.update(client=client, loop=loop, guard=guard)
+    return _state["client"]
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if _state["semaphore"] is None or _state["semaphore_loop"] is not loop:
+        _state["semaphore"] = asyncio.Semaphore(_state["concurrency"])
+        _state["semaphore_loop"] = loop
+    return _state["semaphore"]
+
+
+def single_flight_stats() -> Dict[str, int]:
+    return {"enabled": single_flight_enabled(), **_SINGLE_FLIGHT.stats()}
+
+
+async def aclose() -> None:
+    # closes the client now; only needed for loops not run by asyncio.run()
+    guard = _state["guard"]
+    if guard is not None:
+        await guard.aclose()
+
+
+async def generate_request_params_async(cookies_str: str, api: str, data: Any = "", method: str = "POST") -> Tuple[Dict[str, str], Dict[str, str], str]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SIGN_EXECUTOR, generate_request_params, cookies_str, api, data, method)
+
+
+async def _send_once(method: str, request_api: str, api: str, cookies_str: str, data: Any, timeout: int) -> Tuple[str, str, Dict[str, Any]]:
+    try:
+        wait = get_rate_limiter().reserve(trans_cookies(cookies_str).get("a1", ""), api)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    except Exception as e:
+        return INTERNAL, str(e), {}
+    async with _semaphore():
+        try:
+            headers, cookies, payload = await generate_request_params_async(cookies_str, request_api, data, method)
+            headers["cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        except Exception as e:
+            return INTERNAL, str(e), {}
+        try:
+            url = BASE_URL + request_api
+            client = await _client()
+            if method == "GET":
+                response = await client.get(url, headers=headers, timeout=timeout)
+            else:
+                body = payload.encode("utf-8") if payload else b""
+                response = await client.post(url, headers=headers, content=body, timeout=timeout)
+        except Exception as e:
+            return TRANSPORT, str(e), {}
+    return _read_response(response)
+
+
+async def _request_json(method: str, api: str, cookies_str: str, data: Any = "", params: Dict[str, Any] = None, timeout: int = 30) -> Tuple[bool, str, Dict[str, Any]]:
+    fetch = lambda: _fetch_json(method, api, cookies_str, data, params, timeout)
+    if not single_flight_enabled():
+        return await fetch()
+    return await _SINGLE_FLIGHT.do(single_flight_key(method.upper(), api, cookies_str, data, params), fetch)
+
+
+async def _fetch_json(method: str, api: str, cookies_str: str, data: Any = "", params: Dict[str, Any] = None, timeout: int = 30) -> Tuple[bool, str, Dict[str, Any]]:
+    # xhs_client._fetch_json with awaited sleeps; retry, failover and cache policy live in the shared helpers
+    method, request_api = _request_line(method, api, params)
+    key, cached = _cached_response(method, api, params, data)
+    if cached is not None:
+        return True, cached.get("msg", "成功"), cached
+    attempts = _Attempts(cookies_str, get_retry_policy())
+    while True:
+        try:
+            cookie, wait = attempts.next_cookie()
+            while cookie is None:
+                await asyncio.sleep(wait)
+                cookie, wait = attempts.next_cookie()
+        except Exception as e:
+            attempts.fail(e)
+            break
+        delay = attempts.record(*await _send_once(method, request_api, api, cookie, data, timeout))
+        if delay is None:
+            break
+        if delay:
+            await asyncio.sleep(delay)
+    return attempts.result(api, key)
+
+
+async def _iter_cursor_pages(
+    fetch: Callable[[str], Awaitable[Tuple[bool, str, Dict[str, Any]]]],
+    list_key: str,
+    stop_on_empty: bool = True,
+    checkpoint: PageCheckpoint | None = None,
+    expand: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]] | None = None,
+    item_filter: ItemFilter | None = None,
+    time_sorted: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    # same paging, checkpoint and filter rules as xhs_client._iter_cursor_pages; expand is awaited
+    cursor = ""
+    if checkpoint is not None:
+        for item in checkpoint.replay():
+            yield item
+        if checkpoint.done:
+            return
+        cursor = checkpoint.cursor
+    while True:
+        success, msg, res_json = await fetch(cursor)
+        if not success:
+            raise RuntimeError(msg)
+        batch, cursor, has_more = _read_page(res_json, list_key, stop_on_empty, item_filter, time_sorted)
+        if expand is not None:
+            batch = await expand(batch)
+        if checkpoint is not None:
+            checkpoint.append(cursor, batch, has_more)
+        for item in batch:
+            yield item
+        if not has_more:
+            break
+    if checkpoint is not None:
+        checkpoint.finish()
+
+
+async def _collect(items: AsyncIterator[Dict[str, Any]]) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    rows: List[Dict[str, Any]] = []
+    success, msg = True, "成功"
+    try:
+        async for item in items:
+            rows.append(item)
+    except Exception as e:
+        success, msg = False, str(e)
+    return success, msg, rows
+
+
+# ---------- Homefeed ----------
+async def get_homefeed_all_channel(cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/homefeed/category", cookies_str)
+
+
+async def get_homefeed_recommend(category: str, cursor_score: str, refresh_type: int, note_index: int, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    data = _homefeed_payload(category, cursor_score, refresh_type, note_index)
+    return await _request_json("POST", "/api/sns/web/v1/homefeed", cookies_str, data=data)
+
+
+async def get_homefeed_recommend_by_num(category: str, require_num: int, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    cursor_score, refresh_type, note_index = "", 1, 0
+    note_list: List[Dict[str, Any]] = []
+    success, msg = True, "成功"
+    try:
+        while True:
+            success, msg, res_json = await get_homefeed_recommend(category, cursor_score, refresh_type, note_index, cookies_str)
+            if not success:
+                raise RuntimeError(msg)
+            items = res_json.get("data", {}).get("items", [])
+            if not items:
+                break
+            note_list.extend(items)
+            cursor_score = res_json.get("data", {}).get("cursor_score", "")
+            refresh_type = 3
+            note_index += 20
+            if len(note_list) >= require_num:
+                break
+    except Exception as e:
+        success, msg = False, str(e)
+    return success, msg, note_list[:require_num]
+
+
+# ---------- User ----------
+async def get_user_info(user_id: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/user/otherinfo", cookies_str, params={"target_user_id": user_id})
+
+
+async def get_user_self_info(cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/user/selfinfo", cookies_str)
+
+
+async def get_user_self_info2(cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v2/user/me", cookies_str)
+
+
+async def get_user_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_search") -> Tuple[bool, str, Dict[str, Any]]:
+    params = _user_page_params(user_id, cursor, xsec_token, xsec_source)
+    return await _request_json("GET", "/api/sns/web/v1/user_posted", cookies_str, params=params)
+
+
+async def iter_user_all_notes(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> AsyncIterator[Dict[str, Any]]:
+    user_id, xsec_token, xsec_source = _parse_user_url(user_url)
+    async for item in _iter_cursor_pages(lambda cursor: get_user_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source), "notes", checkpoint=checkpoint, item_filter=item_filter, time_sorted=True):
+        yield item
+
+
+async def get_user_all_notes(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_user_all_notes(user_url, cookies_str, checkpoint, item_filter))
+
+
+async def get_user_like_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_user") -> Tuple[bool, str, Dict[str, Any]]:
+    params = _user_page_params(user_id, cursor, xsec_token, xsec_source)
+    return await _request_json("GET", "/api/sns/web/v1/note/like/page", cookies_str, params=params)
+
+
+async def iter_user_all_like_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> AsyncIterator[Dict[str, Any]]:
+    user_id, xsec_token, xsec_source = _parse_user_url(user_url)
+    xsec_source = xsec_source or "pc_user"
+    async for item in _iter_cursor_pages(lambda cursor: get_user_like_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source), "notes", checkpoint=checkpoint, item_filter=item_filter):
+        yield item
+
+
+async def get_user_all_like_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_user_all_like_note_info(user_url, cookies_str, checkpoint, item_filter))
+
+
+async def get_user_collect_note_info(user_id: str, cursor: str, cookies_str: str, xsec_token: str = "", xsec_source: str = "pc_search") -> Tuple[bool, str, Dict[str, Any]]:
+    params = _user_page_params(user_id, cursor, xsec_token, xsec_source)
+    return await _request_json("GET", "/api/sns/web/v2/note/collect/page", cookies_str, params=params)
+
+
+async def iter_user_all_collect_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> AsyncIterator[Dict[str, Any]]:
+    user_id, xsec_token, xsec_source = _parse_user_url(user_url)
+    async for item in _iter_cursor_pages(lambda cursor: get_user_collect_note_info(user_id, cursor, cookies_str, xsec_token, xsec_source), "notes", checkpoint=checkpoint, item_filter=item_filter):
+        yield item
+
+
+async def get_user_all_collect_note_info(
+    user_url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, item_filter: ItemFilter | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_user_all_collect_note_info(user_url, cookies_str, checkpoint, item_filter))
+
+
+# ---------- Note/Search ----------
+async def get_note_info(url: str, cookies_str: str, timeout: int = 30) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("POST", "/api/sns/web/v1/feed", cookies_str, data=_note_info_payload(url), timeout=timeout)
+
+
+async def get_search_keyword(word: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/search/recommend", cookies_str, params={"keyword": word})
+
+
+async def search_note(
+    query: str,
+    cookies_str: str,
+    page: int = 1,
+    sort_type_choice: int = 0,
+    note_type: int = 0,
+    note_time: int = 0,
+    note_range: int = 0,
+    pos_distance: int = 0,
+    geo: Any = "",
+) -> Tuple[bool, str, Dict[str, Any]]:
+    data = _search_note_payload(query, page, sort_type_choice, note_type, note_time, note_range, pos_distance, geo)
+    return await _request_json("POST", "/api/sns/web/v1/search/notes", cookies_str, data=data)
+
+
+async def search_some_note(
+    query: str,
+    require_num: int,
+    cookies_str: str,
+    sort_type_choice: int = 0,
+    note_type: int = 0,
+    note_time: int = 0,
+    note_range: int = 0,
+    pos_distance: int = 0,
+    geo: Any = "",
+    prefetch: int = None,
+    item_filter: ItemFilter | None = None,
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    # same prefetch window as xhs_client.search_some_note, with tasks instead of threads
+    prefetch = SEARCH_PREFETCH if prefetch is None else prefetch
+    fetch = lambda page: search_note(
+        query,
+        cookies_str,
+        page=page,
+        sort_type_choice=sort_type_choice,
+        note_type=note_type,
+        note_time=note_time,
+        note_range=note_range,
+        pos_distance=pos_distance,
+        geo=geo,
+    )
+    page = 1
+    notes: List[Dict[str, Any]] = []
+    success, msg = True, "成功"
+    pending: Dict[int, "asyncio.Task[Tuple[bool, str, Dict[str, Any]]]"] = {}
+    try:
+        while True:
+            task = pending.pop(page, None)
+            success, msg, res_json = await (task if task is not None else fetch(page))
+            if not success:
+                raise RuntimeError(msg)
+            data = res_json.get("data", {})
+            items = data.get("items", [])
+            kept, past_window = (items, False) if item_filter is None else item_filter.apply(items, sort_type_choice == 1)
+            notes.extend(kept)
+            if len(notes) >= require_num or not data.get("has_more", False) or not items or past_window:
+                break
+            page += 1
+            if prefetch > 1:
+                last_needed = page - 1 + math.ceil((require_num - len(notes)) / SEARCH_PAGE_SIZE)
+                for ahead in range(page, min(page + prefetch, last_needed + 1)):
+                    if ahead not in pending:
+                        pending[ahead] = asyncio.ensure_future(fetch(ahead))
+    except Exception as e:
+        success, msg = False, str(e)
+    finally:
+        for task in pending.values():
+            task.cancel()
+    return success, msg, notes[:require_num]
+
+
+async def search_many_notes(
+    queries: List[str],
+    require_num: int,
+    cookies_str: str,
+    workers: int = None,
+    **filters: Any,
+) -> Tuple[bool, str, Dict[str, Any]]:
+    queries = _normalize_queries(queries)
+    if not queries:
+        return False, "没有关键词", {"notes": [], "queries": {}}
+    gate = asyncio.Semaphore(max(1, SEARCH_BATCH_WORKERS if workers is None else workers))
+
+    async def one(query: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
+        async with gate:
+            return await search_some_note(query, require_num, cookies_str, **filters)
+
+    results = await asyncio.gather(*(one(q) for q in queries))
+    return _merge_search_results(queries, list(results))
+
+
+async def search_user(query: str, cookies_str: str, page: int = 1) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("POST", "/api/sns/web/v1/search/usersearch", cookies_str, data=_search_user_payload(query, page))
+
+
+async def search_some_user(query: str, require_num: int, cookies_str: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    page = 1
+    users: List[Dict[str, Any]] = []
+    success, msg = True, "成功"
+    try:
+        while True:
+            success, msg, res_json = await search_user(query, cookies_str, page=page)
+            if not success:
+                raise RuntimeError(msg)
+            data = res_json.get("data", {})
+            users.extend(data.get("users", []))
+            page += 1
+            if len(users) >= require_num or not data.get("has_more", False):
+                break
+    except Exception as e:
+        success, msg = False, str(e)
+    return success, msg, users[:require_num]
+
+
+# ---------- Comment ----------
+async def get_note_out_comment(note_id: str, cursor: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v2/comment/page", cookies_str, params=_out_comment_params(note_id, cursor, xsec_token))
+
+
+async def iter_note_all_out_comment(note_id: str, xsec_token: str, cookies_str: str, checkpoint: PageCheckpoint | None = None) -> AsyncIterator[Dict[str, Any]]:
+    async for item in _iter_cursor_pages(lambda cursor: get_note_out_comment(note_id, cursor, xsec_token, cookies_str), "comments", checkpoint=checkpoint):
+        yield item
+
+
+async def get_note_all_out_comment(note_id: str, xsec_token: str, cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_note_all_out_comment(note_id, xsec_token, cookies_str, checkpoint))
+
+
+async def get_note_inner_comment(comment: Dict[str, Any], cursor: str, xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v2/comment/sub/page", cookies_str, params=_inner_comment_params(comment, cursor, xsec_token))
+
+
+async def get_note_all_inner_comment(comment: Dict[str, Any], xsec_token: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    if not comment.get("sub_comment_has_more"):
+        return True, "成功", comment
+    success, msg = True, "成功"
+    cursor = str(comment.get("sub_comment_cursor", ""))
+    sub_comments = comment["sub_comments"] = comment.get("sub_comments", []) or []
+    try:
+        while True:
+            success, msg, res_json = await get_note_inner_comment(comment, cursor, xsec_token, cookies_str)
+            if not success:
+                raise RuntimeError(msg)
+            comments, cursor, has_more = _read_page(res_json, "comments", False, None, False)
+            sub_comments.extend(comments)
+            if not has_more:
+                break
+    except Exception as e:
+        success, msg = False, str(e)
+        # keep the replies fetched so far; calling again continues from this cursor
+        comment["sub_comment_cursor"] = cursor
+    return success, msg, comment
+
+
+async def _expand_inner_comments(comments: List[Dict[str, Any]], xsec_token: str, cookies_str: str, workers: int) -> List[Tuple[bool, str, Dict[str, Any]]]:
+    # at most `workers` sub-comment threads in flight; results keep the input order
+    gate = asyncio.Semaphore(max(1, workers))
+
+    async def expand(comment: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
+        async with gate:
+            return await get_note_all_inner_comment(comment, xsec_token, cookies_str)
+
+    return list(await asyncio.gather(*(expand(c) for c in comments)))
+
+
+async def _expand_comments(comments: List[Dict[str, Any]], xsec_token: str, cookies_str: str, workers: int | None = None) -> List[Dict[str, Any]]:
+    # like xhs_client._expand_comments: a failed thread keeps its partial replies and carries "_expand_error"
+    expanded: List[Dict[str, Any]] = []
+    results = await _expand_inner_comments(comments, xsec_token, cookies_str, COMMENT_WORKERS if workers is None else workers)
+    for ok, inner_msg, comment in results:
+        comment.pop("_expand_error", None)
+        if not ok:
+            comment["_expand_error"] = inner_msg
+        expanded.append(comment)
+    return expanded
+
+
+async def iter_note_all_comment(url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None) -> AsyncIterator[Dict[str, Any]]:
+    # expands each page's sub-comment threads concurrently, then yields that page in order;
+    # threads that failed in an earlier run are retried from their saved cursor when replayed
+    note_id, xsec_token, _ = _parse_note_url(url)
+    replayed = checkpoint.items if checkpoint is not None else 0
+    pages = _iter_cursor_pages(
+        lambda cursor: get_note_out_comment(note_id, cursor, xsec_token, cookies_str),
+        "comments",
+        checkpoint=checkpoint,
+        expand=lambda comments: _expand_comments(comments, xsec_token, cookies_str),
+    )
+    idx = 0
+    async for comment in pages:
+        if idx < replayed and comment.get("_expand_error"):
+            comment = (await _expand_comments([comment], xsec_token, cookies_str))[0]
+        idx += 1
+        yield comment
+
+
+async def get_note_all_comment(
+    url: str, cookies_str: str, checkpoint: PageCheckpoint | None = None, workers: int | None = None
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    # a failed sub-comment thread keeps the replies fetched so far instead of failing the whole note
+    if checkpoint is not None:
+        success, msg, out_comments = await _collect(iter_note_all_comment(url, cookies_str, checkpoint))
+    else:
+        success, msg = True, "成功"
+        out_comments: List[Dict[str, Any]] = []
+        try:
+            note_id, xsec_token, _ = _parse_note_url(url)
+            success, msg, out_comments = await get_note_all_out_comment(note_id, xsec_token, cookies_str)
+            out_comments = await _expand_comments(out_comments, xsec_token, cookies_str, workers)
+        except Exception as e:
+            success, msg = False, str(e)
+    failure = _expand_failure(out_comments)
+    if failure and success:
+        success, msg = False, failure
+    return success, msg, out_comments
+
+
+# ---------- Message ----------
+async def get_unread_message(cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/unread_count", cookies_str)
+
+
+async def get_metions(cursor: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/you/mentions", cookies_str, params=_message_page_params(cursor))
+
+
+async def iter_all_metions(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> AsyncIterator[Dict[str, Any]]:
+    async for item in _iter_cursor_pages(lambda cursor: get_metions(cursor, cookies_str), "message_list", stop_on_empty=False, checkpoint=checkpoint):
+        yield item
+
+
+async def get_all_metions(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_all_metions(cookies_str, checkpoint))
+
+
+async def get_likesAndcollects(cursor: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/you/likes", cookies_str, params=_message_page_params(cursor))
+
+
+async def iter_all_likesAndcollects(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> AsyncIterator[Dict[str, Any]]:
+    async for item in _iter_cursor_pages(lambda cursor: get_likesAndcollects(cursor, cookies_str), "message_list", stop_on_empty=False, checkpoint=checkpoint):
+        yield item
+
+
+async def get_all_likesAndcollects(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_all_likesAndcollects(cookies_str, checkpoint))
+
+
+async def get_new_connections(cursor: str, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/api/sns/web/v1/you/connections", cookies_str, params=_message_page_params(cursor))
+
+
+async def iter_all_new_connections(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> AsyncIterator[Dict[str, Any]]:
+    async for item in _iter_cursor_pages(lambda cursor: get_new_connections(cursor, cookies_str), "message_list", stop_on_empty=False, checkpoint=checkpoint):
+        yield item
+
+
+async def get_all_new_connections(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(iter_all_new_connections(cookies_str, checkpoint))
+
+
+# ---------- Creator ----------
+async def creator_get_publish_note_info(page: int, cookies_str: str) -> Tuple[bool, str, Dict[str, Any]]:
+    return await _request_json("GET", "/web_api/sns/v5/creator/note/user/posted", cookies_str, params=_creator_posted_params(page))
+
+
+async def creator_iter_all_publish_note_info(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> AsyncIterator[Dict[str, Any]]:
+    if checkpoint is not None:
+        for item in checkpoint.replay():
+            yield item
+        if checkpoint.done:
+            return
+    page = _creator_start_page(checkpoint)
+    while True:
+        success, msg, res_json = await creator_get_publish_note_info(page, cookies_str)
+        if not success:
+            raise RuntimeError(msg)
+        notes, page = _read_creator_page(res_json)
+        if checkpoint is not None:
+            checkpoint.append(page, notes, page != -1)
+        for item in notes:
+            yield item
+        if page == -1:
+            break
+    if checkpoint is not None:
+        checkpoint.finish()
+
+
+async def creator_get_all_publish_note_info(cookies_str: str, checkpoint: PageCheckpoint | None = None) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    return await _collect(creator_iter_all_publish_note_info(cookies_str, checkpoint))
+
+
+# ---------- No-watermark helpers ----------
+async def get_note_no_water_video(note_id: str) -> Tuple[bool, str, str]:
+    key, cached = _og_video_cached(note_id)
+    if cached is not None:
+        return True, "成功", cached
+    try:
+        client = await _client()
+        async with _semaphore():
+            response = await client.get(f"https://www.xiaohongshu.com/explore/{note_id}", headers=OG_VIDEO_HEADERS, timeout=30)
+        return _read_og_video(response.text, key)
+    except Exception as e:
+        return False, str(e), ""
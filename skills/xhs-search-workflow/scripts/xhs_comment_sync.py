@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from xhs_auth import CONFIG_DIR
+from xhs_client import _parse_note_url, expand_inner_comments, get_note_out_comment
+
+# 评论增量同步：每篇笔记在 comment_sync/<note_id>.json 里记录最新一级评论的 id/create_time（水位线）
+# 和每个一级评论的回复数。再次同步时按“最新在前”翻页，某一页没有未见过的评论、且其中最早的非置顶评论不晚于水位线时停止
+# （置顶评论不按时间排序，不参与判断），
+# 只输出新的一级评论（回复已展开），以及所翻页中回复数有变化、重新展开过的旧评论。
+# 更深处旧评论的新回复不会被发现，需要时不加 --incremental 做一次全量抓取。
+# 回复数只记录发布时间在水位线之前 XHS_COMMENT_SYNC_WINDOW_DAYS 天（默认 30，0 不限）以内的一级评论，
+# 更早的评论既不再检查回复数变化，也不会被当成新评论，状态文件大小因此有上限。
+SYNC_DIR = Path(os.environ.get("XHS_COMMENT_SYNC_DIR", CONFIG_DIR / "comment_sync"))
+SYNC_WINDOW_DAYS = float(os.environ.get("XHS_COMMENT_SYNC_WINDOW_DAYS", "30"))
+
+
+def is_pinned(comment: Dict[str, Any]) -> bool:
+    tags = comment.get("show_tags") or []
+    return bool(comment.get("sticky") or comment.get("is_top") or "top" in tags or "is_top" in tags)
+
+
+def create_time_of(comment: Dict[str, Any]) -> int:
+    return int(comment.get("create_time", 0) or 0)
+
+
+def window_floor(watermark: int) -> int:
+    # roots published at or before this (ms) are no longer tracked; 0 tracks everything
+    if not watermark or SYNC_WINDOW_DAYS <= 0:
+        return 0
+    return watermark - int(SYNC_WINDOW_DAYS * 86400 * 1000)
+
+
+def state_file_for(note_id: str) -> Path:
+    return SYNC_DIR / f"{note_id}.json"
+
+
+def load_sync_state(note_id: str) -> Dict[str, Any]:
+    try:
+        return json.loads(state_file_for(note_id).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_sync_state(note_id: str, state: Dict[str, Any]) -> None:
+    path = state_file_for(note_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def sync_note_comments(url: str, cookies_str: str, workers: int | None = None) -> Tuple[bool, str, Dict[str, Any]]:
+    success, msg = True, "成功"
+    note_id, xsec_token, _ = _parse_note_url(url)
+    state = load_sync_state(note_id)
+    # root comment id -> reply count when last expanded (None: expansion failed, refresh next time)
+    reply_counts: Dict[str, str | None] = dict(state.get("reply_counts", {}))
+    watermark = int(state.get("newest_time", 0))
+    # root comment id -> create_time, used to drop roots that fell out of the window;
+    # state written before the window existed has no times, so those roots age out from the watermark
+    root_times: Dict[str, int] = {cid: int(state.get("root_times", {}).get(cid, watermark)) for cid in reply_counts}
+    # also honour how far an earlier run pruned, so a wider window later does not re-report those roots
+    floor = max(window_floor(watermark), int(state.get("pruned_before", 0)))
+    newest_time, newest_id = watermark, state.get("newest_id", "")
+    new_comments: List[Dict[str, Any]] = []
+    updated_comments: List[Dict[str, Any]] = []
+    failed: List[str] = []
+    pages, complete = 0, False
+    cursor = ""
+    try:
+        while True:
+            success, msg, res_json = get_note_out_comment(note_id, cursor, xsec_token, cookies_str)
+            if not success:
+                raise RuntimeError(msg)
+            pages += 1
+            data = res_json.get("data", {})
+            batch = data.get("comments", [])
+            # roots older than the window were seen before and pruned from the state: neither new nor re-checked
+            fresh = [c for c in batch if c.get("id", "") not in reply_counts and (not floor or create_time_of(c) > floor)]
+            changed = [c for c in batch if c.get("id", "") in reply_counts and reply_counts[c["id"]] != str(c.get("sub_comment_count", ""))]
+            # pinned comments are old and already known, so they alone must not end the pass
+            in_order = [create_time_of(c) for c in batch if not is_pinned(c)]
+            reached_seen = not fresh and bool(in_order) and min(in_order) <= watermark
+            results = expand_inner_comments(fresh + changed, xsec_token, cookies_str, workers)
+            for idx, (ok, inner_msg, comment) in enumerate(results):
+                (new_comments if idx < len(fresh) else updated_comments).append(comment)
+                reply_counts[comment["id"]] = str(comment.get("sub_comment_count", "")) if ok else None
+                root_times[comment["id"]] = create_time_of(comment)
+                if not ok:
+                    failed.append(inner_msg)
+            for comment in fresh:
+                create_time = create_time_of(comment)
+                if create_time > newest_time:
+                    newest_time, newest_id = create_time, comment.get("id", "")
+            cursor = str(data.get("cursor", ""))
+            if reached_seen or not batch or not data.get("has_more", False):
+                complete = True
+                break
+    except Exception as e:
+        success, msg = False, str(e)
+    if failed and success:
+        success, msg = False, f"{len(failed)} 条评论的回复未完整展开: {failed[0]}"
+
+    # comments already returned are remembered even after a failed page, so they are not output twice;
+    # the watermark only moves once the new range was paged through, otherwise the gap would be skipped
+    if complete:
+        state["newest_time"], state["newest_id"] = newest_time, newest_id
+    keep_after = window_floor(int(state.get("newest_time", 0)))
+    kept = [cid for cid in reply_counts if not keep_after or root_times[cid] > keep_after]
+    if len(kept) < len(reply_counts):
+        state["pruned_before"] = max(keep_after, int(state.get("pruned_before", 0)))
+    state["reply_counts"] = {cid: reply_counts[cid] for cid in kept}
+    state["root_times"] = {cid: root_times[cid] for cid in kept}
+    state["synced_at"] = int(time.time())
+    save_sync_state(note_id, state)
+    return success, msg, {
+        "note_id": note_id,
+        "first_sync": watermark == 0,
+        "pages": pages,
+        "new_comments": new_comments,
+        "updated_comments": updated_comments,
+        "newest_time": state.get("newest_time", 0),
+    }
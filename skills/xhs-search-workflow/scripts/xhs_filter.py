@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+import operator
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# 分页结果过滤（--where / --since）：每页到达时逐条判断，不必全部抓完再过滤。
+#   --where "liked_count>=1000, type==video"   多个条件用逗号或 and 连接，全部满足才保留；值里有逗号时加引号，如 title~"a,b"
+#   --since 2026-01-01 / "2026-01-01 08:00" / 7d / 12h
+# 数量字段兼容 "1.2万"、"3k" 写法；时间取 note_card.time / time / create_time（毫秒），
+# 都没有时按笔记 id 前 8 位（秒级时间戳）推算。按时间倒序的来源一旦出现早于 --since 的条目就停止翻页。
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    "~": lambda left, right: str(right).lower() in str(left).lower(),
+}
+CONDITION_RE = re.compile(r"^\s*([A-Za-z_][\w.]*)\s*(>=|<=|!=|==|>|<|~|=)\s*(.*?)\s*$")
+# a condition separator: a comma or a word "and", matched only outside quotes
+SEPARATOR_RE = re.compile(r",|\s+and\s+", re.IGNORECASE)
+
+# short names -> paths tried in order on the item and on item["note_card"]
+FIELD_ALIASES: Dict[str, List[str]] = {
+    "liked_count": ["interact_info.liked_count", "liked_count"],
+    "collected_count": ["interact_info.collected_count", "collected_count"],
+    "comment_count": ["interact_info.comment_count", "comment_count"],
+    "share_count": ["interact_info.share_count", "share_count"],
+    "type": ["type", "note_type"],
+    "title": ["display_title", "title"],
+    "desc": ["desc"],
+    "user_id": ["user.user_id", "user_id"],
+    "nickname": ["user.nickname", "user.nick_name", "nickname"],
+    "id": ["id", "note_id"],
+    "sticky": ["interact_info.sticky", "sticky"],
+}
+# type==video / type==normal also accept the Chinese labels used by export_notes
+TYPE_NAMES = {"video": "video", "视频": "video", "normal": "normal", "图集": "normal", "image": "normal"}
+
+
+def parse_count(value: Any) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower().replace(",", "").rstrip("+")
+    scale = 1.0
+    for suffix, factor in (("万", 1e4), ("w", 1e4), ("亿", 1e8), ("k", 1e3)):
+        if text.endswith(suffix):
+            text, scale = text[: -len(suffix)], factor
+            break
+    try:
+        return float(text) * scale
+    except ValueError:
+        return None
+
+
+def _lookup(obj: Any, path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(obj, dict) or part not in obj:
+            return None
+        obj = obj[part]
+    return obj
+
+
+def item_field(item: Dict[str, Any], name: str) -> Any:
+    for path in FIELD_ALIASES.get(name, [name]):
+        for source in (item, item.get("note_card")):
+            value = _lookup(source, path)
+            if value is not None:
+                return value
+    return None
+
+
+def item_time_ms(item: Dict[str, Any]) -> int | None:
+    for name in ("time", "create_time", "last_update_time"):
+        value = item_field(item, name)
+        if isinstance(value, (int, float)) and value > 0:
+            return int(value)
+    # note ids are ObjectId-like: the first 4 bytes are the creation time in seconds
+    note_id = str(item_field(item, "id") or "")
+    if re.fullmatch(r"[0-9a-f]{24}", note_id):
+        seconds = int(note_id[:8], 16)
+        if 1262304000 <= seconds <= time.time() + 86400:
+            return seconds * 1000
+    return None
+
+
+def parse_since(text: str) -> int:
+    # epoch milliseconds; absolute dates are local time like the upload_time column of exports
+    text = text.strip()
+    relative = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([dhm])", text)
+    if relative:
+        seconds = float(relative.group(1)) * {"d": 86400, "h": 3600, "m": 60}[relative.group(2)]
+        return int((time.time() - seconds) * 1000)
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return int(time.mktime(time.strptime(text, fmt)) * 1000)
+        except ValueError:
+            continue
+    raise ValueError(f"bad --since value: {text!r} (use YYYY-MM-DD, 'YYYY-MM-DD HH:MM', 7d or 12h)")
+
+
+def _compare(left: Any, op: str, right: str) -> bool:
+    if left is None:
+        return False
+    if op == "~":
+        return OPERATORS[op](left, right)
+    left_num, right_num = parse_count(left), parse_count(right)
+    if left_num is not None and right_num is not None:
+        return OPERATORS[op](left_num, right_num)
+    left_text, right_text = str(left), right
+    if left_text.lower() in TYPE_NAMES and right_text.lower() in TYPE_NAMES:
+        left_text, right_text = TYPE_NAMES[left_text.lower()], TYPE_NAMES[right_text.lower()]
+    return OPERATORS[op](left_text, right_text)
+
+
+def _split_conditions(expr: str) -> List[str]:
+    parts: List[str] = []
+    start, pos, quote = 0, 0, ""
+    while pos < len(expr):
+        ch = expr[pos]
+        if quote:
+            quote = "" if ch == quote else quote
+        elif ch in "'\"" and expr[start:pos].rstrip()[-1:] in ("=", ">", "<", "~"):
+            # only a quote right after the operator opens a quoted value; title~it's stays literal
+            quote = ch
+        else:
+            sep = SEPARATOR_RE.match(expr, pos)
+            if sep:
+                parts.append(expr[start:pos])
+                start = pos = sep.end()
+                continue
+        pos += 1
+    if quote:
+        raise ValueError(f"bad --where expression: unclosed {quote} in {expr!r}")
+    parts.append(expr[start:])
+    return parts
+
+
+def parse_where(expr: str) -> List[Tuple[str, str, str]]:
+    conditions: List[Tuple[str, str, str]] = []
+    for part in _split_conditions(expr.strip()):
+        if not part.strip():
+            continue
+        match = CONDITION_RE.match(part)
+        if not match or not match.group(3) or match.group(3)[0] in "<>=!~":
+            raise ValueError(f"bad --where condition: {part.strip()!r} (expected field op value, op one of >= <= > < == != ~)")
+        name, op, value = match.groups()
+        conditions.append((name, "==" if op == "=" else op, value.strip("'\"")))
+    return conditions
+
+
+class ItemFilter:
+    def __init__(self, where: str = "", since: str = "") -> None:
+        self.where = where
+        self.conditions = parse_where(where) if where else []
+        self.since_ms = parse_since(since) if since else 0
+        self.seen = 0
+        self.kept = 0
+        # one filter can be shared by the threads of a batch search
+        self._lock = threading.Lock()
+
+    def too_old(self, item: Dict[str, Any]) -> bool:
+        if not self.since_ms:
+            return False
+        created = item_time_ms(item)
+        return created is not None and created < self.since_ms
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        if self.too_old(item):
+            return False
+        return all(_compare(item_field(item, name), op, value) for name, op, value in self.conditions)
+
+    def apply(self, items: List[Dict[str, Any]], time_sorted: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+        # (kept items, stop): on newest-first sources the first item older than --since ends the
+        # window; pinned items are out of order, so they never trigger the stop
+        kept = [item for item in items if self.matches(item)]
+        with self._lock:
+            self.seen += len(items)
+            self.kept += len(kept)
+        stop = time_sorted and any(self.too_old(item) and not item_field(item, "sticky") for item in items)
+        return kept, stop
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"where": self.where, "since_ms": self.since_ms, "seen": self.seen, "kept": self.kept}
+
+
+def build_filter(where: str = "", since: str = "") -> ItemFilter | None:
+    if not where and not since:
+        return None
+    return ItemFilter(where, since)
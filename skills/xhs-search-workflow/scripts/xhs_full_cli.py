@@ -2,19 +2,26 @@
 import argparse
 import json
 import os
-from typing import Any, Dict, Tuple
+import sys
+from typing import Any, Dict, Iterator, Tuple
 
+from xhs_accounts import get_cookie_pool
 from xhs_auth import (
-    COOKIE_FILE,
     clear_cookies,
+    cookie_file_for,
     cookie_str_to_dict,
     get_saved_cookie_string,
     has_required_cookies,
+    list_accounts,
     qrcode_login,
     save_cookies,
 )
+from xhs_checkpoint import PageCheckpoint, checkpoint_path, is_unfinished
 from xhs_client import (
+    configure_cache,
+    configure_rate_limit,
     creator_get_all_publish_note_info,
+    creator_iter_all_publish_note_info,
     get_all_likesAndcollects,
     get_all_metions,
     get_all_new_connections,
@@ -32,9 +39,33 @@ from xhs_client import (
     get_user_info,
     get_user_self_info,
     get_user_self_info2,
+    harvest_homefeed,
+    iter_all_likesAndcollects,
+    iter_all_metions,
+    iter_all_new_connections,
+    iter_homefeed_harvest,
+    iter_note_all_comment,
+    iter_user_all_collect_note_info,
+    iter_user_all_like_note_info,
+    iter_user_all_notes,
     load_cookies,
     search_some_user,
 )
+from xhs_comment_sync import sync_note_comments
+from xhs_filter import build_filter
+
+
+# commands paged through a cursor; only these take --stream (besides homefeed-harvest) and checkpoints
+PAGINATED_COMMANDS = (
+    "user-posts",
+    "user-likes",
+    "user-collects",
+    "note-comments",
+    "messages-mentions",
+    "messages-likes",
+    "messages-connections",
+    "creator-posted",
+)
 
 
 def drop_proxy_env() -> None:
@@ -52,6 +83,38 @@ def output_result(ok: bool, msg: str, data: Any, out_file: str = "") -> int:
     return 0 if ok else 1
 
 
+def stream_result(items: Iterator[Dict[str, Any]], out_file: str = "", checkpoint: PageCheckpoint | None = None) -> int:
+    # JSON Lines, one item per line as soon as its page arrives; failures go to stderr
+    count = 0
+    partial = 0
+    f = open(out_file, "w", encoding="utf-8") if out_file else None
+    try:
+        for item in items:
+            line = json.dumps(item, ensure_ascii=False)
+            print(line, flush=True)
+            if f is not None:
+                f.write(line + "\n")
+            count += 1
+            # comments whose reply thread could not be fully expanded are still printed
+            partial += 1 if item.get("_expand_error") else 0
+    except Exception as e:
+        error: Dict[str, Any] = {"success": False, "msg": str(e), "count": count}
+        if checkpoint is not None:
+            error["checkpoint"] = checkpoint.stats()
+        print(json.dumps(error, ensure_ascii=False), file=sys.stderr)
+        return 1
+    finally:
+        if f is not None:
+            f.close()
+    if partial:
+        error = {"success": False, "msg": f"{partial} 条评论的回复未完整展开", "count": count}
+        if checkpoint is not None:
+            error["checkpoint"] = checkpoint.stats()
+        print(json.dumps(error, ensure_ascii=False), file=sys.stderr)
+        return 1
+    return 0
+
+
 def verify_session(cookies: str) -> Tuple[bool, str, Dict[str, Any]]:
     ok, msg, data = get_user_self_info2(cookies)
     if not ok:
@@ -72,16 +135,33 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Unified CLI for full xhs-search-workflow skill")
     parser.add_argument("--cookie", default="", help="Cookie string")
     parser.add_argument("--env-file", default="", help="Path to .env containing COOKIES")
+    parser.add_argument("--accounts", default="", help="Rotate saved accounts per request: 'all' or comma-separated names")
     parser.add_argument("--no-env-proxy", action="store_true", help="Disable proxy env vars for this run")
     parser.add_argument("--out", default="", help="Write JSON output to file")
+    parser.add_argument("--stream", action="store_true", help="For paginated commands and homefeed-harvest, print items as JSON Lines while pages arrive instead of one JSON document")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Max requests per second per account (default: XHS_RATE_LIMIT or 2; 0 disables)")
+    parser.add_argument("--rate-burst", type=float, default=None, help="Token bucket burst size per account (default: XHS_RATE_BURST or 5)")
+    parser.add_argument("--rate-jitter", type=float, default=None, help="Max random extra seconds added when throttled (default: XHS_RATE_JITTER or 0.2)")
+    parser.add_argument("--where", default="", help="For user-posts/likes/collects, keep items matching e.g. 'liked_count>=1000, type==video' (checked per page)")
+    parser.add_argument("--since", default="", help="For user-posts/likes/collects, keep items published since YYYY-MM-DD or 7d; user-posts stops paging there")
+    parser.add_argument("--resume", action="store_true", help="For paginated commands, replay the saved checkpoint and continue from its last cursor")
+    parser.add_argument("--checkpoint", default="", help="Save pages of a paginated command to this file so a failed run can be resumed (with --resume alone: derived from command and URL under XHS_CHECKPOINT_DIR)")
+    parser.add_argument("--overwrite-checkpoint", action="store_true", help="Start over even if the checkpoint holds an unfinished run")
+    parser.add_argument("--cache", action="store_true", help="Reuse cached responses for note detail/user info/etc. (default: XHS_CACHE; see XHS_CACHE_TTLS)")
 
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     p_login = sub.add_parser("login", help="Login with QR code and save cookies locally")
     p_login.add_argument("--cookie", default="", help="Manually save a cookie string instead of starting QR login")
+    p_login.add_argument("--account", default="", help="Save under this account name (default: the unnamed session)")
 
-    sub.add_parser("logout", help="Clear saved cookies")
-    sub.add_parser("status", help="Check saved login status")
+    p_logout = sub.add_parser("logout", help="Clear saved cookies")
+    p_logout.add_argument("--account", default="", help="Account name to clear")
+    p_status = sub.add_parser("status", help="Check saved login status")
+    p_status.add_argument("--account", default="", help="Account name to check")
+
+    p_accounts = sub.add_parser("accounts", help="List saved accounts and their pool health")
+    p_accounts.add_argument("--release", default="", help="Clear quarantine/cool-down for this account")
 
     p_user_info = sub.add_parser("user-info", help="Get other user info")
     p_user_info.add_argument("--user-id", required=True)
@@ -103,6 +183,7 @@ def main() -> int:
 
     p_comments = sub.add_parser("note-comments", help="Get all comments by note URL")
     p_comments.add_argument("--url", required=True)
+    p_comments.add_argument("--incremental", action="store_true", help="Only return comments added since the last --incremental run, plus threads whose reply count changed")
 
     p_kw = sub.add_parser("search-keyword", help="Get search keyword recommendation")
     p_kw.add_argument("--word", required=True)
@@ -120,6 +201,11 @@ def main() -> int:
     p_feed = sub.add_parser("homefeed-recommend", help="Get homefeed recommended items")
     p_feed.add_argument("--category", default="homefeed_recommend")
     p_feed.add_argument("--num", type=int, default=20)
+    p_harvest = sub.add_parser("homefeed-harvest", help="Page every homefeed channel concurrently, de-duplicated across channels")
+    p_harvest.add_argument("--channels", default="", help="Comma-separated channel ids (default: all from homefeed-channels)")
+    p_harvest.add_argument("--per-channel", type=int, default=100, help="Max new notes taken from each channel")
+    p_harvest.add_argument("--deadline", type=float, default=60.0, help="Stop all channels after this many seconds")
+    p_harvest.add_argument("--workers", type=int, default=None, help="Channels paged at the same time (default: all)")
 
     sub.add_parser("creator-posted", help="Get creator platform posted notes")
 
@@ -130,9 +216,29 @@ def main() -> int:
     p_ni.add_argument("--img-url", required=True)
 
     args = parser.parse_args()
+    try:
+        item_filter = build_filter(args.where, args.since)
+    except ValueError as e:
+        parser.error(str(e))
+    if item_filter is not None and args.cmd not in ("user-posts", "user-likes", "user-collects"):
+        parser.error("--where/--since only apply to user-posts, user-likes and user-collects")
+    incremental = getattr(args, "incremental", False)
+    paginated = args.cmd in PAGINATED_COMMANDS and not incremental
+    if args.stream and not (paginated or args.cmd == "homefeed-harvest"):
+        parser.error("--stream only applies to paginated commands and homefeed-harvest")
+    if (args.checkpoint or args.resume or args.overwrite_checkpoint) and not paginated:
+        parser.error("--checkpoint/--resume/--overwrite-checkpoint only apply to paginated commands")
+    checkpoint_file = None
+    if args.checkpoint or args.resume:
+        checkpoint_file = args.checkpoint or checkpoint_path(args.cmd, getattr(args, "user_url", ""), getattr(args, "url", ""), args.where, args.since)
+        if not args.resume and not args.overwrite_checkpoint and is_unfinished(checkpoint_file):
+            parser.error(f"checkpoint {checkpoint_file} holds an unfinished run; pass --resume to continue it or --overwrite-checkpoint to start over")
 
     if args.no_env_proxy:
         drop_proxy_env()
+    configure_rate_limit(args.rate_limit, args.rate_burst, args.rate_jitter)
+    if args.cache:
+        configure_cache(enabled=True)
 
     cmd = args.cmd
     ok: bool
@@ -140,42 +246,80 @@ def main() -> int:
     data: Any
 
     if cmd == "login":
+        cookie_file = str(cookie_file_for(args.account))
         if args.cookie:
             parsed = cookie_str_to_dict(args.cookie)
             if not has_required_cookies(parsed):
                 return output_result(False, "cookie must contain 'a1' and 'web_session'", {})
-            save_cookies(args.cookie)
+            save_cookies(args.cookie, args.account)
             ok, msg, data = verify_session(args.cookie)
             if not ok:
-                clear_cookies()
+                clear_cookies(args.account)
                 return output_result(False, f"cookie saved but verification failed: {msg}", data)
-            data["cookie_file"] = str(COOKIE_FILE)
+            data["cookie_file"] = cookie_file
             return output_result(True, "login successful", data, out_file=args.out)
 
-        cookie_str = qrcode_login(cookie_arg=args.cookie, env_file=args.env_file)
+        cookie_str = qrcode_login(cookie_arg=args.cookie, env_file=args.env_file, account=args.account)
         ok, msg, data = verify_session(cookie_str)
         if not ok:
-            clear_cookies()
+            clear_cookies(args.account)
             return output_result(False, f"qr login succeeded but verification failed: {msg}", data)
-        data["cookie_file"] = str(COOKIE_FILE)
+        data["cookie_file"] = cookie_file
         return output_result(True, "login successful", data, out_file=args.out)
 
     if cmd == "logout":
-        removed = clear_cookies()
-        return output_result(True, "saved cookies cleared" if removed else "no saved cookies", {"cookie_file": str(COOKIE_FILE)})
+        removed = clear_cookies(args.account)
+        return output_result(True, "saved cookies cleared" if removed else "no saved cookies", {"cookie_file": str(cookie_file_for(args.account))})
 
     if cmd == "status":
-        saved = get_saved_cookie_string()
+        cookie_file = str(cookie_file_for(args.account))
+        saved = get_saved_cookie_string(args.account)
         if not saved:
-            return output_result(False, "not logged in", {"cookie_file": str(COOKIE_FILE)})
+            return output_result(False, "not logged in", {"cookie_file": cookie_file})
         ok, msg, data = verify_session(saved)
-        data["cookie_file"] = str(COOKIE_FILE)
+        data["cookie_file"] = cookie_file
         return output_result(ok, msg if ok else f"saved cookies exist but are invalid: {msg}", data, out_file=args.out)
 
+    if cmd == "accounts":
+        names = list_accounts()
+        if not names:
+            return output_result(False, "no saved accounts", {"accounts": []})
+        pool = get_cookie_pool()
+        if args.release:
+            if args.release not in pool.accounts:
+                return output_result(False, f"unknown account: {args.release}", {"accounts": pool.stats()})
+            pool.release(args.release)
+        return output_result(True, f"{len(names)} saved accounts", {"accounts": pool.stats()}, out_file=args.out)
+
     if cmd in ("no-water-video", "no-water-img"):
         cookies = ""
     else:
-        cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file)
+        cookies = load_cookies(cookie_arg=args.cookie, env_file=args.env_file, accounts=args.accounts)
+
+    if cmd == "homefeed-harvest" and args.stream:
+        channels = [c.strip() for c in args.channels.split(",") if c.strip()] or None
+        return stream_result(iter_homefeed_harvest(cookies, channels, args.per_channel, args.deadline, args.workers), out_file=args.out)
+
+    if cmd == "note-comments" and args.incremental:
+        ok, msg, data = sync_note_comments(args.url, cookies)
+        return output_result(ok, msg, data, out_file=args.out)
+
+    streams = {
+        "user-posts": lambda cp: iter_user_all_notes(args.user_url, cookies, cp, item_filter),
+        "user-likes": lambda cp: iter_user_all_like_note_info(args.user_url, cookies, cp, item_filter),
+        "user-collects": lambda cp: iter_user_all_collect_note_info(args.user_url, cookies, cp, item_filter),
+        "note-comments": lambda cp: iter_note_all_comment(args.url, cookies, cp),
+        "messages-mentions": lambda cp: iter_all_metions(cookies, cp),
+        "messages-likes": lambda cp: iter_all_likesAndcollects(cookies, cp),
+        "messages-connections": lambda cp: iter_all_new_connections(cookies, cp),
+        "creator-posted": lambda cp: creator_iter_all_publish_note_info(cookies, cp),
+    }
+    checkpoint = PageCheckpoint(checkpoint_file, resume=args.resume) if checkpoint_file is not None else None
+    if args.stream:
+        code = stream_result(streams[cmd](checkpoint), out_file=args.out, checkpoint=checkpoint)
+        if code == 0 and checkpoint is not None:
+            checkpoint.remove()
+        return code
 
     if cmd == "user-info":
         ok, msg, data = get_user_info(args.user_id, cookies)
@@ -184,15 +328,15 @@ def main() -> int:
     elif cmd == "user-self-info2":
         ok, msg, data = get_user_self_info2(cookies)
     elif cmd == "user-posts":
-        ok, msg, data = get_user_all_notes(args.user_url, cookies)
+        ok, msg, data = get_user_all_notes(args.user_url, cookies, checkpoint, item_filter)
     elif cmd == "user-likes":
-        ok, msg, data = get_user_all_like_note_info(args.user_url, cookies)
+        ok, msg, data = get_user_all_like_note_info(args.user_url, cookies, checkpoint, item_filter)
     elif cmd == "user-collects":
-        ok, msg, data = get_user_all_collect_note_info(args.user_url, cookies)
+        ok, msg, data = get_user_all_collect_note_info(args.user_url, cookies, checkpoint, item_filter)
     elif cmd == "note-info":
         ok, msg, data = get_note_info(args.url, cookies)
     elif cmd == "note-comments":
-        ok, msg, data = get_note_all_comment(args.url, cookies)
+        ok, msg, data = get_note_all_comment(args.url, cookies, checkpoint)
     elif cmd == "search-keyword":
         ok, msg, data = get_search_keyword(args.word, cookies)
     elif cmd == "search-users":
@@ -200,17 +344,20 @@ def main() -> int:
     elif cmd == "messages-unread":
         ok, msg, data = get_unread_message(cookies)
     elif cmd == "messages-mentions":
-        ok, msg, data = get_all_metions(cookies)
+        ok, msg, data = get_all_metions(cookies, checkpoint)
     elif cmd == "messages-likes":
-        ok, msg, data = get_all_likesAndcollects(cookies)
+        ok, msg, data = get_all_likesAndcollects(cookies, checkpoint)
     elif cmd == "messages-connections":
-        ok, msg, data = get_all_new_connections(cookies)
+        ok, msg, data = get_all_new_connections(cookies, checkpoint)
     elif cmd == "homefeed-channels":
         ok, msg, data = get_homefeed_all_channel(cookies)
     elif cmd == "homefeed-recommend":
         ok, msg, data = get_homefeed_recommend_by_num(args.category, args.num, cookies)
+    elif cmd == "homefeed-harvest":
+        channels = [c.strip() for c in args.channels.split(",") if c.strip()] or None
+        ok, msg, data = harvest_homefeed(cookies, channels, args.per_channel, args.deadline, args.workers)
     elif cmd == "creator-posted":
-        ok, msg, data = creator_get_all_publish_note_info(cookies)
+        ok, msg, data = creator_get_all_publish_note_info(cookies, checkpoint)
     elif cmd == "no-water-video":
         ok, msg, value = get_note_no_water_video(args.note_id)
         data = {"note_id": args.note_id, "video_url": value}
@@ -220,6 +367,11 @@ def main() -> int:
     else:
         return output_result(False, f"unknown cmd: {cmd}", {})
 
+    if checkpoint is not None:
+        if ok:
+            checkpoint.remove()
+        else:
+            msg = f"{msg} (checkpoint: {checkpoint.path}, {checkpoint.pages} pages saved; rerun with --resume)"
     return output_result(ok, msg, data, out_file=args.out)
 
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Tuple
+
+# 每个账号（cookie 中的 a1）一个令牌桶，每个 (账号, API 路径) 再一个令牌桶；
+# 请求需要同时拿到两个桶的令牌，并在等待后叠加随机抖动。
+# rate <= 0 表示不限速。
+DEFAULT_RATE = float(os.environ.get("XHS_RATE_LIMIT", "2.0"))
+DEFAULT_BURST = float(os.environ.get("XHS_RATE_BURST", "5"))
+DEFAULT_JITTER = float(os.environ.get("XHS_RATE_JITTER", "0.2"))
+# e.g. XHS_RATE_ENDPOINTS='{"/api/sns/web/v1/search/notes": [0.5, 2]}'  -> path: [rate, burst]
+DEFAULT_ENDPOINT_RATES = os.environ.get("XHS_RATE_ENDPOINTS", "")
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take one token (possibly borrowing from the future) and return how long to wait for it."""
+        if self.rate <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        jitter: float = DEFAULT_JITTER,
+        endpoint_rates: Dict[str, Tuple[float, float]] | None = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.jitter = max(jitter, 0.0)
+        self.endpoint_rates = dict(endpoint_rates or {})
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._accounts: Dict[str, TokenBucket] = {}
+        self._endpoints: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, account: str, path: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._accounts.get(account)
+            if bucket is None:
+                bucket = self._accounts[account] = TokenBucket(self.rate, self.burst)
+            wait = bucket.reserve(now)
+            if path in self.endpoint_rates:
+                key = (account, path)
+                ep_bucket = self._endpoints.get(key)
+                if ep_bucket is None:
+                    ep_rate, ep_burst = self.endpoint_rates[path]
+                    ep_bucket = self._endpoints[key] = TokenBucket(ep_rate, ep_burst)
+                wait = max(wait, ep_bucket.reserve(now))
+            if wait > 0:
+                wait += random.uniform(0, self.jitter)
+                self.waits += 1
+                self.wait_seconds += wait
+        return wait
+
+    def acquire(self, account: str, path: str) -> float:
+        wait = self.reserve(account, path)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "jitter": self.jitter,
+            "accounts": len(self._accounts),
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+def parse_endpoint_rates(text: str) -> Dict[str, Tuple[float, float]]:
+    if not text:
+        return {}
+    raw = json.loads(text)
+    rates: Dict[str, Tuple[float, float]] = {}
+    for path, value in raw.items():
+        if isinstance(value, (list, tuple)):
+            rate, burst = float(value[0]), float(value[1] if len(value) > 1 else 1)
+        else:
+            rate, burst = float(value), 1.0
+        rates[path] = (rate, burst)
+    return rates
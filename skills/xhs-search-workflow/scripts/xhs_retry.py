@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import os
+import random
+from typing import Any, Dict
+
+# 失败分类：
+#   transport    连接失败、超时、响应不是 JSON           -> 重试
+#   http_5xx     服务端 5xx                            -> 重试
+#   throttled    HTTP 429 或频控 code（300013/300015）   -> 重试（更长退避）
+#   risk         验证码/安全验证（HTTP 461/471）、IP 风险（300012）
+#                                                      -> 立即失败（账号池时换号）
+#   auth         登录失效、无登录信息、无权限              -> 立即失败
+#   client       其他 4xx                              -> 立即失败
+#   api          业务失败（success=false 的其他情况）      -> 立即失败
+#   internal     本地错误（签名失败、cookie 缺 a1 等）     -> 立即失败
+OK = "ok"
+TRANSPORT = "transport"
+HTTP_5XX = "http_5xx"
+THROTTLED = "throttled"
+RISK = "risk"
+AUTH = "auth"
+CLIENT = "client"
+API = "api"
+INTERNAL = "internal"
+
+RETRYABLE = {TRANSPORT, HTTP_5XX, THROTTLED}
+
+AUTH_CODES = {-100, -101, -104}
+THROTTLE_CODES = {300013, 300015}
+# 300012: the IP is flagged; retrying from it only makes that worse
+RISK_CODES = {300012}
+RISK_HINTS = ("IP存在风险",)
+THROTTLE_HINTS = ("频次", "频繁", "稍后再试", "网络连接异常")
+AUTH_HINTS = ("登录已过期", "无登录信息", "登录信息为空")
+RISK_STATUS = {461, 471}
+
+
+def classify_response(status: int, res_json: Dict[str, Any]) -> str:
+    if status in RISK_STATUS:
+        return RISK
+    if status == 429:
+        return THROTTLED
+    if status >= 500:
+        return HTTP_5XX
+    if res_json.get("success"):
+        return OK
+    code = res_json.get("code")
+    msg = str(res_json.get("msg") or "")
+    if code in AUTH_CODES or any(h in msg for h in AUTH_HINTS):
+        return AUTH
+    if code in RISK_CODES or any(h in msg for h in RISK_HINTS):
+        return RISK
+    if code in THROTTLE_CODES or any(h in msg for h in THROTTLE_HINTS):
+        return THROTTLED
+    if 400 <= status < 500:
+        return CLIENT
+    return API
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = int(os.environ.get("XHS_RETRY_ATTEMPTS", "3")),
+        base_delay: float = float(os.environ.get("XHS_RETRY_BASE_DELAY", "1.0")),
+        throttle_delay: float = float(os.environ.get("XHS_RETRY_THROTTLE_DELAY", "5.0")),
+        max_delay: float = float(os.environ.get("XHS_RETRY_MAX_DELAY", "60")),
+    ) -> None:
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.throttle_delay = throttle_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, error_class: str, attempt: int) -> bool:
+        return error_class in RETRYABLE and attempt < self.max_attempts
+
+    def backoff(self, error_class: str, attempt: int) -> float:
+        # exponential backoff with full jitter
+        base = self.throttle_delay if error_class == THROTTLED else self.base_delay
+        cap = min(self.max_delay, base * (2 ** (attempt - 1)))
+        return random.uniform(cap / 2, cap)
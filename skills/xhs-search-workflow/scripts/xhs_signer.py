@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+JS_DIR = SKILL_DIR / "assets" / "js"
+WORKER_JS = JS_DIR / "xhs_sign_worker.js"
+
+# worker: 常驻 node 进程池（XHS_SIGNER_WORKERS 个，默认 CPU 核数）；execjs: 每次调用启动一个 node 进程（旧链路）
+SIGNER_BACKEND = os.environ.get("XHS_SIGNER", "worker").lower()
+NODE_BIN = os.environ.get("XHS_NODE_BIN", "node")
+SIGNER_WORKERS = int(os.environ.get("XHS_SIGNER_WORKERS", "0")) or (os.cpu_count() or 1)
+TRACE_POOL_SIZE = int(os.environ.get("XHS_TRACE_POOL_SIZE", "2000"))
+
+
+class SignerError(RuntimeError):
+    pass
+
+
+def _compile_with_cwd(js_file: Path):
+    import execjs
+
+    bootstrap = (
+        f"process.chdir({json.dumps(str(JS_DIR))});\n"
+        f"globalThis.__XHS_SKILL_JS_DIR={json.dumps(str(JS_DIR))};\n"
+    )
+    source = js_file.read_text(encoding="utf-8")
+    return execjs.compile(bootstrap + source)
+
+
+class ExecjsSigner:
+    name = "execjs"
+
+    def __init__(self) -> None:
+        self._js_xs = _compile_with_cwd(JS_DIR / "xhs_xs_xsc_56.js")
+        self._js_xray = _compile_with_cwd(JS_DIR / "xhs_xray.js")
+
+    def sign(self, api: str, data: Any, a1: str, method: str, fixed_xt: int = 0) -> Dict[str, Any]:
+        return self._js_xs.call("get_request_headers_params", api, data, a1, method, fixed_xt)
+
+    def sign_batch(self, requests: Sequence[Tuple[str, Any, str, str]]) -> List[Dict[str, Any]]:
+        return self._js_xs.call("get_request_headers_params_batch", [list(r) for r in requests])
+
+    def trace_id(self) -> str:
+        return self._js_xray.call("traceId")
+
+    def trace_ids(self, count: int) -> List[str]:
+        return self._js_xray.call("traceIds", count)
+
+    def close(self) -> None:
+        pass
+
+
+class NodeSignWorker:
+    """Long-lived node process speaking line-delimited JSON over stdin/stdout."""
+
+    name = "worker"
+
+    def __init__(self, node_bin: str = NODE_BIN, timeout: float = 30.0, max_restarts: int = 3) -> None:
+        self.node_bin = node_bin
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen | None = None
+        self._lines: "queue.Queue[str]" = queue.Queue()
+        self._seq = 0
+        with self._lock:
+            self._start()
+
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            [self.node_bin, str(WORKER_JS)],
+            cwd=str(JS_DIR),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), daemon=True).start()
+        ready = self._read(self._lines)
+        if ready.get("result") != "ready":
+            self._kill()
+            raise SignerError(f"sign worker failed to start: {ready}")
+
+    @staticmethod
+    def _pump(proc: subprocess.Popen, lines: "queue.Queue[str]") -> None:
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put("")
+
+    def _read(self, lines: "queue.Queue[str]") -> Dict[str, Any]:
+        try:
+            line = lines.get(timeout=self.timeout)
+        except queue.Empty:
+            raise SignerError(f"sign worker timed out after {self.timeout}s")
+        if not line:
+            raise SignerError("sign worker exited unexpectedly")
+        return json.loads(line)
+
+    def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid if self._alive() else 0
+
+    def _alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def call(self, method: str, *params: Any) -> Any:
+        with self._lock:
+            last_error: Exception | None = None
+            for _ in range(self.max_restarts + 1):
+                if not self._alive():
+                    self._kill()
+                    self.restarts += 1
+                    try:
+                        self._start()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                self._seq += 1
+                request = json.dumps({"id": self._seq, "method": method, "params": list(params)}, ensure_ascii=False)
+                try:
+                    self._proc.stdin.write(request + "\n")
+                    self._proc.stdin.flush()
+                    response = self._read(self._lines)
+                except (OSError, ValueError, SignerError) as e:
+                    logger.warning("sign worker crashed, restarting: %s", e)
+                    last_error = e
+                    self._kill()
+                    continue
+                if response.get("id") != self._seq:
+                    last_error = SignerError(f"sign worker out of sync: {response}")
+                    self._kill()
+                    continue
+                if "error" in response:
+                    raise SignerError(response["error"])
+                return response.get("result")
+            raise SignerError(f"sign worker unavailable: {last_error}")
+
+    def sign(self, api: str, data: Any, a1: str, method: str, fixed_xt: int = 0) -> Dict[str, Any]:
+        return self.call("sign", api, data, a1, method, fixed_xt)
+
+    def sign_batch(self, requests: Sequence[Tuple[str, Any, str, str]]) -> List[Dict[str, Any]]:
+        return self.call("sign_batch", [list(r) for r in requests])
+
+    def trace_id(self) -> str:
+        return self.call("trace_id")
+
+    def trace_ids(self, count: int) -> List[str]:
+        return self.call("trace_ids", count)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None and self._proc.stdin:
+                try:
+                    self._proc.stdin.close()
+                except OSError:
+                    pass
+            self._kill()
+
+
+class SignerPool:
+    """Up to `size` sign workers; callers block while every worker is busy."""
+
+    name = "pool"
+
+    def __init__(self, size: int = SIGNER_WORKERS, acquire_timeout: float = 60.0) -> None:
+        self.size = max(size, 1)
+        self.acquire_timeout = acquire_timeout
+        self.waits = 0
+        self._workers: List[NodeSignWorker] = []
+        self._idle: "queue.Queue[NodeSignWorker]" = queue.Queue()
+        self._lock = threading.Lock()
+        # workers being started; they count against size but are not in _workers yet
+        self._pending = 1
+        # start one worker eagerly so a broken node setup is detected up front
+        self._idle.put(self._spawn())
+
+    def _spawn(self) -> NodeSignWorker:
+        # the caller reserved a slot in _pending; node starts outside the lock so other
+        # callers can still pick up a worker that is returned meanwhile
+        try:
+            worker = NodeSignWorker()
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        with self._lock:
+            self._pending -= 1
+            self._workers.append(worker)
+        return worker
+
+    def _acquire(self) -> NodeSignWorker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            reserved = len(self._workers) + self._pending < self.size
+            if reserved:
+                self._pending += 1
+        if reserved:
+            return self._spawn()
+        self.waits += 1
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise SignerError(f"all {self.size} sign workers busy for {self.acquire_timeout}s")
+
+    def _run(self, method: str, *params: Any) -> Any:
+        worker = self._acquire()
+        try:
+            return getattr(worker, method)(*params)
+        finally:
+            self._idle.put(worker)
+
+    def sign(self, api: str, data: Any, a1: str, method: str, fixed_xt: int = 0) -> Dict[str, Any]:
+        return self._run("sign", api, data, a1, method, fixed_xt)
+
+    def sign_batch(self, requests: Sequence[Tuple[str, Any, str, str]]) -> List[Dict[str, Any]]:
+        return self._run("sign_batch", requests)
+
+    def trace_id(self) -> str:
+        return self._run("trace_id")
+
+    def trace_ids(self, count: int) -> List[str]:
+        return self._run("trace_ids", count)
+
+    def pids(self) -> List[int]:
+        return [w.pid for w in self._workers if w.pid]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "started": len(self._workers),
+            "idle": self._idle.qsize(),
+            "waits": self.waits,
+            "restarts": sum(w.restarts for w in self._workers),
+        }
+
+    def close(self) -> None:
+        for worker in list(self._workers):
+            worker.close()
+
+
+class TraceIdPool:
+    """Pre-generated x-xray-traceid values, refilled in the background when running low."""
+
+    def __init__(self, signer: Any, size: int = TRACE_POOL_SIZE, low_water: float = 0.25, max_age: float = 300.0) -> None:
+        # trace ids embed their generation time, so ids older than max_age are discarded.
+        self.signer = signer
+        self.size = max(size, 1)
+        self.low_water = max(int(self.size * low_water), 1)
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self._ids: "deque[Tuple[float, str]]" = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+
+    def _generate(self) -> List[Tuple[float, str]]:
+        now = time.monotonic()
+        ids = self.signer.trace_ids(self.size)
+        self.refills += 1
+        return [(now, trace_id) for trace_id in ids]
+
+    def _refill_in_background(self) -> None:
+        try:
+            batch = self._generate()
+            with self._lock:
+                self._ids.extend(batch)
+        except Exception as e:
+            logger.warning("trace id refill failed: %s", e)
+        finally:
+            self._refilling = False
+
+    def pop(self) -> str:
+        with self._lock:
+            expire_before = time.monotonic() - self.max_age
+            while self._ids and self._ids[0][0] < expire_before:
+                self._ids.popleft()
+            item = self._ids.popleft() if self._ids else None
+            if item is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if len(self._ids) < self.low_water and not self._refilling:
+                self._refilling = True
+                threading.Thread(target=self._refill_in_background, daemon=True).start()
+        if item is not None:
+            return item[1]
+        return self.signer.trace_id()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refills": self.refills,
+            "available": len(self._ids),
+        }
+
+
+def create_signer(backend: str = ""):
+    backend = (backend or SIGNER_BACKEND).lower()
+    if backend != "execjs":
+        if shutil.which(NODE_BIN):
+            try:
+                return SignerPool()
+            except Exception as e:
+                logger.warning("sign worker unavailable, falling back to execjs: %s", e)
+        else:
+            logger.warning("node binary %r not found, falling back to execjs", NODE_BIN)
+    return ExecjsSigner()
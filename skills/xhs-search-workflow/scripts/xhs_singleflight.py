@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+# 合并同一进程内同时发出的相同请求：第一个调用者（leader）真正签名并发送，
+# 其余调用者等待并拿到结果的深拷贝。请求结束后键即被移除，不做缓存。
+Result = Tuple[bool, str, Dict[str, Any]]
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+def _shared_copy(result: Result) -> Result:
+    success, msg, data = result
+    data = copy.deepcopy(data)
+    if isinstance(data, dict) and isinstance(data.get("_request"), dict):
+        data["_request"]["shared"] = True
+    return success, msg, data
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.collapsed = 0
+        self._inflight: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Result]) -> Result:
+        with self._lock:
+            self.calls += 1
+            call = self._inflight.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                leader = False
+            else:
+                call = self._inflight[key] = _Call()
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _shared_copy(call.result)
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                # followers copy the leader's result, so give them a snapshot taken before the caller mutates it
+                if call.waiters and call.result is not None:
+                    call.result = _shared_copy(call.result)
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "collapsed": self.collapsed, "inflight": len(self._inflight)}
+
+
+class AsyncSingleFlight:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.collapsed = 0
+        self._inflight: Dict[Tuple[int, str], "asyncio.Future[Result]"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Result]]) -> Result:
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        joined = False
+        while True:
+            future = self._inflight.get(slot)
+            if future is None:
+                break
+            if not joined:
+                self.collapsed += 1
+                joined = True
+            try:
+                return _shared_copy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled() or _cancelling():
+                    raise
+                # the leader was cancelled, not us: take over (or join whoever already did)
+        future = loop.create_future()
+        self._inflight[slot] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark the exception retrieved when nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(_shared_copy(result))
+            return result
+        finally:
+            if self._inflight.get(slot) is future:
+                del self._inflight[slot]
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "collapsed": self.collapsed, "inflight": len(self._inflight)}
+
+
+def _cancelling() -> bool:
+    # Task.cancelling() only exists on 3.11+; older loops cannot tell, so assume the follower itself was not cancelled
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling and cancelling())
+
+
+async def _check_leader_cancel() -> None:
+    flight = AsyncSingleFlight()
+    started = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> Result:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return True, "", {"n": calls}
+
+    leader = asyncio.ensure_future(flight.do("k", fetch))
+    await started.wait()
+    follower = asyncio.ensure_future(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    result = await follower
+    assert leader.cancelled(), "leader should be cancelled"
+    assert result == (True, "", {"n": 2}), result
+    assert flight.stats() == {"calls": 2, "collapsed": 1, "inflight": 0}, flight.stats()
+
+    # the other way round: a cancelled follower leaves the leader alone
+    started.clear()
+    leader = asyncio.ensure_future(flight.do("k", fetch))
+    await started.wait()
+    follower = asyncio.ensure_future(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    follower.cancel()
+    assert await leader == (True, "", {"n": 3})
+    assert follower.cancelled(), "follower should be cancelled"
+
+
+if __name__ == "__main__":
+    # self-check: cancelling the leader must not cancel followers waiting on the same key
+    asyncio.run(_check_leader_cancel())
+    print("ok")